@@ -0,0 +1,99 @@
+"""
+Módulo contendo o carregamento de cenas em uma thread de segundo plano
+"""
+import os
+import threading
+from typing import Optional, Tuple
+
+from binary_scene import CenaBinaria
+from scene_buffers import SceneBuffers
+from xml_loader import XMLLoader
+
+
+class CarregamentoCancelado(Exception):
+    """Lançada dentro da thread de carregamento quando cancelar() é chamado"""
+    pass
+
+
+class CarregamentoSegundoPlano:
+    """
+    Carrega uma cena (XML ou .cena) sem bloquear quem a pediu
+    
+    A leitura roda em uma thread; o andamento fica em ``bytes_lidos`` /
+    ``total_bytes`` e ``etapa`` para ser consultado periodicamente (por
+    exemplo, por ``root.after``). cancelar() interrompe a leitura no próximo
+    lote ou entre as etapas. Ao terminar, ``resultado`` contém a tupla
+    (configurações, buffers da cena), que ainda não foi entregue a ninguém:
+    quem consulta faz a troca da cena de uma só vez.
+    """
+    
+    LENDO = "Lendo arquivo"
+    INDICE = "Construindo índice espacial"
+    LOD = "Construindo níveis de detalhe"
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.total_bytes = os.path.getsize(filename)
+        self.bytes_lidos = 0
+        self.etapa = self.LENDO
+        self.resultado: Optional[Tuple[dict, SceneBuffers]] = None
+        self.erro: Optional[Exception] = None
+        self.cancelado = False
+        self._cancelar = threading.Event()
+        self._thread = threading.Thread(target=self._executar, name="CarregamentoSegundoPlano",
+                                        daemon=True)
+        self._thread.start()
+    
+    @property
+    def concluido(self) -> bool:
+        """Indica se a thread terminou (com resultado, erro ou cancelamento)"""
+        return not self._thread.is_alive()
+    
+    @property
+    def fracao(self) -> float:
+        """Fração do arquivo já lida, entre 0 e 1"""
+        return self.bytes_lidos / self.total_bytes if self.total_bytes else 1.0
+    
+    def cancelar(self):
+        """Pede a interrupção do carregamento"""
+        self._cancelar.set()
+    
+    def _verificar(self):
+        """Interrompe a thread se o cancelamento foi pedido"""
+        if self._cancelar.is_set():
+            raise CarregamentoCancelado()
+    
+    def _progresso(self, bytes_lidos: int):
+        self.bytes_lidos = bytes_lidos
+        self._verificar()
+    
+    def _executar(self):
+        try:
+            if self.filename.lower().endswith(CenaBinaria.EXTENSAO):
+                config, cena = CenaBinaria.carregar(self.filename, construir_indice=False,
+                                                    construir_lod=False)
+            else:
+                config, cena = XMLLoader.carregar_buffers(self.filename, construir_indice=False,
+                                                          construir_lod=False,
+                                                          progresso=self._progresso)
+            self.bytes_lidos = self.total_bytes
+            
+            # Estruturas que o arquivo não trouxe prontas
+            if not cena.possui_indice:
+                self._verificar()
+                self.etapa = self.INDICE
+                cena.construir_indice()
+            if cena.lod is None:
+                self._verificar()
+                self.etapa = self.LOD
+                cena.construir_lod()
+            if cena.magnitude_mundo is None:
+                self._verificar()
+                cena.magnitude()
+            self._verificar()
+            
+            self.resultado = (config, cena)
+        except CarregamentoCancelado:
+            self.cancelado = True
+        except Exception as e:
+            self.erro = e
@@ -0,0 +1,176 @@
+"""
+Processamento em lote (sem interface gráfica) do pipeline de visualização
+
+Lê uma cena (XML ou .cena) e uma lista de estados da window e, para cada
+estado, executa transformação, clipping e mapeamento para a viewport,
+gravando a geometria recortada (.npz) ou uma imagem rasterizada (.ppm).
+"""
+import argparse
+import json
+import os
+import time
+from typing import Dict, List
+import numpy as np
+
+from pipeline import MotorGrafico
+from rasterizer import Rasterizador
+from scene_buffers import SceneBuffers
+from xml_loader import XMLLoader
+from binary_scene import CenaBinaria
+
+
+class RenderizadorLote:
+    """Grava os quadros produzidos pelo MotorGrafico em disco"""
+    
+    FORMATOS = ("geometria", "ppm")
+    
+    COR_BORDA_WINDOW = (255, 0, 0)
+    
+    def __init__(self, motor: MotorGrafico, formato: str = "geometria"):
+        if formato not in self.FORMATOS:
+            raise ValueError(f"Formato desconhecido: {formato}")
+        self.motor = motor
+        self.formato = formato
+    
+    def gravar_quadro(self, filename: str, geometria: Dict[str, tuple]):
+        """Grava um quadro no formato configurado"""
+        if self.formato == "geometria":
+            self._gravar_geometria(filename, geometria)
+        else:
+            self._gravar_ppm(filename, geometria)
+    
+    def _gravar_geometria(self, filename: str, geometria: Dict[str, tuple]):
+        """Grava as coordenadas de viewport dos objetos visíveis em um .npz"""
+        indices_poligonos, coords_poligonos = geometria['poligonos']
+        tamanhos = [len(c) // 2 for c in coords_poligonos]
+        
+        np.savez(
+            filename,
+            pontos_indices=np.asarray(geometria['pontos'][0], dtype=np.int64),
+            pontos=np.asarray(geometria['pontos'][1], dtype=np.int64).reshape(-1, 4),
+            retas_indices=np.asarray(geometria['retas'][0], dtype=np.int64),
+            retas=np.asarray(geometria['retas'][1], dtype=np.int64).reshape(-1, 4),
+            poligonos_indices=np.asarray(indices_poligonos, dtype=np.int64),
+            poligonos_offsets=np.concatenate(([0], np.cumsum(tamanhos))).astype(np.int64),
+            poligonos=np.asarray([v for c in coords_poligonos for v in c],
+                                 dtype=np.int64).reshape(-1, 2),
+            window=np.asarray(self.motor.bordas_window_viewport(), dtype=np.int64).reshape(-1, 2)
+        )
+    
+    def _gravar_ppm(self, filename: str, geometria: Dict[str, tuple]):
+        """Rasteriza o quadro (fundo branco) e o grava como PPM binário (P6)"""
+        motor = self.motor
+        cena = motor.cena
+        largura = int(motor.vp_x_max - motor.vp_x_min) + 1
+        altura = int(motor.vp_y_max - motor.vp_y_min) + 1
+        imagem = Rasterizador.nova_imagem(largura, altura)
+        paleta = Rasterizador.paleta(cena.cores)
+        
+        # Mesma ordem de camadas do canvas: pontos, retas, polígonos, window
+        indices, coords = geometria['pontos']
+        for i, (x0, y0, x1, y1) in zip(indices, coords):
+            ys = slice(max(y0, 0), max(y1 + 1, 0))
+            xs = slice(max(x0, 0), max(x1 + 1, 0))
+            imagem[ys, xs] = paleta[cena.pontos_cor[i]]
+        
+        indices, coords = geometria['retas']
+        Rasterizador.segmentos(imagem, coords, paleta[cena.retas_cor[indices]])
+        
+        indices, coords = geometria['poligonos']
+        for i, c in zip(indices, coords):
+            Rasterizador.anel(imagem, c, paleta[cena.poligonos_cor[i]])
+        
+        Rasterizador.anel(imagem, motor.bordas_window_viewport(), self.COR_BORDA_WINDOW)
+        
+        with open(filename, 'wb') as f:
+            f.write(Rasterizador.ppm(imagem))
+
+
+def carregar_estados(filename: str) -> List[dict]:
+    """
+    Lê os estados da window de um arquivo JSON
+    
+    O arquivo contém uma lista de objetos com as chaves x_min, y_min, x_max,
+    y_max e, opcionalmente, angulo (graus).
+    """
+    with open(filename, 'r', encoding='utf-8') as f:
+        estados = json.load(f)
+    if not isinstance(estados, list):
+        raise ValueError("O arquivo de estados deve conter uma lista de windows")
+    return estados
+
+
+def main():
+    """Processa uma cena para uma sequência de windows, sem interface gráfica"""
+    parser = argparse.ArgumentParser(description="Executa o pipeline de visualização em lote")
+    parser.add_argument("cena", help="arquivo de cena (.xml ou .cena)")
+    parser.add_argument("saida", help="diretório onde os quadros são gravados")
+    parser.add_argument("--estados",
+                        help="JSON com a lista de windows (padrão: a window da cena)")
+    parser.add_argument("--algoritmo", choices=MotorGrafico.ALGORITMOS_RETA,
+                        default="Cohen-Sutherland", help="algoritmo de clipping de retas")
+    parser.add_argument("--formato", choices=RenderizadorLote.FORMATOS, default="geometria",
+                        help="geometria recortada (.npz) ou imagem rasterizada (.ppm)")
+    parser.add_argument("--sem-indice", action="store_true",
+                        help="não usar o índice espacial")
+    parser.add_argument("--trabalhadores", type=int, default=1,
+                        help="processos usados no clipping (1: serial)")
+    parser.add_argument("--limite-serial", type=int,
+                        help="tamanho de lote abaixo do qual o clipping não é paralelizado")
+    parser.add_argument("--precisao", choices=SceneBuffers.PRECISOES,
+                        help="precisão das coordenadas de uma cena XML (padrão: a do XML; "
+                             "cenas .cena usam a precisão com que foram salvas)")
+    args = parser.parse_args()
+    
+    inicio = time.perf_counter()
+    if args.cena.lower().endswith(CenaBinaria.EXTENSAO):
+        config, cena = CenaBinaria.carregar(args.cena, construir_indice=not args.sem_indice)
+    else:
+        config, cena = XMLLoader.carregar_buffers(args.cena, construir_indice=not args.sem_indice,
+                                                  precisao=args.precisao)
+    
+    motor = MotorGrafico()
+    motor.carregar_cena(config, cena)
+    motor.algoritmo_reta = args.algoritmo
+    motor.usar_indice_espacial = not args.sem_indice
+    motor.configurar_paralelismo(args.trabalhadores, args.limite_serial)
+    print(f"Cena carregada em {time.perf_counter() - inicio:.3f}s: "
+          f"{cena.n_pontos} pontos, {cena.n_retas} retas, {cena.n_poligonos} polígonos")
+    
+    if args.estados:
+        estados = carregar_estados(args.estados)
+    else:
+        estados = [{'x_min': motor.w_x_min, 'y_min': motor.w_y_min,
+                    'x_max': motor.w_x_max, 'y_max': motor.w_y_max}]
+    
+    os.makedirs(args.saida, exist_ok=True)
+    renderizador = RenderizadorLote(motor, args.formato)
+    extensao = ".npz" if args.formato == "geometria" else ".ppm"
+    
+    try:
+        total = 0.0
+        for n, estado in enumerate(estados):
+            t0 = time.perf_counter()
+            motor.definir_window(estado['x_min'], estado['y_min'], estado['x_max'], estado['y_max'],
+                                 estado.get('angulo', 0.0))
+            motor.processar()
+            t1 = time.perf_counter()
+            geometria = motor.geometria_viewport()
+            t2 = time.perf_counter()
+            renderizador.gravar_quadro(os.path.join(args.saida, f"quadro_{n:05d}{extensao}"), geometria)
+            t3 = time.perf_counter()
+            total += t3 - t0
+            
+            print(f"Quadro {n}: pipeline {1000 * (t1 - t0):.2f}ms, "
+                  f"viewport {1000 * (t2 - t1):.2f}ms, gravação {1000 * (t3 - t2):.2f}ms "
+                  f"({len(geometria['pontos'][0])} pontos, {len(geometria['retas'][0])} retas, "
+                  f"{len(geometria['poligonos'][0])} polígonos visíveis)")
+    finally:
+        motor.encerrar_paralelismo()
+    
+    if estados:
+        print(f"{len(estados)} quadros em {total:.3f}s ({len(estados) / total:.1f} quadros/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""
+Benchmarks dos algoritmos de clipping e dos estágios do pipeline
+
+Usa cenas sintéticas do GeradorCena (mesma semente, mesma cena) e grava os
+resultados em JSON, permitindo comparar execuções e detectar regressões.
+"""
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import time
+from typing import Callable, List, Optional, Sequence
+import numpy as np
+
+from clipping_algorithms import ClippingCohenSutherland, ClippingLiangBarsky, ClippingSutherlandHodgman
+from parallel_clipping import ExecutorParalelo, ClippingRetaParalelo, ClippingPoligonoParalelo
+from pipeline import MotorGrafico
+from scene_generator import GeradorCena
+
+
+class Benchmark:
+    """Executa as medições e acumula os resultados"""
+    
+    def __init__(self, semente: int = 0, repeticoes: int = 3, max_escalar: int = 100000,
+                 proporcoes: Sequence[float] = (1, 1, 1), trabalhadores: int = 1):
+        """
+        Args:
+            semente: semente do gerador de cenas
+            repeticoes: quantas vezes cada medição é repetida
+            max_escalar: limite de objetos processados pelos caminhos escalares
+                (um clip() por objeto), que são ordens de grandeza mais lentos
+            proporcoes: pesos (dentro, fora, cruzando) dos objetos gerados
+            trabalhadores: se maior que 1, mede também o clipping em lote
+                distribuído entre processos (caminho 'paralelo')
+        """
+        self.semente = semente
+        self.repeticoes = repeticoes
+        self.max_escalar = max_escalar
+        self.proporcoes = tuple(proporcoes)
+        self.resultados: List[dict] = []
+        self.executor = ExecutorParalelo(trabalhadores) if trabalhadores > 1 else None
+    
+    def _gerador(self) -> GeradorCena:
+        return GeradorCena(self.semente)
+    
+    @staticmethod
+    def cronometrar(funcao: Callable, repeticoes: int,
+                    preparar: Optional[Callable] = None) -> List[float]:
+        """Executa a função `repeticoes` vezes e retorna os tempos (s)"""
+        tempos = []
+        for _ in range(repeticoes):
+            if preparar is not None:
+                preparar()
+            inicio = time.perf_counter()
+            funcao()
+            tempos.append(time.perf_counter() - inicio)
+        return tempos
+    
+    def registrar(self, grupo: str, nome: str, caminho: str, n: int,
+                  tempos: List[float], **extras) -> dict:
+        """Adiciona um resultado e o exibe"""
+        resultado = {
+            'grupo': grupo,
+            'nome': nome,
+            'caminho': caminho,
+            'n': n,
+            'tempo_min': min(tempos),
+            'tempo_mediana': statistics.median(tempos),
+            'objetos_por_segundo': n / min(tempos) if min(tempos) > 0 else None,
+            **extras
+        }
+        self.resultados.append(resultado)
+        
+        detalhes = ''.join(f" {k}={v}" for k, v in extras.items())
+        print(f"{grupo:10s} {nome:26s} {caminho:8s} n={n:<9d} "
+              f"{1000 * resultado['tempo_min']:10.3f}ms{detalhes}")
+        return resultado
+    
+    def retas(self, tamanhos: Sequence[int]):
+        """Mede clip() (escalar) e clip_batch() (lote) de cada algoritmo de retas"""
+        algoritmos = {'Cohen-Sutherland': ClippingCohenSutherland(),
+                      'Liang-Barsky': ClippingLiangBarsky()}
+        window = self._gerador().window
+        
+        for n in tamanhos:
+            segmentos = self._gerador().segmentos(n, self.proporcoes)
+            n_escalar = min(n, self.max_escalar)
+            amostra = segmentos[:n_escalar].tolist()
+            
+            for nome, algoritmo in algoritmos.items():
+                saida = {}
+                
+                def lote():
+                    saida['lote'] = algoritmo.clip_batch(segmentos, *window)
+                
+                def escalar():
+                    saida['escalar'] = [algoritmo.clip(*s, *window) for s in amostra]
+                
+                self.registrar('retas', nome, 'lote', n, self.cronometrar(lote, self.repeticoes))
+                if self.executor is not None:
+                    paralelo = ClippingRetaParalelo(algoritmo, self.executor, limite_serial=0)
+                    
+                    def lote_paralelo():
+                        saida['paralelo'] = paralelo.clip_batch(segmentos, *window)
+                    
+                    lote_paralelo()  # inicia os processos fora da medição
+                    tempos = self.cronometrar(lote_paralelo, self.repeticoes)
+                    paralelo.liberar()
+                    self.registrar('retas', nome, 'paralelo', n, tempos,
+                                   trabalhadores=self.executor.trabalhadores,
+                                   confere=all(np.array_equal(a, b) for a, b in
+                                               zip(saida['paralelo'], saida['lote'])))
+                if n_escalar:
+                    tempos = self.cronometrar(escalar, self.repeticoes)
+                    self.registrar('retas', nome, 'escalar', n_escalar, tempos,
+                                   confere=self._conferir_retas(saida['escalar'], *saida['lote']))
+    
+    @staticmethod
+    def _conferir_retas(escalar: list, coords: np.ndarray, visivel: np.ndarray) -> bool:
+        """Verifica se o caminho em lote reproduz o escalar nas linhas medidas"""
+        n = len(escalar)
+        visivel_escalar = np.array([c is not None for c in escalar], dtype=bool)
+        if not np.array_equal(visivel_escalar, visivel[:n]):
+            return False
+        coords_escalar = np.array([c for c in escalar if c is not None],
+                                  dtype=np.float64).reshape(-1, 4)
+        return bool(np.array_equal(coords_escalar, coords[:n][visivel[:n]]))
+    
+    def poligonos(self, vertices: Sequence[int], vertices_totais: int):
+        """
+        Mede clip() (escalar) e clip_batch() (lote) de Sutherland-Hodgman
+        para polígonos de vários tamanhos
+        
+        Para cada tamanho são gerados polígonos suficientes para somar cerca de
+        `vertices_totais` vértices (ao menos um polígono).
+        """
+        algoritmo = ClippingSutherlandHodgman()
+        window = self._gerador().window
+        
+        for n_vertices in vertices:
+            n = max(1, vertices_totais // n_vertices)
+            coords, offsets = self._gerador().poligonos(n, n_vertices, self.proporcoes)
+            n_escalar = min(n, self.max_escalar)
+            aneis = [coords[offsets[i]:offsets[i + 1]].tolist() for i in range(n_escalar)]
+            saida = {}
+            
+            def lote():
+                saida['lote'] = algoritmo.clip_batch(coords, offsets, *window)
+            
+            def escalar():
+                saida['escalar'] = [algoritmo.clip(anel, *window) for anel in aneis]
+            
+            self.registrar('poligonos', 'Sutherland-Hodgman', 'lote', n,
+                           self.cronometrar(lote, self.repeticoes), vertices=n_vertices)
+            if self.executor is not None:
+                paralelo = ClippingPoligonoParalelo(algoritmo, self.executor, limite_serial=0)
+                
+                def lote_paralelo():
+                    saida['paralelo'] = paralelo.clip_batch(coords, offsets, *window)
+                
+                lote_paralelo()  # inicia os processos fora da medição
+                tempos = self.cronometrar(lote_paralelo, self.repeticoes)
+                paralelo.liberar()
+                self.registrar('poligonos', 'Sutherland-Hodgman', 'paralelo', n, tempos,
+                               vertices=n_vertices, trabalhadores=self.executor.trabalhadores,
+                               confere=all(np.array_equal(a, b) for a, b in
+                                           zip(saida['paralelo'], saida['lote'])))
+            tempos = self.cronometrar(escalar, self.repeticoes)
+            self.registrar('poligonos', 'Sutherland-Hodgman', 'escalar', n_escalar, tempos,
+                           vertices=n_vertices,
+                           confere=self._conferir_poligonos(saida['escalar'], *saida['lote']))
+    
+    @staticmethod
+    def _conferir_poligonos(escalar: list, coords: np.ndarray, offsets: np.ndarray) -> bool:
+        """Verifica se o caminho em lote reproduz o escalar nos polígonos medidos"""
+        for i, resultado in enumerate(escalar):
+            esperado = (np.asarray(resultado[0], dtype=np.float64).reshape(-1, 2)
+                        if resultado else np.empty((0, 2)))
+            if not np.array_equal(esperado, coords[offsets[i]:offsets[i + 1]]):
+                return False
+        return True
+    
+    def pipeline(self, tamanhos: Sequence[int], usar_indice: bool = True):
+        """
+        Mede cada estágio do pipeline do MotorGrafico
+        
+        São os estágios de MotorGrafico.processar(), com os mesmos nomes, e
+        geometria_viewport (mapeamento para a viewport) no lugar do desenho
+        no canvas, que depende do Tkinter. O cache de transformação é limpo
+        antes de cada medição, para medir a transformação completa.
+        """
+        for n in tamanhos:
+            config, cena = self._gerador().cena(n_pontos=n // 10, n_retas=n, n_poligonos=n // 10,
+                                                proporcoes=self.proporcoes)
+            inicio = time.perf_counter()
+            if usar_indice:
+                cena.construir_indice()
+            tempo_indice = time.perf_counter() - inicio
+            
+            motor = MotorGrafico()
+            motor.carregar_cena(config, cena)
+            motor.usar_indice_espacial = usar_indice
+            motor.rotacionar_window(15.0)
+            variante = 'indice' if usar_indice else 'completo'
+            
+            if usar_indice:
+                self.registrar('pipeline', 'construir_indice', variante, n, [tempo_indice])
+            
+            preparacoes = {'transformar_mundo_para_ppc': motor.cache_transformacao.limpar}
+            estagios = motor.estagios() + (('geometria_viewport', motor.geometria_viewport),)
+            for nome, funcao in estagios:
+                self.registrar('pipeline', nome, variante, n,
+                               self.cronometrar(funcao, self.repeticoes, preparacoes.get(nome)))
+    
+    def salvar(self, filename: str, parametros: dict):
+        """Grava os resultados e o ambiente da execução em JSON"""
+        documento = {
+            'metadados': {
+                'data': datetime.datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'plataforma': platform.platform(),
+                'semente': self.semente,
+                'repeticoes': self.repeticoes,
+                'proporcoes': list(self.proporcoes),
+                'parametros': parametros
+            },
+            'resultados': self.resultados
+        }
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(documento, f, indent=2, ensure_ascii=False)
+    
+    @staticmethod
+    def comparar(atuais: List[dict], anteriores: List[dict], tolerancia: float) -> List[str]:
+        """
+        Compara resultados com uma execução anterior
+        
+        Returns:
+            Descrição das medições que ficaram mais de `tolerancia` vezes
+            mais lentas
+        """
+        def chave(r):
+            return r['grupo'], r['nome'], r['caminho'], r['n'], r.get('vertices')
+        
+        base = {chave(r): r for r in anteriores}
+        regressoes = []
+        for r in atuais:
+            anterior = base.get(chave(r))
+            if anterior and anterior['tempo_min'] > 0:
+                razao = r['tempo_min'] / anterior['tempo_min']
+                if razao > tolerancia:
+                    regressoes.append(f"{r['grupo']}/{r['nome']}/{r['caminho']} n={r['n']}: "
+                                      f"{razao:.2f}x mais lento")
+        return regressoes
+
+
+def main():
+    """Executa os benchmarks e grava os resultados em JSON"""
+    parser = argparse.ArgumentParser(description="Benchmarks de clipping e do pipeline")
+    parser.add_argument("--saida", default="benchmark.json", help="arquivo JSON de resultados")
+    parser.add_argument("--grupos", nargs="+", default=["retas", "poligonos", "pipeline"],
+                        choices=["retas", "poligonos", "pipeline"])
+    parser.add_argument("--tamanhos", type=float, nargs="+", default=[1e3, 1e4, 1e5, 1e6],
+                        help="quantidades de segmentos (até 1e7)")
+    parser.add_argument("--vertices", type=int, nargs="+", default=[3, 10, 100, 1000, 100000],
+                        help="vértices por polígono")
+    parser.add_argument("--vertices-totais", type=int, default=100000,
+                        help="vértices somados de todos os polígonos de cada medição")
+    parser.add_argument("--proporcoes", type=float, nargs=3, default=(1, 1, 1),
+                        metavar=("DENTRO", "FORA", "CRUZANDO"))
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--max-escalar", type=int, default=100000,
+                        help="limite de objetos nos caminhos escalares")
+    parser.add_argument("--trabalhadores", type=int, default=1,
+                        help="mede também o clipping paralelo com esta quantidade de processos")
+    parser.add_argument("--sem-indice", action="store_true",
+                        help="medir o pipeline sem o índice espacial")
+    parser.add_argument("--comparar", help="JSON de uma execução anterior")
+    parser.add_argument("--tolerancia", type=float, default=1.2,
+                        help="razão de tempo acima da qual uma medição é regressão")
+    args = parser.parse_args()
+    
+    tamanhos = [int(t) for t in args.tamanhos]
+    benchmark = Benchmark(args.semente, args.repeticoes, args.max_escalar, args.proporcoes,
+                          args.trabalhadores)
+    
+    try:
+        if "retas" in args.grupos:
+            benchmark.retas(tamanhos)
+        if "poligonos" in args.grupos:
+            benchmark.poligonos(args.vertices, args.vertices_totais)
+        if "pipeline" in args.grupos:
+            benchmark.pipeline(tamanhos, usar_indice=not args.sem_indice)
+    finally:
+        if benchmark.executor is not None:
+            benchmark.executor.fechar()
+    
+    benchmark.salvar(args.saida, {k: v for k, v in vars(args).items() if k != 'saida'})
+    print(f"Resultados gravados em {args.saida}")
+    
+    if args.comparar:
+        with open(args.comparar, 'r', encoding='utf-8') as f:
+            anteriores = json.load(f)['resultados']
+        regressoes = Benchmark.comparar(benchmark.resultados, anteriores, args.tolerancia)
+        for regressao in regressoes:
+            print("REGRESSÃO:", regressao)
+        if regressoes:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
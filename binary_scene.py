@@ -0,0 +1,197 @@
+"""
+Módulo para salvar e carregar cenas em formato binário mapeável em memória
+"""
+import argparse
+import json
+import struct
+from typing import Optional, Tuple
+import numpy as np
+
+from scene_buffers import SceneBuffers
+from spatial_index import GradeUniforme
+from xml_loader import XMLLoader
+
+
+class CenaBinaria:
+    """
+    Formato binário de cena (extensão .cena)
+    
+    Layout do arquivo:
+    - assinatura de 8 bytes (``MAGICO``) e versão (uint32)
+    - tamanho do cabeçalho (uint32) seguido do cabeçalho em JSON, com as
+      configurações de viewport/window, a tabela de cores, a magnitude das
+      coordenadas do mundo e, para cada array, seu dtype, formato e
+      deslocamento no arquivo
+    - os arrays (coordenadas, offsets de polígonos, índices de cor e, se
+      existirem, o índice espacial e as importâncias dos níveis de detalhe),
+      cada um alinhado a ``ALINHAMENTO`` bytes
+    
+    Na leitura os arrays são visões de um único np.memmap somente leitura:
+    nada é copiado e as páginas do arquivo só são lidas quando tocadas.
+    """
+    
+    MAGICO = b"CLIPCENA"
+    VERSAO = 1
+    EXTENSAO = ".cena"
+    ALINHAMENTO = 64
+    
+    ARRAYS_CENA = ('pontos_mundo', 'pontos_cor', 'retas_mundo', 'retas_cor',
+                   'poligonos_mundo', 'poligonos_offsets', 'poligonos_cor')
+    INDICES = ('indice_pontos', 'indice_retas', 'indice_poligonos')
+    IMPORTANCIAS_LOD = 'lod.importancias'
+    
+    @staticmethod
+    def salvar(filename: str, config: dict, cena: SceneBuffers):
+        """
+        Salva a cena em formato binário
+        
+        Args:
+            filename: caminho do arquivo de saída
+            config: configurações de viewport/window
+            cena: buffers da cena (o índice espacial e os níveis de detalhe
+                são salvos se já existirem)
+        """
+        arrays = {nome: np.ascontiguousarray(getattr(cena, nome)) for nome in CenaBinaria.ARRAYS_CENA}
+        for nome_indice in CenaBinaria.INDICES:
+            grade = getattr(cena, nome_indice)
+            if grade is not None:
+                for chave, valor in grade.estado().items():
+                    arrays[f"{nome_indice}.{chave}"] = np.ascontiguousarray(valor)
+        if cena.lod is not None:
+            arrays[CenaBinaria.IMPORTANCIAS_LOD] = np.ascontiguousarray(cena.lod.importancias)
+        
+        # Calcular o deslocamento de cada array, relativo ao início dos dados
+        descritores = {}
+        deslocamento = 0
+        for nome, array in arrays.items():
+            descritores[nome] = {
+                'dtype': array.dtype.str,
+                'shape': list(array.shape),
+                'offset': deslocamento
+            }
+            deslocamento = CenaBinaria._alinhar(deslocamento + array.nbytes)
+        
+        cabecalho = json.dumps({
+            'config': config,
+            'cores': cena.cores,
+            'magnitude': cena.magnitude(),
+            'arrays': descritores
+        }).encode('utf-8')
+        inicio_dados = CenaBinaria._alinhar(len(CenaBinaria.MAGICO) + 8 + len(cabecalho))
+        
+        with open(filename, 'wb') as f:
+            f.write(CenaBinaria.MAGICO)
+            f.write(struct.pack('<II', CenaBinaria.VERSAO, len(cabecalho)))
+            f.write(cabecalho)
+            for nome, array in arrays.items():
+                f.seek(inicio_dados + descritores[nome]['offset'])
+                f.write(array.tobytes())
+            f.truncate(inicio_dados + deslocamento)
+    
+    @staticmethod
+    def ler_cabecalho(filename: str) -> Tuple[dict, int]:
+        """
+        Lê apenas o cabeçalho de uma cena binária
+        
+        Returns:
+            Tupla (cabeçalho JSON, posição no arquivo onde começam os arrays,
+            à qual se somam os deslocamentos dos descritores)
+        """
+        with open(filename, 'rb') as f:
+            if f.read(len(CenaBinaria.MAGICO)) != CenaBinaria.MAGICO:
+                raise ValueError(f"{filename} não é um arquivo de cena binária")
+            versao, tamanho_cabecalho = struct.unpack('<II', f.read(8))
+            if versao != CenaBinaria.VERSAO:
+                raise ValueError(f"Versão de cena binária não suportada: {versao}")
+            cabecalho = json.loads(f.read(tamanho_cabecalho).decode('utf-8'))
+        
+        return cabecalho, CenaBinaria._alinhar(len(CenaBinaria.MAGICO) + 8 + tamanho_cabecalho)
+    
+    @staticmethod
+    def carregar(filename: str, construir_indice: bool = True,
+                 construir_lod: bool = True) -> Tuple[dict, SceneBuffers]:
+        """
+        Abre uma cena binária sem copiar as coordenadas
+        
+        Args:
+            filename: caminho do arquivo .cena
+            construir_indice: se True e o arquivo não trouxer o índice
+                espacial, ele é construído após a abertura
+            construir_lod: o mesmo para os níveis de detalhe dos polígonos
+        
+        Returns:
+            Tupla contendo (configurações, buffers da cena)
+        """
+        cabecalho, inicio_dados = CenaBinaria.ler_cabecalho(filename)
+        mapa = np.memmap(filename, dtype=np.uint8, mode='r')
+        
+        arrays = {}
+        for nome, descritor in cabecalho['arrays'].items():
+            dtype = np.dtype(descritor['dtype'])
+            forma = tuple(descritor['shape'])
+            inicio = inicio_dados + descritor['offset']
+            quantidade = int(np.prod(forma))
+            arrays[nome] = np.ndarray(forma, dtype=dtype, buffer=mapa,
+                                      offset=inicio) if quantidade else np.empty(forma, dtype=dtype)
+        
+        cena = SceneBuffers(cores=cabecalho['cores'],
+                            **{nome: arrays[nome] for nome in CenaBinaria.ARRAYS_CENA})
+        cena.magnitude_mundo = cabecalho.get('magnitude')
+        
+        for nome_indice in CenaBinaria.INDICES:
+            prefixo = nome_indice + "."
+            estado = {nome[len(prefixo):]: array for nome, array in arrays.items()
+                      if nome.startswith(prefixo)}
+            if estado:
+                setattr(cena, nome_indice, GradeUniforme.de_estado(estado))
+        if construir_indice and not cena.possui_indice:
+            cena.construir_indice()
+        
+        if CenaBinaria.IMPORTANCIAS_LOD in arrays:
+            cena.construir_lod(arrays[CenaBinaria.IMPORTANCIAS_LOD])
+        elif construir_lod:
+            cena.construir_lod()
+        
+        return cabecalho['config'], cena
+    
+    @staticmethod
+    def converter_xml(xml_filename: str, filename: str, construir_indice: bool = True,
+                      precisao: Optional[str] = None):
+        """
+        Converte uma cena XML para o formato binário
+        
+        Args:
+            xml_filename: caminho do arquivo XML de entrada
+            filename: caminho do arquivo .cena de saída
+            construir_indice: se True, o índice espacial é salvo junto
+            precisao: 'float64' ou 'float32' (None para a precisão do XML);
+                a cena binária guarda as coordenadas nessa precisão
+        """
+        config, cena = XMLLoader.carregar_buffers(xml_filename, construir_indice=construir_indice,
+                                                  precisao=precisao)
+        CenaBinaria.salvar(filename, config, cena)
+    
+    @staticmethod
+    def _alinhar(posicao: int) -> int:
+        """Arredonda a posição para o próximo múltiplo do alinhamento"""
+        resto = posicao % CenaBinaria.ALINHAMENTO
+        return posicao if resto == 0 else posicao + CenaBinaria.ALINHAMENTO - resto
+
+
+def main():
+    """Converte um arquivo XML de cena para o formato binário"""
+    parser = argparse.ArgumentParser(description="Converte uma cena XML para o formato binário .cena")
+    parser.add_argument("entrada", help="arquivo XML de entrada")
+    parser.add_argument("saida", help="arquivo .cena de saída")
+    parser.add_argument("--sem-indice", action="store_true",
+                        help="não salvar o índice espacial no arquivo")
+    parser.add_argument("--precisao", choices=SceneBuffers.PRECISOES,
+                        help="precisão das coordenadas (padrão: a do XML)")
+    args = parser.parse_args()
+    
+    CenaBinaria.converter_xml(args.entrada, args.saida, construir_indice=not args.sem_indice,
+                              precisao=args.precisao)
+
+
+if __name__ == "__main__":
+    main()
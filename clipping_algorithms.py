@@ -2,7 +2,8 @@
 Módulo contendo implementações de algoritmos de clipping
 """
 from typing import Optional, Tuple, List
-from clipping_interface import ClippingAlgorithmReta, ClippingAlgorithmPoligono
+import numpy as np
+from clipping_interface import ClippingAlgorithmReta, ClippingAlgorithmPoligono, coordenadas_lote
 
 
 class ClippingCohenSutherland(ClippingAlgorithmReta):
@@ -15,6 +16,10 @@ class ClippingCohenSutherland(ClippingAlgorithmReta):
     BOTTOM = 4  # 0100
     TOP = 8     # 1000
     
+    # Recortes por extremidade no clip_batch: em aritmética exata bastam dois
+    # (um por eixo); o restante cobre arredondamentos junto aos cantos
+    MAX_RECORTES_PONTO = 4
+    
     def calcular_codigo(self, x: float, y: float, x_min: float, y_min: float, 
                        x_max: float, y_max: float) -> int:
         """
@@ -62,6 +67,8 @@ class ClippingCohenSutherland(ClippingAlgorithmReta):
                 # Calcular ponto de interseção
                 x, y = 0.0, 0.0
                 codigo_out = codigo1 if codigo1 != 0 else codigo2
+                if self.contar_intersecoes:
+                    self.intersecoes += 1
                 
                 if codigo_out & self.TOP:
                     x = x1 + (x2 - x1) * (y_max - y1) / (y2 - y1)
@@ -87,6 +94,118 @@ class ClippingCohenSutherland(ClippingAlgorithmReta):
         if aceitar:
             return (x1, y1, x2, y2)
         return None
+    
+    def calcular_codigos(self, x: np.ndarray, y: np.ndarray, x_min: float, y_min: float,
+                         x_max: float, y_max: float) -> np.ndarray:
+        """
+        Calcula os códigos de região de vários pontos de uma só vez
+        
+        Args:
+            x, y: arrays com as coordenadas dos pontos
+            x_min, y_min, x_max, y_max: limites da janela
+            
+        Returns:
+            Array de códigos de região (bitwise), um por ponto
+        """
+        codigo_x = np.where(x < x_min, self.LEFT, np.where(x > x_max, self.RIGHT, self.INSIDE))
+        codigo_y = np.where(y < y_min, self.BOTTOM, np.where(y > y_max, self.TOP, self.INSIDE))
+        return (codigo_x | codigo_y).astype(np.int8)
+    
+    def clip_batch(self, segmentos: np.ndarray,
+                   x_min: float, y_min: float, x_max: float, y_max: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Realiza o clipping de um lote de retas usando Cohen-Sutherland
+        
+        Aceitação e rejeição triviais são resolvidas como máscaras sobre todo
+        o lote; apenas as retas ainda ambíguas seguem para uma nova iteração.
+        O resultado é idêntico ao de chamar clip() reta a reta.
+        
+        Os limites da window são convertidos para o tipo das coordenadas, de
+        modo que um ponto colocado sobre a borda seja classificado como
+        dentro dela também em float32. Retas ainda ambíguas depois de
+        MAX_RECORTES_PONTO recortes por extremidade (arredondamento junto a
+        um canto) têm as extremidades presas à window e são aceitas.
+        """
+        entrada = coordenadas_lote(segmentos, 4)
+        resultado = entrada.copy()
+        x1, y1, x2, y2 = resultado.T
+        tipo = resultado.dtype.type
+        x_min, y_min, x_max, y_max = tipo(x_min), tipo(y_min), tipo(x_max), tipo(y_max)
+        
+        codigo1 = self.calcular_codigos(x1, y1, x_min, y_min, x_max, y_max)
+        codigo2 = self.calcular_codigos(x2, y2, x_min, y_min, x_max, y_max)
+        
+        visivel = np.zeros(len(resultado), dtype=bool)
+        pendentes = np.arange(len(resultado))
+        
+        # Cada iteração recorta uma extremidade de cada reta pendente
+        for _ in range(2 * self.MAX_RECORTES_PONTO):
+            if not pendentes.size:
+                break
+            c1 = codigo1[pendentes]
+            c2 = codigo2[pendentes]
+            
+            # Ambos os pontos dentro
+            aceitar = (c1 == 0) & (c2 == 0)
+            visivel[pendentes[aceitar]] = True
+            # Ambos os pontos na mesma região externa
+            rejeitar = (c1 & c2) != 0
+            
+            ambiguas = ~(aceitar | rejeitar)
+            pendentes = pendentes[ambiguas]
+            if not pendentes.size:
+                break
+            c1 = c1[ambiguas]
+            c2 = c2[ambiguas]
+            if self.contar_intersecoes:
+                self.intersecoes += len(pendentes)
+            
+            # Calcular pontos de interseção apenas para as retas ambíguas
+            primeiro_fora = c1 != 0
+            codigo_out = np.where(primeiro_fora, c1, c2)
+            px1, py1 = x1[pendentes], y1[pendentes]
+            px2, py2 = x2[pendentes], y2[pendentes]
+            x = np.empty(len(pendentes), dtype=resultado.dtype)
+            y = np.empty(len(pendentes), dtype=resultado.dtype)
+            
+            topo = (codigo_out & self.TOP) != 0
+            base = ~topo & ((codigo_out & self.BOTTOM) != 0)
+            direita = ~topo & ~base & ((codigo_out & self.RIGHT) != 0)
+            esquerda = ~topo & ~base & ~direita
+            
+            for borda, horizontal, limite in ((topo, True, y_max), (base, True, y_min),
+                                              (direita, False, x_max), (esquerda, False, x_min)):
+                a1, b1, a2, b2 = px1[borda], py1[borda], px2[borda], py2[borda]
+                if horizontal:
+                    x[borda] = a1 + (a2 - a1) * (limite - b1) / (b2 - b1)
+                    y[borda] = limite
+                else:
+                    y[borda] = b1 + (b2 - b1) * (limite - a1) / (a2 - a1)
+                    x[borda] = limite
+            
+            # Substituir o ponto externo pelo ponto de interseção
+            idx1 = pendentes[primeiro_fora]
+            x1[idx1] = x[primeiro_fora]
+            y1[idx1] = y[primeiro_fora]
+            codigo1[idx1] = self.calcular_codigos(x1[idx1], y1[idx1], x_min, y_min, x_max, y_max)
+            
+            idx2 = pendentes[~primeiro_fora]
+            x2[idx2] = x[~primeiro_fora]
+            y2[idx2] = y[~primeiro_fora]
+            codigo2[idx2] = self.calcular_codigos(x2[idx2], y2[idx2], x_min, y_min, x_max, y_max)
+        else:
+            # Limite de iterações atingido: resolver as que restaram
+            c1 = codigo1[pendentes]
+            c2 = codigo2[pendentes]
+            visivel[pendentes[(c1 == 0) & (c2 == 0)]] = True
+            presas = pendentes[(c1 & c2) == 0]
+            resultado[presas, 0::2] = np.clip(resultado[presas, 0::2], x_min, x_max)
+            resultado[presas, 1::2] = np.clip(resultado[presas, 1::2], y_min, y_max)
+            visivel[presas] = True
+        
+        resultado[~visivel] = entrada[~visivel]
+        return resultado, visivel
 
 
 class ClippingLiangBarsky(ClippingAlgorithmReta):
@@ -122,6 +241,9 @@ class ClippingLiangBarsky(ClippingAlgorithmReta):
         if u1 > u2:
             return None
         
+        if self.contar_intersecoes:
+            self.intersecoes += (u1 > 0) + (u2 < 1)
+        
         # Calcular pontos de interseção
         x1_clip = x1 + u1 * dx
         y1_clip = y1 + u1 * dy
@@ -129,6 +251,65 @@ class ClippingLiangBarsky(ClippingAlgorithmReta):
         y2_clip = y1 + u2 * dy
         
         return (x1_clip, y1_clip, x2_clip, y2_clip)
+    
+    def clip_batch(self, segmentos: np.ndarray,
+                   x_min: float, y_min: float, x_max: float, y_max: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """Realiza o clipping de um lote de retas usando Liang-Barsky"""
+        resultado, visivel, _, _ = self.clip_batch_parametrico(
+            segmentos, x_min, y_min, x_max, y_max
+        )
+        return resultado, visivel
+    
+    def clip_batch_parametrico(self, segmentos: np.ndarray,
+                               x_min: float, y_min: float, x_max: float, y_max: float
+                               ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Realiza o clipping de um lote de retas e expõe os parâmetros u1/u2
+        
+        Os parâmetros p e q das quatro bordas são calculados como arrays (N, 4)
+        e u1/u2 são reduzidos com máximo/mínimo mascarados, sem laço por reta.
+        
+        Args:
+            segmentos: array (N, 4) com as colunas x1, y1, x2, y2
+            x_min, y_min, x_max, y_max: limites da janela
+            
+        Returns:
+            Tupla (coordenadas recortadas (N, 4), máscara de visibilidade (N,),
+            u1 (N,), u2 (N,)). Os pontos recortados de uma reta visível são
+            P1 + u1 * (P2 - P1) e P1 + u2 * (P2 - P1), o que permite interpolar
+            outros atributos por vértice com os mesmos parâmetros.
+        """
+        entrada = coordenadas_lote(segmentos, 4)
+        x1, y1, x2, y2 = entrada.T
+        dx = x2 - x1
+        dy = y2 - y1
+        
+        # Parâmetros p e q para as quatro bordas
+        p = np.stack([-dx, dx, -dy, dy], axis=1)
+        q = np.stack([x1 - x_min, x_max - x1, y1 - y_min, y_max - y1], axis=1)
+        
+        # Linhas paralelas a uma borda e fora dela
+        paralela_fora = ((p == 0) & (q < 0)).any(axis=1)
+        
+        t = np.divide(q, p, out=np.zeros_like(q), where=p != 0)
+        # Entrada na janela (p < 0) e saída da janela (p > 0)
+        u1 = np.maximum(np.where(p < 0, t, -np.inf).max(axis=1), 0.0)
+        u2 = np.minimum(np.where(p > 0, t, np.inf).min(axis=1), 1.0)
+        
+        visivel = ~paralela_fora & (u1 <= u2)
+        if self.contar_intersecoes:
+            self.intersecoes += int(np.count_nonzero(visivel & (u1 > 0)) +
+                                    np.count_nonzero(visivel & (u2 < 1)))
+        
+        # Calcular pontos de interseção
+        resultado = entrada.copy()
+        resultado[visivel, 0] = (x1 + u1 * dx)[visivel]
+        resultado[visivel, 1] = (y1 + u1 * dy)[visivel]
+        resultado[visivel, 2] = (x1 + u2 * dx)[visivel]
+        resultado[visivel, 3] = (y1 + u2 * dy)[visivel]
+        
+        return resultado, visivel, u1, u2
 
 
 class ClippingSutherlandHodgman(ClippingAlgorithmPoligono):
@@ -141,6 +322,8 @@ class ClippingSutherlandHodgman(ClippingAlgorithmPoligono):
         if not poligono:
             return []
         
+        intersecoes = [0]
+        
         def clip_borda(poligono_entrada: List[Tuple[float, float]], 
                       teste_dentro, calcular_intersecao) -> List[Tuple[float, float]]:
             """Recorta o polígono contra uma borda"""
@@ -162,11 +345,15 @@ class ClippingSutherlandHodgman(ClippingAlgorithmPoligono):
                 elif v1_dentro and not v2_dentro:
                     # Saindo: adiciona interseção
                     intersecao = calcular_intersecao(v1, v2)
+                    if self.contar_intersecoes:
+                        intersecoes[0] += 1
                     if intersecao:
                         poligono_saida.append(intersecao)
                 elif not v1_dentro and v2_dentro:
                     # Entrando: adiciona interseção e v2
                     intersecao = calcular_intersecao(v1, v2)
+                    if self.contar_intersecoes:
+                        intersecoes[0] += 1
                     if intersecao:
                         poligono_saida.append(intersecao)
                     poligono_saida.append(v2)
@@ -224,6 +411,74 @@ class ClippingSutherlandHodgman(ClippingAlgorithmPoligono):
         for teste_dentro, calcular_intersecao in bordas:
             resultado = clip_borda(resultado, teste_dentro, calcular_intersecao)
             if not resultado:
-                return []
+                break
         
+        if self.contar_intersecoes:
+            self.intersecoes += intersecoes[0]
         return [resultado] if resultado else []
+    
+    def clip_batch(self, vertices: np.ndarray, offsets: np.ndarray,
+                   x_min: float, y_min: float, x_max: float, y_max: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Realiza o clipping de vários polígonos usando Sutherland-Hodgman
+        
+        Cada borda é aplicada a todos os polígonos de uma vez: os testes de
+        inclusão e as interseções são calculados por aresta sobre o buffer
+        plano inteiro. O resultado é idêntico ao de chamar clip() polígono a
+        polígono.
+        """
+        coords = coordenadas_lote(vertices, 2)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        
+        # (eixo, limite, borda mínima) para esquerda, direita, inferior e superior
+        bordas = ((0, x_min, True), (0, x_max, False), (1, y_min, True), (1, y_max, False))
+        for eixo, limite, minimo in bordas:
+            if not len(coords):
+                break
+            coords, offsets = self._clip_borda_batch(coords, offsets, eixo, limite, minimo)
+        
+        return coords, offsets
+    
+    def _clip_borda_batch(self, coords: np.ndarray, offsets: np.ndarray,
+                          eixo: int, limite: float, minimo: bool
+                          ) -> Tuple[np.ndarray, np.ndarray]:
+        """Recorta todos os polígonos contra uma borda"""
+        tamanhos = np.diff(offsets)
+        n = len(tamanhos)
+        
+        # Aresta i de cada polígono: do vértice i ao seguinte (o último fecha o anel)
+        proximo = np.arange(1, len(coords) + 1)
+        nao_vazios = tamanhos > 0
+        proximo[offsets[1:][nao_vazios] - 1] = offsets[:-1][nao_vazios]
+        v2 = coords[proximo]
+        
+        valores = coords[:, eixo]
+        dentro = valores >= limite if minimo else valores <= limite
+        v1_dentro = dentro
+        v2_dentro = dentro[proximo]
+        cruza = v1_dentro != v2_dentro
+        
+        # Interseção das arestas que cruzam a borda
+        outro = 1 - eixo
+        a1 = coords[cruza]
+        a2 = v2[cruza]
+        t = (limite - a1[:, eixo]) / (a2[:, eixo] - a1[:, eixo])
+        intersecao = np.empty_like(a1)
+        intersecao[:, eixo] = limite
+        intersecao[:, outro] = a1[:, outro] + t * (a2[:, outro] - a1[:, outro])
+        if self.contar_intersecoes:
+            self.intersecoes += len(intersecao)
+        
+        # Cada aresta emite até dois vértices, na ordem do algoritmo escalar:
+        # ambos dentro -> v2; saindo -> interseção; entrando -> interseção e v2
+        candidatos = np.empty((len(coords), 2, 2), dtype=coords.dtype)
+        candidatos[:, 0] = v2
+        candidatos[cruza, 0] = intersecao
+        candidatos[:, 1] = v2
+        emitidos = np.column_stack([(v1_dentro & v2_dentro) | cruza, ~v1_dentro & v2_dentro])
+        
+        anel = np.repeat(np.arange(n), tamanhos)
+        novos_tamanhos = np.bincount(anel, weights=emitidos.sum(axis=1), minlength=n)
+        novos_offsets = np.concatenate(([0], np.cumsum(novos_tamanhos))).astype(np.int64)
+        return candidatos[emitidos], novos_offsets
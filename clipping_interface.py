@@ -3,10 +3,32 @@ Módulo contendo interfaces para algoritmos de clipping
 """
 from abc import ABC, abstractmethod
 from typing import Optional, Tuple, List
+import numpy as np
+
+
+def coordenadas_lote(valores, colunas: int) -> np.ndarray:
+    """
+    Converte um lote de coordenadas para um array (N, colunas)
+    
+    Arrays float32 são mantidos em float32 (cenas em precisão simples);
+    qualquer outro tipo vira float64.
+    """
+    valores = np.asarray(valores)
+    tipo = valores.dtype if valores.dtype in (np.float32, np.float64) else np.float64
+    return valores.astype(tipo, copy=False).reshape(-1, colunas)
 
 
 class ClippingAlgorithmReta(ABC):
-    """Interface abstrata para algoritmos de clipping de retas"""
+    """
+    Interface abstrata para algoritmos de clipping de retas
+    
+    Com ``contar_intersecoes`` ligado, as implementações somam em
+    ``intersecoes`` cada ponto de interseção calculado (quem mede zera e lê
+    o contador); desligado, a contagem não tem custo.
+    """
+    
+    contar_intersecoes = False
+    intersecoes = 0
     
     @abstractmethod
     def clip(self, x1: float, y1: float, x2: float, y2: float,
@@ -25,10 +47,36 @@ class ClippingAlgorithmReta(ABC):
             Tupla com coordenadas da reta recortada ou None se totalmente fora
         """
         pass
+    
+    @abstractmethod
+    def clip_batch(self, segmentos: np.ndarray,
+                   x_min: float, y_min: float, x_max: float, y_max: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Realiza o clipping de um lote de retas de uma só vez
+        
+        Args:
+            segmentos: array (N, 4) com as colunas x1, y1, x2, y2
+            x_min, y_min: coordenadas mínimas da janela de clipping
+            x_max, y_max: coordenadas máximas da janela de clipping
+            
+        Returns:
+            Tupla (coordenadas recortadas (N, 4), máscara de visibilidade (N,)).
+            As linhas invisíveis mantêm as coordenadas de entrada.
+        """
+        pass
 
 
 class ClippingAlgorithmPoligono(ABC):
-    """Interface abstrata para algoritmos de clipping de polígonos"""
+    """
+    Interface abstrata para algoritmos de clipping de polígonos
+    
+    Os contadores ``contar_intersecoes``/``intersecoes`` seguem a mesma
+    convenção de ClippingAlgorithmReta.
+    """
+    
+    contar_intersecoes = False
+    intersecoes = 0
     
     @abstractmethod
     def clip(self, poligono: List[Tuple[float, float]], 
@@ -46,3 +94,23 @@ class ClippingAlgorithmPoligono(ABC):
             Lista de polígonos resultantes do clipping
         """
         pass
+    
+    @abstractmethod
+    def clip_batch(self, vertices: np.ndarray, offsets: np.ndarray,
+                   x_min: float, y_min: float, x_max: float, y_max: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Realiza o clipping de vários polígonos de uma só vez
+        
+        Args:
+            vertices: array (V, 2) com os vértices de todos os polígonos em
+                sequência; o polígono i ocupa as linhas offsets[i]:offsets[i + 1]
+            offsets: array (N + 1,) com o início de cada polígono
+            x_min, y_min: coordenadas mínimas da janela de clipping
+            x_max, y_max: coordenadas máximas da janela de clipping
+            
+        Returns:
+            Tupla (vértices recortados (V', 2), offsets (N + 1,)) no mesmo
+            formato; polígonos totalmente fora ficam com zero vértices.
+        """
+        pass
@@ -1,13 +1,15 @@
 """
 Módulo contendo as classes de objetos geométricos
 """
-from typing import List
+from typing import List, Sequence
 import numpy as np
 
 
 class Ponto:
     """Representa um ponto no espaço 2D"""
     
+    __slots__ = ('x_mundo', 'y_mundo', 'x_ppc', 'y_ppc', 'cor', 'visivel')
+    
     def __init__(self, x: float, y: float, cor: str = "black"):
         self.x_mundo = x
         self.y_mundo = y
@@ -33,49 +35,158 @@ class Ponto:
         self.y_ppc = coords[1]
 
 
+def _coordenada_vinculada(espaco: str, eixo: int) -> property:
+    """Propriedade de VerticeVinculado que lê e grava a coordenada no objeto dono"""
+    def ler(self):
+        return self.dono._coordenada(self.chave, espaco, eixo)
+    
+    def gravar(self, valor):
+        self.dono._definir_coordenada(self.chave, espaco, eixo, valor)
+    
+    return property(ler, gravar)
+
+
+class VerticeVinculado(Ponto):
+    """
+    Vértice de uma Reta ou de um Poligono com a interface de Ponto
+    
+    Não tem coordenadas próprias: x_mundo, y_mundo, x_ppc e y_ppc são lidas
+    e gravadas no armazenamento compacto do dono, então, como antes,
+    ``reta.p1_ppc.x_ppc = x`` altera a reta.
+    """
+    
+    __slots__ = ('dono', 'chave')
+    
+    x_mundo = _coordenada_vinculada('mundo', 0)
+    y_mundo = _coordenada_vinculada('mundo', 1)
+    x_ppc = _coordenada_vinculada('ppc', 0)
+    y_ppc = _coordenada_vinculada('ppc', 1)
+    
+    def __init__(self, dono, chave, cor: str = "black"):
+        self.dono = dono
+        self.chave = chave
+        self.cor = cor
+        self.visivel = True
+
+
 class Reta:
-    """Representa uma reta no espaço 2D"""
+    """
+    Representa uma reta no espaço 2D
+    
+    As extremidades ficam em duas listas [x1, y1, x2, y2], uma no mundo e
+    outra no PPC; p1_mundo, p2_mundo, p1_ppc e p2_ppc são vértices
+    vinculados a essas listas, criados apenas quando consultados.
+    """
+    
+    __slots__ = ('coords_mundo', 'coords_ppc', 'cor', 'visivel')
     
     def __init__(self, p1: Ponto, p2: Ponto, cor: str = "black"):
-        self.p1_mundo = Ponto(p1.x_mundo, p1.y_mundo)
-        self.p2_mundo = Ponto(p2.x_mundo, p2.y_mundo)
-        self.p1_ppc = Ponto(p1.x_mundo, p1.y_mundo)
-        self.p2_ppc = Ponto(p2.x_mundo, p2.y_mundo)
+        self.coords_mundo = [p1.x_mundo, p1.y_mundo, p2.x_mundo, p2.y_mundo]
+        self.coords_ppc = self.coords_mundo
         self.cor = cor
         self.visivel = True
     
     def __repr__(self):
         return f"Reta({self.p1_mundo}, {self.p2_mundo})"
     
+    @property
+    def p1_mundo(self) -> Ponto:
+        return VerticeVinculado(self, 0)
+    
+    @property
+    def p2_mundo(self) -> Ponto:
+        return VerticeVinculado(self, 2)
+    
+    # No PPC valem os mesmos vértices: cada um lê as duas listas
+    p1_ppc = p1_mundo
+    p2_ppc = p2_mundo
+    
+    def _coordenada(self, chave: int, espaco: str, eixo: int) -> float:
+        coords = self.coords_mundo if espaco == 'mundo' else self.coords_ppc
+        return coords[chave + eixo]
+    
+    def _definir_coordenada(self, chave: int, espaco: str, eixo: int, valor: float):
+        # Até a primeira gravação as duas listas são a mesma: separar antes
+        if self.coords_ppc is self.coords_mundo:
+            self.coords_ppc = list(self.coords_mundo)
+        coords = self.coords_mundo if espaco == 'mundo' else self.coords_ppc
+        coords[chave + eixo] = valor
+    
     def get_pontos_mundo(self) -> List[np.ndarray]:
         """Retorna pontos do mundo como vetores homogêneos"""
-        return [
-            self.p1_mundo.get_coords_mundo(),
-            self.p2_mundo.get_coords_mundo()
-        ]
+        x1, y1, x2, y2 = self.coords_mundo
+        return [np.array([x1, y1, 1.0]), np.array([x2, y2, 1.0])]
     
     def set_pontos_ppc(self, p1_coords: np.ndarray, p2_coords: np.ndarray):
         """Define coordenadas dos pontos no PPC"""
-        self.p1_ppc.set_coords_ppc(p1_coords[:2])
-        self.p2_ppc.set_coords_ppc(p2_coords[:2])
+        self.coords_ppc = [p1_coords[0], p1_coords[1], p2_coords[0], p2_coords[1]]
 
 
 class Poligono:
-    """Representa um polígono no espaço 2D"""
+    """
+    Representa um polígono no espaço 2D
+    
+    Os vértices ficam em arrays (N, 2): coords_mundo com os originais e
+    aneis_ppc com um array por anel resultante do clipping. pontos_mundo e
+    poligonos_ppc são vértices vinculados a esses arrays, criados apenas
+    quando consultados; cada vértice tem um só par de coordenadas (as do
+    mundo em pontos_mundo, as do anel em poligonos_ppc), lido e gravado
+    tanto pelos atributos _mundo quanto pelos _ppc.
+    """
+    
+    __slots__ = ('coords_mundo', 'aneis_ppc', 'cor', 'visivel')
     
     def __init__(self, pontos: List[Ponto], cor: str = "black"):
-        self.pontos_mundo = [Ponto(p.x_mundo, p.y_mundo) for p in pontos]
-        self.poligonos_ppc = [[Ponto(p.x_mundo, p.y_mundo) for p in pontos]]
+        self.coords_mundo = np.array([(p.x_mundo, p.y_mundo) for p in pontos],
+                                     dtype=np.float64).reshape(-1, 2)
+        self.aneis_ppc = [self.coords_mundo]
         self.cor = cor
         self.visivel = True
     
+    @classmethod
+    def de_coords(cls, coords: Sequence, cor: str = "black") -> "Poligono":
+        """Cria o polígono direto de um array (N, 2), sem objetos Ponto"""
+        poligono = cls([], cor)
+        poligono.coords_mundo = np.array(coords, dtype=np.float64).reshape(-1, 2)
+        poligono.aneis_ppc = [poligono.coords_mundo]
+        return poligono
+    
     def __repr__(self):
-        return f"Poligono({len(self.pontos_mundo)} vértices)"
+        return f"Poligono({len(self.coords_mundo)} vértices)"
+    
+    @property
+    def pontos_mundo(self) -> List[Ponto]:
+        return [VerticeVinculado(self, (None, i)) for i in range(len(self.coords_mundo))]
+    
+    @property
+    def poligonos_ppc(self) -> List[List[Ponto]]:
+        return [[VerticeVinculado(self, (k, i)) for i in range(len(anel))]
+                for k, anel in enumerate(self.aneis_ppc)]
+    
+    @poligonos_ppc.setter
+    def poligonos_ppc(self, aneis: List[List[Ponto]]):
+        self.aneis_ppc = [np.array([(p.x_ppc, p.y_ppc) for p in anel],
+                                   dtype=np.float64).reshape(-1, 2) for anel in aneis]
+    
+    def _coordenada(self, chave: tuple, espaco: str, eixo: int) -> float:
+        anel, i = chave
+        coords = self.coords_mundo if anel is None else self.aneis_ppc[anel]
+        return float(coords[i, eixo])
+    
+    def _definir_coordenada(self, chave: tuple, espaco: str, eixo: int, valor: float):
+        anel, i = chave
+        if anel is None:
+            self.coords_mundo[i, eixo] = valor
+            return
+        # O anel inicial é o próprio coords_mundo: copiar antes de alterar
+        if self.aneis_ppc[anel] is self.coords_mundo:
+            self.aneis_ppc[anel] = self.coords_mundo.copy()
+        self.aneis_ppc[anel][i, eixo] = valor
     
     def get_pontos_mundo(self) -> List[np.ndarray]:
         """Retorna pontos do mundo como vetores homogêneos"""
-        return [p.get_coords_mundo() for p in self.pontos_mundo]
+        return [np.array([x, y, 1.0]) for x, y in self.coords_mundo.tolist()]
     
     def get_coords_mundo_2d(self) -> List[tuple]:
         """Retorna coordenadas 2D dos pontos do mundo"""
-        return [(p.x_mundo, p.y_mundo) for p in self.pontos_mundo]
+        return [(x, y) for x, y in self.coords_mundo.tolist()]
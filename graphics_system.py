@@ -1,54 +1,57 @@
 """
 Módulo do sistema gráfico principal
 """
+import time
 import tkinter as tk
+from typing import Optional
 from tkinter import ttk, filedialog, messagebox
-import numpy as np
-from typing import List, Tuple
 
-from geometric_objects import Ponto, Reta, Poligono
-from transformations import Transformacao
-from clipping_algorithms import ClippingCohenSutherland, ClippingLiangBarsky, ClippingSutherlandHodgman
-from xml_loader import XMLLoader
+from pipeline import MotorGrafico
+from pipeline_worker import TrabalhadorPipeline
+from background_loader import CarregamentoSegundoPlano
+from binary_scene import CenaBinaria
+from renderer import RenderizadorCanvas
 
 
 class SistemaGrafico:
     """Sistema gráfico principal com pipeline de visualização"""
     
+    # Desenho progressivo: itens por etapa e tempo máximo (s) por fatia do laço de eventos
+    TAMANHO_ETAPA = 500
+    DURACAO_FATIA = 0.015
+    
+    # Intervalo (ms) entre consultas ao trabalhador em segundo plano
+    INTERVALO_CONSULTA = 5
+    
+    # Intervalo (ms) entre atualizações da barra de progresso do carregamento
+    INTERVALO_PROGRESSO = 50
+    
     def __init__(self, root):
         self.root = root
         self.root.title("Sistema Gráfico - TP2 - Computação Gráfica")
         
-        # Configurações da viewport
-        self.vp_x_min = 0
-        self.vp_y_min = 0
-        self.vp_x_max = 800
-        self.vp_y_max = 600
-        
-        # Configurações da window
-        self.w_x_min = 0.0
-        self.w_y_min = 0.0
-        self.w_x_max = 10.0
-        self.w_y_max = 7.5
-        self.w_centro_x = (self.w_x_min + self.w_x_max) / 2
-        self.w_centro_y = (self.w_y_min + self.w_y_max) / 2
-        self.w_angulo = 0.0
-        
-        # Objetos da cena
-        self.pontos: List[Ponto] = []
-        self.retas: List[Reta] = []
-        self.poligonos: List[Poligono] = []
-        
-        # Algoritmos de clipping
-        self.algoritmo_reta_cs = ClippingCohenSutherland()
-        self.algoritmo_reta_lb = ClippingLiangBarsky()
-        self.algoritmo_poligono = ClippingSutherlandHodgman()
-        self.algoritmo_reta_atual = "Cohen-Sutherland"
+        # Pipeline de visualização (viewport, window, cena e algoritmos)
+        self.motor = MotorGrafico()
+        
+        # O pipeline roda em uma thread; a interface só recebe quadros prontos
+        self.trabalhador: Optional[TrabalhadorPipeline] = TrabalhadorPipeline(
+            self.motor.instrumentacao
+        )
+        self._geracao_exibida = 0
+        self._consulta_agendada = None
+        self.quadro: Optional[dict] = None
+        
+        # Carregamento de arquivo em andamento
+        self.carregamento: Optional[CarregamentoSegundoPlano] = None
         
         # Configurações de movimentação
         self.passo_movimento = 1.0
         self.passo_rotacao = 15.0
         
+        # Atualização agendada (after_idle) e desenho progressivo em andamento (after)
+        self._atualizacao_agendada = None
+        self._desenho_pendente = None
+        
         self.criar_interface()
     
     def criar_interface(self):
@@ -60,9 +63,10 @@ class SistemaGrafico:
         canvas_frame = ttk.LabelFrame(main_frame, text="Viewport")
         canvas_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(0, 10))
         
-        self.canvas = tk.Canvas(canvas_frame, width=self.vp_x_max, height=self.vp_y_max, 
+        self.canvas = tk.Canvas(canvas_frame, width=self.motor.vp_x_max, height=self.motor.vp_y_max, 
                                bg="white", relief=tk.SUNKEN, bd=2)
         self.canvas.pack(padx=5, pady=5)
+        self.renderizador = RenderizadorCanvas(self.canvas, em_lote=True)
         
         # Painel de controle
         control_frame = ttk.Frame(main_frame)
@@ -73,6 +77,8 @@ class SistemaGrafico:
         self._criar_controles_rotacao(control_frame)
         self._criar_controles_zoom(control_frame)
         self._criar_controles_algoritmo(control_frame)
+        self._criar_controles_desenho(control_frame)
+        self._criar_controles_instrumentacao(control_frame)
         self._criar_painel_informacoes(control_frame)
         
         self.atualizar_info()
@@ -84,6 +90,15 @@ class SistemaGrafico:
         
         ttk.Button(arquivo_frame, text="Carregar XML", 
                   command=self.carregar_xml).pack(fill=tk.X, padx=5, pady=5)
+        
+        self.progresso_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(arquivo_frame, variable=self.progresso_var,
+                        maximum=100.0).pack(fill=tk.X, padx=5)
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(arquivo_frame, textvariable=self.status_var).pack(anchor=tk.W, padx=5)
+        self.cancelar_btn = ttk.Button(arquivo_frame, text="Cancelar carregamento",
+                                       command=self.cancelar_carregamento, state=tk.DISABLED)
+        self.cancelar_btn.pack(fill=tk.X, padx=5, pady=(0, 5))
     
     def _criar_controles_movimentacao(self, parent):
         """Cria controles de movimentação"""
@@ -144,10 +159,41 @@ class SistemaGrafico:
         self.algoritmo_var = tk.StringVar(value="Cohen-Sutherland")
         ttk.Radiobutton(clip_frame, text="Cohen-Sutherland", 
                        variable=self.algoritmo_var, value="Cohen-Sutherland",
-                       command=self.atualizar_cena).pack(anchor=tk.W, padx=5, pady=2)
+                       command=self.solicitar_atualizacao).pack(anchor=tk.W, padx=5, pady=2)
         ttk.Radiobutton(clip_frame, text="Liang-Barsky", 
                        variable=self.algoritmo_var, value="Liang-Barsky",
-                       command=self.atualizar_cena).pack(anchor=tk.W, padx=5, pady=2)
+                       command=self.solicitar_atualizacao).pack(anchor=tk.W, padx=5, pady=2)
+    
+    def _criar_controles_desenho(self, parent):
+        """Cria controles do modo de desenho"""
+        desenho_frame = ttk.LabelFrame(parent, text="Desenho")
+        desenho_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.progressivo_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(desenho_frame, text="Desenho progressivo",
+                        variable=self.progressivo_var).pack(anchor=tk.W, padx=5, pady=2)
+        
+        self.lote_var = tk.BooleanVar(value=self.renderizador.em_lote)
+        ttk.Checkbutton(desenho_frame, text="Pontos e retas em lote (imagem)",
+                        variable=self.lote_var,
+                        command=self.alternar_desenho_lote).pack(anchor=tk.W, padx=5, pady=2)
+    
+    def alternar_desenho_lote(self):
+        """Alterna entre um item do canvas por objeto e a imagem única de pontos e retas"""
+        self.renderizador.em_lote = self.lote_var.get()
+        self.solicitar_atualizacao()
+    
+    def _criar_controles_instrumentacao(self, parent):
+        """Cria controles da instrumentação de desempenho"""
+        instr_frame = ttk.LabelFrame(parent, text="Instrumentação")
+        instr_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.instrumentacao_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(instr_frame, text="Medir desempenho",
+                        variable=self.instrumentacao_var,
+                        command=self.alternar_instrumentacao).pack(anchor=tk.W, padx=5, pady=2)
+        ttk.Button(instr_frame, text="Exportar log",
+                   command=self.exportar_log).pack(fill=tk.X, padx=5, pady=(2, 5))
     
     def _criar_painel_informacoes(self, parent):
         """Cria painel de informações"""
@@ -158,264 +204,237 @@ class SistemaGrafico:
         self.info_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
     
     def carregar_xml(self):
-        """Carrega objetos de um arquivo XML"""
+        """
+        Carrega objetos de um arquivo XML (ou de uma cena binária .cena)
+        
+        A leitura roda em segundo plano (CarregamentoSegundoPlano), com barra
+        de progresso e cancelamento; a cena atual continua na tela até a
+        nova estar completa.
+        """
         filename = filedialog.askopenfilename(
             title="Selecionar arquivo XML",
-            filetypes=[("XML files", "*.xml"), ("All files", "*.*")]
+            filetypes=[("XML files", "*.xml"), ("Cena binária", "*" + CenaBinaria.EXTENSAO),
+                       ("All files", "*.*")]
         )
         
         if not filename:
             return
         
+        # Um novo arquivo substitui o carregamento ainda em andamento
+        if self.carregamento is not None:
+            self.carregamento.cancelar()
+        
         try:
-            config, pontos, retas, poligonos = XMLLoader.carregar_arquivo(filename)
-            
-            # Atualizar configurações
-            if 'viewport' in config:
-                vp = config['viewport']
-                self.vp_x_min = vp['x_min']
-                self.vp_y_min = vp['y_min']
-                self.vp_x_max = vp['x_max']
-                self.vp_y_max = vp['y_max']
-            
-            if 'window' in config:
-                w = config['window']
-                self.w_x_min = w['x_min']
-                self.w_y_min = w['y_min']
-                self.w_x_max = w['x_max']
-                self.w_y_max = w['y_max']
-                self.w_centro_x = (self.w_x_min + self.w_x_max) / 2
-                self.w_centro_y = (self.w_y_min + self.w_y_max) / 2
-                self.w_angulo = 0.0
-            
-            # Atualizar objetos
-            self.pontos = pontos
-            self.retas = retas
-            self.poligonos = poligonos
-            
-            self.atualizar_cena()
-            messagebox.showinfo("Sucesso", f"Arquivo carregado com sucesso!\n"
-                              f"Pontos: {len(self.pontos)}\n"
-                              f"Retas: {len(self.retas)}\n"
-                              f"Polígonos: {len(self.poligonos)}")
-            
-        except Exception as e:
+            self.carregamento = CarregamentoSegundoPlano(filename)
+        except OSError as e:
             messagebox.showerror("Erro", f"Erro ao carregar arquivo: {str(e)}")
-    
-    def mover_window(self, dx: int, dy: int):
-        """Move a window na direção especificada"""
-        passo = self.passo_mov_var.get()
+            return
         
-        # Considerar a rotação da window
-        ang = np.radians(self.w_angulo)
-        dx_rot = dx * np.cos(ang) - dy * np.sin(ang)
-        dy_rot = dx * np.sin(ang) + dy * np.cos(ang)
+        self.progresso_var.set(0.0)
+        self.status_var.set(CarregamentoSegundoPlano.LENDO)
+        self.cancelar_btn.configure(state=tk.NORMAL)
+        self.root.after(self.INTERVALO_PROGRESSO, self._acompanhar_carregamento, self.carregamento)
+    
+    def cancelar_carregamento(self):
+        """Interrompe o carregamento em andamento; a cena atual é mantida"""
+        if self.carregamento is not None:
+            self.carregamento.cancelar()
+    
+    def _acompanhar_carregamento(self, carregamento: CarregamentoSegundoPlano):
+        """Atualiza a barra de progresso e, ao fim do carregamento, troca a cena"""
+        if carregamento is not self.carregamento:
+            return
         
-        deslocamento = passo * np.array([dx_rot, dy_rot])
+        if not carregamento.concluido:
+            self.progresso_var.set(100.0 * carregamento.fracao)
+            self.status_var.set(carregamento.etapa)
+            self.root.after(self.INTERVALO_PROGRESSO, self._acompanhar_carregamento, carregamento)
+            return
         
-        self.w_x_min += deslocamento[0]
-        self.w_x_max += deslocamento[0]
-        self.w_y_min += deslocamento[1]
-        self.w_y_max += deslocamento[1]
-        self.w_centro_x += deslocamento[0]
-        self.w_centro_y += deslocamento[1]
+        self.carregamento = None
+        self.cancelar_btn.configure(state=tk.DISABLED)
+        if carregamento.erro is not None:
+            self.progresso_var.set(0.0)
+            self.status_var.set("")
+            messagebox.showerror("Erro", f"Erro ao carregar arquivo: {str(carregamento.erro)}")
+            return
+        if carregamento.cancelado:
+            self.progresso_var.set(0.0)
+            self.status_var.set("Carregamento cancelado")
+            return
         
+        # A cena só é trocada aqui, já completa
+        config, cena = carregamento.resultado
+        self.motor.carregar_cena(config, cena)
         self.atualizar_cena()
+        self.progresso_var.set(100.0)
+        self.status_var.set(f"{cena.n_pontos} pontos, {cena.n_retas} retas, "
+                            f"{cena.n_poligonos} polígonos")
+    
+    def alternar_instrumentacao(self):
+        """Liga ou desliga a medição de tempos e contadores"""
+        self.motor.instrumentacao.ativa = self.instrumentacao_var.get()
+        self.solicitar_atualizacao()
+    
+    def exportar_log(self):
+        """Grava o log de quadros da instrumentação em CSV"""
+        filename = filedialog.asksaveasfilename(
+            title="Exportar log de desempenho",
+            defaultextension=".csv",
+            filetypes=[("CSV", "*.csv"), ("All files", "*.*")]
+        )
+        
+        if not filename:
+            return
+        
+        try:
+            self.motor.instrumentacao.exportar(filename)
+        except OSError as e:
+            messagebox.showerror("Erro", f"Erro ao exportar log: {str(e)}")
+    
+    def mover_window(self, dx: int, dy: int):
+        """Move a window na direção especificada"""
+        self.motor.mover_window(dx, dy, self.passo_mov_var.get())
+        self.solicitar_atualizacao()
     
     def rotacionar_window(self, sentido: int):
         """Rotaciona a window em torno do seu centro"""
-        angulo = self.passo_rot_var.get() * sentido
-        self.w_angulo = (self.w_angulo + angulo) % 360
-        
-        self.atualizar_cena()
+        self.motor.rotacionar_window(self.passo_rot_var.get() * sentido)
+        self.solicitar_atualizacao()
     
     def escalar_window(self, fator: float):
         """Escala a window em relação ao seu centro"""
-        largura = self.w_x_max - self.w_x_min
-        altura = self.w_y_max - self.w_y_min
-        
-        nova_largura = largura * fator
-        nova_altura = altura * fator
-        
-        self.w_x_min = self.w_centro_x - nova_largura / 2
-        self.w_x_max = self.w_centro_x + nova_largura / 2
-        self.w_y_min = self.w_centro_y - nova_altura / 2
-        self.w_y_max = self.w_centro_y + nova_altura / 2
-        
-        self.atualizar_cena()
-    
-    def transformar_mundo_para_ppc(self):
-        """Transforma objetos do mundo para o PPC usando numpy"""
-        # Criar matriz de transformação composta
-        t1 = Transformacao.translacao(-self.w_centro_x, -self.w_centro_y)
-        r = Transformacao.rotacao(-self.w_angulo)
-        t2 = Transformacao.translacao(self.w_centro_x, self.w_centro_y)
-        
-        # Compor transformações
-        matriz = Transformacao.compor_transformacoes(t2, r, t1)
-        
-        # Aplicar aos pontos
-        for ponto in self.pontos:
-            coords_mundo = ponto.get_coords_mundo()
-            coords_ppc = Transformacao.aplicar_transformacao(coords_mundo, matriz)
-            ponto.set_coords_ppc(coords_ppc)
-        
-        # Aplicar às retas
-        for reta in self.retas:
-            pontos_mundo = reta.get_pontos_mundo()
-            p1_ppc = Transformacao.aplicar_transformacao(pontos_mundo[0], matriz)
-            p2_ppc = Transformacao.aplicar_transformacao(pontos_mundo[1], matriz)
-            reta.set_pontos_ppc(p1_ppc, p2_ppc)
-        
-        # Aplicar aos polígonos
-        for poligono in self.poligonos:
-            pontos_mundo = poligono.get_pontos_mundo()
-            poligono.poligonos_ppc = [[]]
-            for coords_mundo in pontos_mundo:
-                coords_ppc = Transformacao.aplicar_transformacao(coords_mundo, matriz)
-                p = Ponto(coords_ppc[0], coords_ppc[1])
-                p.set_coords_ppc(coords_ppc)
-                poligono.poligonos_ppc[0].append(p)
+        self.motor.escalar_window(fator)
+        self.solicitar_atualizacao()
     
-    def aplicar_clipping(self):
-        """Aplica clipping nos objetos"""
-        # Clipping de pontos
-        for ponto in self.pontos:
-            coords = ponto.get_coords_ppc()
-            ponto.visivel = (self.w_x_min <= coords[0] <= self.w_x_max and
-                           self.w_y_min <= coords[1] <= self.w_y_max)
-        
-        # Selecionar algoritmo de clipping de retas
-        if self.algoritmo_var.get() == "Cohen-Sutherland":
-            algoritmo = self.algoritmo_reta_cs
-        else:
-            algoritmo = self.algoritmo_reta_lb
-        
-        # Clipping de retas
-        for reta in self.retas:
-            resultado = algoritmo.clip(
-                reta.p1_ppc.x_ppc, reta.p1_ppc.y_ppc,
-                reta.p2_ppc.x_ppc, reta.p2_ppc.y_ppc,
-                self.w_x_min, self.w_y_min, self.w_x_max, self.w_y_max
-            )
-            
-            if resultado:
-                reta.visivel = True
-                x1, y1, x2, y2 = resultado
-                reta.p1_ppc.x_ppc = x1
-                reta.p1_ppc.y_ppc = y1
-                reta.p2_ppc.x_ppc = x2
-                reta.p2_ppc.y_ppc = y2
-            else:
-                reta.visivel = False
-        
-        # Clipping de polígonos
-        for poligono in self.poligonos:
-            pontos_originais = [(p.x_ppc, p.y_ppc) for p in poligono.poligonos_ppc[0]]
-            
-            poligonos_resultado = self.algoritmo_poligono.clip(
-                pontos_originais,
-                self.w_x_min, self.w_y_min, self.w_x_max, self.w_y_max
-            )
-            
-            if poligonos_resultado:
-                poligono.visivel = True
-                poligono.poligonos_ppc = []
-                for poli in poligonos_resultado:
-                    pontos_poli = []
-                    for x, y in poli:
-                        p = Ponto(x, y)
-                        p.set_coords_ppc(np.array([x, y]))
-                        pontos_poli.append(p)
-                    poligono.poligonos_ppc.append(pontos_poli)
-            else:
-                poligono.visivel = False
+    def solicitar_atualizacao(self):
+        """
+        Agenda uma atualização da cena para quando o laço de eventos ficar ocioso
+        
+        Várias mudanças de estado antes disso (botões pressionados em
+        sequência) resultam em uma única passagem pelo pipeline, já com o
+        estado mais recente da window.
+        """
+        if self._atualizacao_agendada is None:
+            self._atualizacao_agendada = self.root.after_idle(self._executar_atualizacao)
     
-    def transformar_ppc_para_viewport(self, x: float, y: float) -> Tuple[int, int]:
-        """Transforma coordenadas do PPC para a viewport"""
-        # Normalização
-        x_norm = (x - self.w_x_min) / (self.w_x_max - self.w_x_min)
-        y_norm = (y - self.w_y_min) / (self.w_y_max - self.w_y_min)
-        
-        # Mapeamento para viewport (inverter Y)
-        x_vp = self.vp_x_min + x_norm * (self.vp_x_max - self.vp_x_min)
-        y_vp = self.vp_y_max - y_norm * (self.vp_y_max - self.vp_y_min)
-        
-        return int(x_vp), int(y_vp)
+    def _executar_atualizacao(self):
+        """Executa a atualização agendada por solicitar_atualizacao"""
+        self._atualizacao_agendada = None
+        self.atualizar_cena()
     
     def desenhar_cena(self):
-        """Desenha todos os objetos visíveis na viewport"""
-        self.canvas.delete("all")
-        
-        # Desenhar pontos
-        for ponto in self.pontos:
-            if ponto.visivel:
-                coords = ponto.get_coords_ppc()
-                x, y = self.transformar_ppc_para_viewport(coords[0], coords[1])
-                self.canvas.create_oval(x-3, y-3, x+3, y+3, fill=ponto.cor, outline=ponto.cor)
-        
-        # Desenhar retas
-        for reta in self.retas:
-            if reta.visivel:
-                x1, y1 = self.transformar_ppc_para_viewport(reta.p1_ppc.x_ppc, reta.p1_ppc.y_ppc)
-                x2, y2 = self.transformar_ppc_para_viewport(reta.p2_ppc.x_ppc, reta.p2_ppc.y_ppc)
-                self.canvas.create_line(x1, y1, x2, y2, fill=reta.cor, width=2)
-        
-        # Desenhar polígonos
-        for poligono in self.poligonos:
-            if poligono.visivel:
-                for poli in poligono.poligonos_ppc:
-                    if len(poli) >= 3:
-                        coords = []
-                        for ponto in poli:
-                            x, y = self.transformar_ppc_para_viewport(ponto.x_ppc, ponto.y_ppc)
-                            coords.extend([x, y])
-                        self.canvas.create_polygon(coords, outline=poligono.cor, 
-                                                  fill="", width=2)
-        
-        self.desenhar_bordas_window()
+        """
+        Desenha todos os objetos visíveis do quadro atual na viewport
+        
+        No modo progressivo os itens são enviados ao canvas em etapas,
+        distribuídas em fatias de até DURACAO_FATIA segundos do laço de
+        eventos; um novo quadro abandona o desenho anterior ainda pendente.
+        """
+        self.cancelar_desenho()
+        self.renderizador.preparar(self.motor.cena)
+        self.renderizador.atualizar_bordas_window(self.quadro['bordas'])
+        
+        etapas = self.renderizador.etapas(self.quadro['geometria'], self.TAMANHO_ETAPA)
+        if self.progressivo_var.get():
+            self._desenhar_fatia(etapas)
+        else:
+            for _ in etapas:
+                pass
+    
+    def _desenhar_fatia(self, etapas):
+        """Executa etapas do desenho até esgotar a fatia de tempo e agenda o restante"""
+        limite = time.perf_counter() + self.DURACAO_FATIA
+        for _ in etapas:
+            if time.perf_counter() >= limite:
+                self._desenho_pendente = self.root.after(1, self._desenhar_fatia, etapas)
+                return
+        self._desenho_pendente = None
     
-    def desenhar_bordas_window(self):
-        """Desenha as bordas da window na viewport"""
-        cantos = [
-            (self.w_x_min, self.w_y_min),
-            (self.w_x_max, self.w_y_min),
-            (self.w_x_max, self.w_y_max),
-            (self.w_x_min, self.w_y_max)
-        ]
-        
-        coords = []
-        for x, y in cantos:
-            x_vp, y_vp = self.transformar_ppc_para_viewport(x, y)
-            coords.extend([x_vp, y_vp])
-        
-        self.canvas.create_polygon(coords, outline="red", fill="", width=2, dash=(5, 3))
+    def cancelar_desenho(self):
+        """Abandona o desenho progressivo em andamento, se houver"""
+        if self._desenho_pendente is not None:
+            self.root.after_cancel(self._desenho_pendente)
+            self._desenho_pendente = None
     
     def atualizar_cena(self):
-        """Atualiza toda a cena (pipeline completo)"""
-        self.transformar_mundo_para_ppc()
-        self.aplicar_clipping()
-        self.desenhar_cena()
-        self.atualizar_info()
+        """
+        Atualiza toda a cena (pipeline completo)
+        
+        Com o trabalhador em segundo plano, apenas pede o quadro do estado
+        atual da window; ele é desenhado por _consultar_trabalhador quando
+        ficar pronto. Sem trabalhador, o pipeline roda aqui mesmo.
+        """
+        self.motor.algoritmo_reta = self.algoritmo_var.get()
+        
+        if self.trabalhador is not None:
+            self.trabalhador.solicitar(self.motor.estado(), self.motor.cena)
+            if self._consulta_agendada is None:
+                self._consulta_agendada = self.root.after(self.INTERVALO_CONSULTA,
+                                                          self._consultar_trabalhador)
+            return
+        
+        self.motor.instrumentacao.iniciar_quadro()
+        self.motor.processar()
+        self.exibir_quadro(self.motor.gerar_quadro())
+    
+    def _consultar_trabalhador(self):
+        """Desenha o quadro pronto, se houver, e continua consultando até o mais recente chegar"""
+        self._consulta_agendada = None
+        quadro = self.trabalhador.obter_resultado()
+        if quadro is not None:
+            self._geracao_exibida = quadro['geracao']
+            if 'erro' in quadro:
+                messagebox.showerror("Erro", f"Erro ao processar a cena: {quadro['erro']}")
+            else:
+                self.exibir_quadro(quadro)
+        
+        if self._geracao_exibida != self.trabalhador.geracao:
+            self._consulta_agendada = self.root.after(self.INTERVALO_CONSULTA,
+                                                      self._consultar_trabalhador)
+    
+    def exibir_quadro(self, quadro: dict):
+        """Desenha um quadro gerado pelo pipeline e atualiza o painel de informações"""
+        instrumentacao = self.motor.instrumentacao
+        self.quadro = quadro
+        
+        # Quadros da thread do pipeline trazem os tempos já medidos lá
+        if 'instrumentacao' in quadro:
+            instrumentacao.continuar_quadro(quadro['instrumentacao'])
+        
+        itens_criados = self.renderizador.itens_criados
+        with instrumentacao.medir('desenhar_cena'):
+            self.desenhar_cena()
+        instrumentacao.contar('itens_criados', self.renderizador.itens_criados - itens_criados)
+        
+        with instrumentacao.medir('atualizar_info'):
+            self.atualizar_info()
+        instrumentacao.finalizar_quadro()
     
     def atualizar_info(self):
         """Atualiza as informações na interface"""
         self.info_text.delete(1.0, tk.END)
         
-        pontos_visiveis = sum(1 for p in self.pontos if p.visivel)
-        retas_visiveis = sum(1 for r in self.retas if r.visivel)
-        poligonos_visiveis = sum(1 for p in self.poligonos if p.visivel)
+        motor = self.motor
+        cena = motor.cena
+        quadro = self.quadro or {'visiveis': {'pontos': 0, 'retas': 0, 'poligonos': 0},
+                                 'nivel_lod': 0}
+        pontos_visiveis = quadro['visiveis']['pontos']
+        retas_visiveis = quadro['visiveis']['retas']
+        poligonos_visiveis = quadro['visiveis']['poligonos']
+        erro = cena.erro_maximo_pixels(motor.w_x_max - motor.w_x_min,
+                                       motor.vp_x_max - motor.vp_x_min)
         
         info = f"""Window:
-  Min: ({self.w_x_min:.2f}, {self.w_y_min:.2f})
-  Max: ({self.w_x_max:.2f}, {self.w_y_max:.2f})
-  Centro: ({self.w_centro_x:.2f}, {self.w_centro_y:.2f})
-  Rotação: {self.w_angulo:.1f}°
+  Min: ({motor.w_x_min:.2f}, {motor.w_y_min:.2f})
+  Max: ({motor.w_x_max:.2f}, {motor.w_y_max:.2f})
+  Centro: ({motor.w_centro_x:.2f}, {motor.w_centro_y:.2f})
+  Rotação: {motor.w_angulo:.1f}°
 
 Objetos:
-  Pontos: {len(self.pontos)}
-  Retas: {len(self.retas)}
-  Polígonos: {len(self.poligonos)}
+  Pontos: {cena.n_pontos}
+  Retas: {cena.n_retas}
+  Polígonos: {cena.n_poligonos}
 
 Visíveis:
   Pontos: {pontos_visiveis}
@@ -423,6 +442,10 @@ Visíveis:
   Polígonos: {poligonos_visiveis}
 
 Algoritmo: {self.algoritmo_var.get()}
+Nível de detalhe: {quadro['nivel_lod']}
+Precisão: {cena.precisao} (erro ≤ {erro:.2g} px)
 """
+        # Tempos do quadro atual (atualizar_info aparece apenas no log)
+        info += motor.instrumentacao.resumo()
         
         self.info_text.insert(1.0, info)
@@ -0,0 +1,135 @@
+"""
+Módulo contendo a instrumentação (tempos e contadores) do pipeline
+"""
+import contextlib
+import csv
+import time
+from collections import deque
+from typing import Dict, List, Optional
+
+
+class Instrumentacao:
+    """
+    Registra o tempo de cada estágio e contadores de objetos por quadro
+    
+    Um quadro começa em iniciar_quadro() e termina em finalizar_quadro(),
+    que o acrescenta a um log circular com os últimos ``tamanho_log``
+    quadros. Desativada, medir() devolve um contexto nulo compartilhado e
+    contar() retorna imediatamente: os pontos de medição não custam nada
+    além de uma verificação de atributo.
+    """
+    
+    TAMANHO_LOG = 500
+    ESTAGIOS = ('consultar_indice', 'selecionar_por_window', 'transformar_mundo_para_ppc',
+                'aplicar_clipping', 'geometria_viewport', 'desenhar_cena', 'atualizar_info')
+    
+    _NULO = contextlib.nullcontext()
+    
+    def __init__(self, ativa: bool = False, tamanho_log: int = TAMANHO_LOG):
+        self.ativa = ativa
+        self.log = deque(maxlen=tamanho_log)
+        self.quadro: Dict[str, float] = {}
+        self.tempos: Dict[str, float] = {}
+        self.contadores: Dict[str, int] = {}
+        self.quadros = 0
+        self._inicio_quadro = 0.0
+    
+    def iniciar_quadro(self):
+        """Começa a registrar um novo quadro"""
+        if not self.ativa:
+            return
+        self.tempos = {}
+        self.contadores = {}
+        self._inicio_quadro = time.perf_counter()
+    
+    def registro_quadro(self) -> Optional[dict]:
+        """
+        Cópia do quadro em andamento (início, tempos e contadores)
+        
+        Permite que o quadro seja medido em partes por instâncias diferentes,
+        cada uma usada por uma só thread: o registro é entregue junto com o
+        resultado e continuado com continuar_quadro().
+        """
+        if not self.ativa:
+            return None
+        return {'inicio': self._inicio_quadro, 'tempos': dict(self.tempos),
+                'contadores': dict(self.contadores)}
+    
+    def continuar_quadro(self, registro: Optional[dict]):
+        """Continua um quadro iniciado em outra instância (um novo, se ela estava desativada)"""
+        if not self.ativa:
+            return
+        if registro is None:
+            self.iniciar_quadro()
+            return
+        self.tempos = dict(registro['tempos'])
+        self.contadores = dict(registro['contadores'])
+        self._inicio_quadro = registro['inicio']
+    
+    def finalizar_quadro(self) -> Optional[dict]:
+        """Encerra o quadro atual, o acrescenta ao log e o retorna"""
+        if not self.ativa:
+            return None
+        self.quadros += 1
+        self.quadro = {
+            'quadro': self.quadros,
+            'total': time.perf_counter() - self._inicio_quadro,
+            **{f"tempo_{nome}": valor for nome, valor in self.tempos.items()},
+            **self.contadores
+        }
+        self.log.append(self.quadro)
+        return self.quadro
+    
+    def medir(self, estagio: str):
+        """Contexto que mede o tempo do estágio (acumulado no quadro atual)"""
+        if not self.ativa:
+            return self._NULO
+        return self._medir(estagio)
+    
+    @contextlib.contextmanager
+    def _medir(self, estagio: str):
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.tempos[estagio] = self.tempos.get(estagio, 0.0) + time.perf_counter() - inicio
+    
+    def contar(self, contador: str, valor: int = 1):
+        """Soma valor ao contador no quadro atual"""
+        if self.ativa:
+            self.contadores[contador] = self.contadores.get(contador, 0) + int(valor)
+    
+    def resumo(self) -> str:
+        """Texto com os tempos e contadores do quadro atual, para o painel de informações"""
+        if not self.ativa:
+            return ""
+        
+        linhas = ["Desempenho (ms):"]
+        for estagio in self.ESTAGIOS:
+            if estagio in self.tempos:
+                linhas.append(f"  {estagio}: {1000 * self.tempos[estagio]:.2f}")
+        if self.contadores:
+            linhas.append("Contadores:")
+            for nome, valor in self.contadores.items():
+                linhas.append(f"  {nome}: {valor}")
+        return "\n".join(linhas) + "\n"
+    
+    def exportar(self, filename: str):
+        """Grava o log de quadros em CSV (uma linha por quadro)"""
+        quadros: List[dict] = list(self.log)
+        colunas: List[str] = []
+        for quadro in quadros:
+            colunas.extend(c for c in quadro if c not in colunas)
+        
+        with open(filename, 'w', newline='', encoding='utf-8') as f:
+            escritor = csv.DictWriter(f, fieldnames=colunas, restval=0)
+            escritor.writeheader()
+            escritor.writerows(quadros)
+    
+    def limpar(self):
+        """Descarta o log e o quadro atual"""
+        self.log.clear()
+        self.quadro = {}
+        self.tempos = {}
+        self.contadores = {}
+        self.quadros = 0
@@ -0,0 +1,153 @@
+"""
+Módulo contendo a pirâmide de níveis de detalhe (LOD) dos polígonos
+"""
+from typing import List, Optional, Tuple
+import numpy as np
+
+
+class PiramideLOD:
+    """
+    Versões simplificadas (Douglas-Peucker) de todos os polígonos da cena
+    
+    Em vez de executar o Douglas-Peucker uma vez por tolerância, a
+    simplificação é feita uma única vez até o fim, registrando para cada
+    vértice a "importância" com que ele foi mantido: a distância em que foi
+    escolhido, limitada pela importância do trecho que o contém. Um vértice
+    sobrevive à simplificação com tolerância t se e somente se sua
+    importância é maior que t, então cada nível é só uma máscara sobre os
+    vértices originais.
+    
+    O primeiro, o último e o vértice do meio de cada anel nunca são
+    removidos, de modo que todo polígono mantém ao menos três vértices.
+    
+    Os níveis têm tolerâncias em progressão geométrica (razão 2), em
+    unidades do mundo; o nível 0 é a geometria original.
+    """
+    
+    NIVEIS = 12
+    
+    def __init__(self, vertices: np.ndarray, offsets: np.ndarray,
+                 importancias: Optional[np.ndarray] = None, niveis: int = NIVEIS):
+        """
+        Constrói a pirâmide
+        
+        Args:
+            vertices: array (V, 2) com os vértices de todos os polígonos (mundo)
+            offsets: array (N + 1,) com o início de cada polígono
+            importancias: importâncias já calculadas (por exemplo, lidas de
+                uma cena binária); None para calculá-las
+            niveis: quantidade de níveis simplificados
+        """
+        self.vertices = vertices
+        self.offsets = offsets
+        if importancias is None:
+            importancias = self.calcular_importancias(vertices, offsets)
+        self.importancias = importancias
+        
+        if len(vertices):
+            extensao = float(np.ptp(vertices, axis=0).max())
+        else:
+            extensao = 0.0
+        # Do nível mais fino (extensão / 2^niveis) ao mais grosso (extensão / 2)
+        self.tolerancias: List[float] = [0.0] + [extensao * 2.0 ** -k for k in range(niveis, 0, -1)]
+        self._niveis: List[Optional[Tuple[np.ndarray, np.ndarray]]] = [None] * len(self.tolerancias)
+        self._niveis[0] = (vertices, offsets)
+    
+    def __len__(self):
+        return len(self.tolerancias)
+    
+    @staticmethod
+    def calcular_importancias(vertices: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+        """
+        Executa o Douglas-Peucker completo, em lote sobre todos os polígonos
+        
+        Cada iteração processa de uma vez todos os trechos ainda abertos: a
+        distância de cada vértice interno ao segmento entre as extremidades
+        do seu trecho, o vértice mais distante de cada trecho e a divisão
+        do trecho nesse vértice.
+        
+        Returns:
+            Array (V,) com a importância de cada vértice (infinita para os
+            vértices que nunca são removidos)
+        """
+        vertices = np.asarray(vertices, dtype=np.float64).reshape(-1, 2)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        importancias = np.zeros(len(vertices))
+        tamanhos = np.diff(offsets)
+        offsets = offsets[:-1][tamanhos > 0]
+        tamanhos = tamanhos[tamanhos > 0]
+        if not len(tamanhos):
+            return importancias
+        
+        # Cada anel é aberto em dois trechos: início -> meio -> fim
+        inicio = offsets
+        meio = offsets + tamanhos // 2
+        fim = offsets + tamanhos - 1
+        importancias[inicio] = importancias[meio] = importancias[fim] = np.inf
+        
+        trecho_ini = np.concatenate([inicio, meio])
+        trecho_fim = np.concatenate([meio, fim])
+        teto = np.full(len(trecho_ini), np.inf)
+        
+        while True:
+            abertos = trecho_fim - trecho_ini >= 2
+            trecho_ini, trecho_fim, teto = trecho_ini[abertos], trecho_fim[abertos], teto[abertos]
+            if not len(trecho_ini):
+                break
+            
+            # Vértices internos de todos os trechos, em sequência
+            internos = trecho_fim - trecho_ini - 1
+            primeiro = np.cumsum(internos) - internos
+            trecho = np.repeat(np.arange(len(internos)), internos)
+            indices = np.arange(int(internos.sum())) - primeiro[trecho] + trecho_ini[trecho] + 1
+            
+            # Distância de cada vértice interno ao segmento entre as extremidades
+            a = vertices[trecho_ini][trecho]
+            b = vertices[trecho_fim][trecho]
+            p = vertices[indices]
+            ab = b - a
+            comprimento2 = (ab * ab).sum(axis=1)
+            t = np.divide(((p - a) * ab).sum(axis=1), comprimento2,
+                          out=np.zeros(len(p)), where=comprimento2 > 0)
+            projecao = a + np.clip(t, 0.0, 1.0)[:, None] * ab
+            distancias = np.hypot(*(p - projecao).T)
+            
+            # Vértice mais distante de cada trecho (o primeiro, em caso de empate)
+            maximos = np.maximum.reduceat(distancias, primeiro)
+            candidatos = np.where(distancias == maximos[trecho], indices, len(vertices))
+            divisao = np.minimum.reduceat(candidatos, primeiro)
+            
+            importancia = np.minimum(maximos, teto)
+            importancias[divisao] = importancia
+            
+            trecho_ini, trecho_fim = (np.concatenate([trecho_ini, divisao]),
+                                      np.concatenate([divisao, trecho_fim]))
+            teto = np.concatenate([importancia, importancia])
+        
+        return importancias
+    
+    def nivel(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna os polígonos simplificados do nível k
+        
+        Returns:
+            Tupla (vértices (V_k, 2), offsets (N + 1,)), no mesmo formato dos
+            buffers da cena; os níveis são calculados na primeira consulta
+        """
+        if self._niveis[k] is None:
+            manter = self.importancias > self.tolerancias[k]
+            anel = np.repeat(np.arange(len(self.offsets) - 1), np.diff(self.offsets))
+            tamanhos = np.bincount(anel[manter], minlength=len(self.offsets) - 1)
+            self._niveis[k] = (self.vertices[manter],
+                               np.concatenate(([0], np.cumsum(tamanhos))).astype(np.int64))
+        return self._niveis[k]
+    
+    def construir_niveis(self):
+        """Calcula antecipadamente todos os níveis"""
+        for k in range(len(self)):
+            self.nivel(k)
+    
+    def nivel_para(self, tolerancia: float) -> int:
+        """Retorna o nível mais simplificado cuja tolerância não excede a informada"""
+        k = int(np.searchsorted(self.tolerancias, tolerancia, side='right')) - 1
+        return max(k, 0)
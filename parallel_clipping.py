@@ -0,0 +1,293 @@
+"""
+Módulo contendo o clipping paralelo (processos + memória compartilhada)
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+import numpy as np
+
+from clipping_interface import ClippingAlgorithmReta, ClippingAlgorithmPoligono, coordenadas_lote
+
+
+def _clip_retas_trabalho(algoritmo: ClippingAlgorithmReta, blocos: Tuple[str, str, str], n: int,
+                         inicio: int, fim: int, janela: Tuple[float, float, float, float],
+                         tipo: str = 'float64') -> int:
+    """
+    Recorta as retas inicio:fim dentro de um processo trabalhador
+    
+    Lê as coordenadas e escreve o resultado diretamente nos blocos de
+    memória compartilhada. Retorna a quantidade de interseções calculadas.
+    """
+    entrada, saida, visivel = (shared_memory.SharedMemory(name=nome) for nome in blocos)
+    try:
+        segmentos = np.ndarray((n, 4), dtype=tipo, buffer=entrada.buf)
+        resultado = np.ndarray((n, 4), dtype=tipo, buffer=saida.buf)
+        mascara = np.ndarray((n,), dtype=bool, buffer=visivel.buf)
+        
+        algoritmo.intersecoes = 0
+        resultado[inicio:fim], mascara[inicio:fim] = algoritmo.clip_batch(segmentos[inicio:fim], *janela)
+        return algoritmo.intersecoes
+    finally:
+        del segmentos, resultado, mascara
+        for bloco in (entrada, saida, visivel):
+            bloco.close()
+
+
+def _clip_poligonos_trabalho(algoritmo: ClippingAlgorithmPoligono, blocos: Tuple[str, str],
+                             n_vertices: int, n_offsets: int, inicio: int, fim: int,
+                             janela: Tuple[float, float, float, float],
+                             tipo: str = 'float64') -> Tuple[str, int, int]:
+    """
+    Recorta os polígonos inicio:fim dentro de um processo trabalhador
+    
+    O tamanho do resultado só é conhecido depois do clipping, então o
+    trabalhador cria um bloco próprio com os vértices recortados seguidos
+    dos offsets locais; o processo principal o copia e o remove.
+    
+    Returns:
+        Tupla (nome do bloco de saída, vértices recortados, interseções
+        calculadas)
+    """
+    entrada, bloco_offsets = (shared_memory.SharedMemory(name=nome) for nome in blocos)
+    try:
+        vertices = np.ndarray((n_vertices, 2), dtype=tipo, buffer=entrada.buf)
+        offsets = np.ndarray((n_offsets,), dtype=np.int64, buffer=bloco_offsets.buf)
+        
+        base = offsets[inicio]
+        algoritmo.intersecoes = 0
+        recortados, offsets_recortados = algoritmo.clip_batch(
+            vertices[base:offsets[fim]], offsets[inicio:fim + 1] - base, *janela
+        )
+    finally:
+        del vertices, offsets
+        entrada.close()
+        bloco_offsets.close()
+    
+    tamanho = recortados.nbytes + offsets_recortados.nbytes
+    saida = shared_memory.SharedMemory(create=True, size=max(tamanho, 1))
+    try:
+        destino = np.ndarray(recortados.shape, dtype=tipo, buffer=saida.buf)
+        destino[:] = recortados
+        destino_offsets = np.ndarray(offsets_recortados.shape, dtype=np.int64,
+                                     buffer=saida.buf, offset=recortados.nbytes)
+        destino_offsets[:] = offsets_recortados
+        del destino, destino_offsets
+        # O processo principal remove o bloco depois de copiá-lo
+        return saida.name, len(recortados), algoritmo.intersecoes
+    finally:
+        saida.close()
+
+
+class BufferCompartilhado:
+    """
+    Bloco de memória compartilhada reaproveitado entre quadros
+    
+    Só é recriado quando o quadro precisa de mais bytes do que a capacidade
+    atual, evitando criar e remover blocos a cada chamada.
+    """
+    
+    def __init__(self):
+        self.bloco: Optional[shared_memory.SharedMemory] = None
+    
+    def array(self, forma: tuple, dtype) -> np.ndarray:
+        """Retorna um array com a forma pedida sobre o bloco (crescendo-o se preciso)"""
+        tamanho = max(int(np.prod(forma)) * np.dtype(dtype).itemsize, 1)
+        if self.bloco is None or self.bloco.size < tamanho:
+            self.liberar()
+            self.bloco = shared_memory.SharedMemory(create=True, size=2 * tamanho)
+        return np.ndarray(forma, dtype=dtype, buffer=self.bloco.buf)
+    
+    @property
+    def nome(self) -> str:
+        return self.bloco.name
+    
+    def liberar(self):
+        """Fecha e remove o bloco"""
+        if self.bloco is not None:
+            self.bloco.close()
+            self.bloco.unlink()
+            self.bloco = None
+
+
+class ExecutorParalelo:
+    """
+    Pool de processos compartilhado pelos algoritmos paralelos
+    
+    Os trabalhadores são iniciados com 'spawn', de modo que não herdam o
+    estado do Tkinter do processo principal. O pool só é criado na primeira
+    chamada acima do limite serial.
+    """
+    
+    def __init__(self, trabalhadores: Optional[int] = None):
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+    
+    @property
+    def pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.trabalhadores,
+                                             mp_context=multiprocessing.get_context("spawn"))
+        return self._pool
+    
+    def fechar(self):
+        """Encerra os processos trabalhadores"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+class ClippingRetaParalelo(ClippingAlgorithmReta):
+    """
+    Executa clip_batch de um algoritmo de retas em vários processos
+    
+    As retas são divididas em faixas contíguas de índices, uma por
+    trabalhador. Coordenadas de entrada, coordenadas recortadas e a máscara
+    de visibilidade ficam em memória compartilhada: os trabalhadores leem e
+    escrevem direto nelas e apenas índices trafegam entre os processos.
+    Abaixo de ``limite_serial`` retas, o algoritmo é chamado no próprio
+    processo.
+    """
+    
+    LIMITE_SERIAL = 200000
+    
+    def __init__(self, algoritmo: ClippingAlgorithmReta, executor: ExecutorParalelo,
+                 limite_serial: int = LIMITE_SERIAL):
+        self.algoritmo = algoritmo
+        self.executor = executor
+        self.limite_serial = limite_serial
+        self._entrada = BufferCompartilhado()
+        self._saida = BufferCompartilhado()
+        self._visivel = BufferCompartilhado()
+    
+    def clip(self, x1: float, y1: float, x2: float, y2: float,
+             x_min: float, y_min: float, x_max: float, y_max: float
+             ) -> Optional[Tuple[float, float, float, float]]:
+        """Realiza o clipping de uma reta (sempre no próprio processo)"""
+        return self.algoritmo.clip(x1, y1, x2, y2, x_min, y_min, x_max, y_max)
+    
+    def clip_batch(self, segmentos: np.ndarray,
+                   x_min: float, y_min: float, x_max: float, y_max: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """Realiza o clipping de um lote de retas, dividido entre os trabalhadores"""
+        segmentos = coordenadas_lote(segmentos, 4)
+        n = len(segmentos)
+        trabalhadores = self.executor.trabalhadores
+        if n < self.limite_serial or trabalhadores <= 1:
+            self.algoritmo.contar_intersecoes = self.contar_intersecoes
+            self.algoritmo.intersecoes = 0
+            resultado = self.algoritmo.clip_batch(segmentos, x_min, y_min, x_max, y_max)
+            self.intersecoes += self.algoritmo.intersecoes
+            return resultado
+        
+        tipo = segmentos.dtype
+        self._entrada.array((n, 4), tipo)[:] = segmentos
+        saida = self._saida.array((n, 4), tipo)
+        visivel = self._visivel.array((n,), bool)
+        
+        self.algoritmo.contar_intersecoes = self.contar_intersecoes
+        blocos = (self._entrada.nome, self._saida.nome, self._visivel.nome)
+        limites = np.linspace(0, n, trabalhadores + 1).astype(np.int64).tolist()
+        tarefas = [
+            self.executor.pool.submit(_clip_retas_trabalho, self.algoritmo, blocos, n,
+                                      inicio, fim, (x_min, y_min, x_max, y_max), tipo.name)
+            for inicio, fim in zip(limites[:-1], limites[1:]) if fim > inicio
+        ]
+        self.intersecoes += sum(tarefa.result() for tarefa in tarefas)
+        
+        return saida.copy(), visivel.copy()
+    
+    def liberar(self):
+        """Remove os blocos de memória compartilhada"""
+        for buffer in (self._entrada, self._saida, self._visivel):
+            buffer.liberar()
+
+
+class ClippingPoligonoParalelo(ClippingAlgorithmPoligono):
+    """
+    Executa clip_batch de um algoritmo de polígonos em vários processos
+    
+    Os polígonos são divididos em faixas com aproximadamente o mesmo número
+    de vértices. Vértices e offsets de entrada ficam em memória
+    compartilhada; cada trabalhador devolve seus anéis recortados em um
+    bloco próprio, concatenado na ordem original pelo processo principal.
+    Abaixo de ``limite_serial`` vértices, o algoritmo é chamado no próprio
+    processo.
+    """
+    
+    LIMITE_SERIAL = 200000
+    
+    def __init__(self, algoritmo: ClippingAlgorithmPoligono, executor: ExecutorParalelo,
+                 limite_serial: int = LIMITE_SERIAL):
+        self.algoritmo = algoritmo
+        self.executor = executor
+        self.limite_serial = limite_serial
+        self._vertices = BufferCompartilhado()
+        self._offsets = BufferCompartilhado()
+    
+    def clip(self, poligono: List[Tuple[float, float]],
+             x_min: float, y_min: float, x_max: float, y_max: float
+             ) -> List[List[Tuple[float, float]]]:
+        """Realiza o clipping de um polígono (sempre no próprio processo)"""
+        return self.algoritmo.clip(poligono, x_min, y_min, x_max, y_max)
+    
+    def clip_batch(self, vertices: np.ndarray, offsets: np.ndarray,
+                   x_min: float, y_min: float, x_max: float, y_max: float
+                   ) -> Tuple[np.ndarray, np.ndarray]:
+        """Realiza o clipping de vários polígonos, divididos entre os trabalhadores"""
+        vertices = coordenadas_lote(vertices, 2)
+        offsets = np.asarray(offsets, dtype=np.int64)
+        trabalhadores = self.executor.trabalhadores
+        if len(vertices) < self.limite_serial or trabalhadores <= 1:
+            self.algoritmo.contar_intersecoes = self.contar_intersecoes
+            self.algoritmo.intersecoes = 0
+            resultado = self.algoritmo.clip_batch(vertices, offsets, x_min, y_min, x_max, y_max)
+            self.intersecoes += self.algoritmo.intersecoes
+            return resultado
+        
+        tipo = vertices.dtype
+        self._vertices.array(vertices.shape, tipo)[:] = vertices
+        self._offsets.array(offsets.shape, np.int64)[:] = offsets
+        
+        # Faixas de polígonos com aproximadamente o mesmo número de vértices; a
+        # última vai até o fim dos offsets, incluindo polígonos vazios no final
+        alvos = np.linspace(0, len(vertices), trabalhadores + 1)
+        limites = np.searchsorted(offsets, alvos).clip(0, len(offsets) - 1)
+        limites[0] = 0
+        limites[-1] = len(offsets) - 1
+        limites = np.unique(limites).tolist()
+        
+        self.algoritmo.contar_intersecoes = self.contar_intersecoes
+        blocos = (self._vertices.nome, self._offsets.nome)
+        tarefas = [
+            self.executor.pool.submit(_clip_poligonos_trabalho, self.algoritmo, blocos,
+                                      len(vertices), len(offsets), inicio, fim,
+                                      (x_min, y_min, x_max, y_max), tipo.name)
+            for inicio, fim in zip(limites[:-1], limites[1:])
+        ]
+        
+        partes = []
+        tamanhos = []
+        for (inicio, fim), tarefa in zip(zip(limites[:-1], limites[1:]), tarefas):
+            nome, n_recortados, intersecoes = tarefa.result()
+            self.intersecoes += intersecoes
+            bloco = shared_memory.SharedMemory(name=nome)
+            try:
+                partes.append(np.ndarray((n_recortados, 2), dtype=tipo,
+                                         buffer=bloco.buf).copy())
+                tamanhos.append(np.diff(np.ndarray((fim - inicio + 1,), dtype=np.int64,
+                                                   buffer=bloco.buf,
+                                                   offset=n_recortados * 2 * tipo.itemsize)))
+            finally:
+                bloco.close()
+                bloco.unlink()
+        
+        recortados = np.concatenate(partes) if partes else np.empty((0, 2), dtype=tipo)
+        tamanhos = np.concatenate(tamanhos) if tamanhos else np.empty(0, dtype=np.int64)
+        return recortados, np.concatenate(([0], np.cumsum(tamanhos))).astype(np.int64)
+    
+    def liberar(self):
+        """Remove os blocos de memória compartilhada"""
+        for buffer in (self._vertices, self._offsets):
+            buffer.liberar()
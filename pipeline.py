@@ -0,0 +1,806 @@
+"""
+Módulo contendo o pipeline de visualização (mundo → PPC → clipping → viewport)
+sem dependência do Tkinter
+"""
+import numpy as np
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from scene_buffers import SceneBuffers
+from transformations import Transformacao, CacheTransformacao
+from clipping_algorithms import ClippingCohenSutherland, ClippingLiangBarsky, ClippingSutherlandHodgman
+from instrumentation import Instrumentacao
+from parallel_clipping import ExecutorParalelo, ClippingRetaParalelo, ClippingPoligonoParalelo
+
+
+class MotorGrafico:
+    """
+    Estado da viewport/window e estágios do pipeline de visualização
+    
+    Não usa Tkinter: o SistemaGrafico o utiliza para a interface interativa
+    e o batch_render para processar cenas em lote, sem display.
+    """
+    
+    ALGORITMOS_RETA = ("Cohen-Sutherland", "Liang-Barsky")
+    
+    # Tolerância de simplificação dos polígonos, em pixels da viewport
+    FATOR_PIXEL_LOD = 0.5
+    
+    # Atributos que definem um quadro (copiados por estado()/restaurar_estado())
+    ATRIBUTOS_ESTADO = ('vp_x_min', 'vp_y_min', 'vp_x_max', 'vp_y_max',
+                        'w_x_min', 'w_y_min', 'w_x_max', 'w_y_max',
+                        'w_centro_x', 'w_centro_y', 'w_angulo', 'algoritmo_reta',
+                        'usar_indice_espacial', 'usar_lod', 'usar_caixas_envolventes',
+                        'usar_decimacao', 'usar_selecao_window')
+    
+    def __init__(self):
+        # Configurações da viewport
+        self.vp_x_min = 0
+        self.vp_y_min = 0
+        self.vp_x_max = 800
+        self.vp_y_max = 600
+        
+        # Configurações da window
+        self.w_x_min = 0.0
+        self.w_y_min = 0.0
+        self.w_x_max = 10.0
+        self.w_y_max = 7.5
+        self.w_centro_x = (self.w_x_min + self.w_x_max) / 2
+        self.w_centro_y = (self.w_y_min + self.w_y_max) / 2
+        self.w_angulo = 0.0
+        
+        # Objetos da cena (armazenamento colunar)
+        self.cena = SceneBuffers()
+        
+        # Índice espacial: apenas os candidatos são transformados e recortados
+        self.usar_indice_espacial = True
+        self.candidatos_pontos = None
+        self.candidatos_retas = None
+        self.candidatos_poligonos = None
+        
+        # Seleção pela window rotacionada: retas e polígonos cujas caixas no
+        # mundo não tocam a window não são transformados nem recortados
+        self.usar_selecao_window = True
+        
+        # Caixas envolventes: objetos inteiramente dentro ou fora da window
+        # não passam pelos algoritmos de clipping
+        self.usar_caixas_envolventes = True
+        self.caixas_retas_ppc = np.empty((0, 4))
+        self.caixas_poligonos_ppc = np.empty((0, 4))
+        
+        # Decimação no espaço da tela antes do desenho
+        self.usar_decimacao = True
+        
+        # Nível de detalhe dos polígonos em uso (0 = geometria original)
+        self.usar_lod = True
+        self.nivel_lod = 0
+        self.lod_mundo = self.cena.poligonos_mundo
+        self.lod_offsets = self.cena.poligonos_offsets
+        self.lod_ppc = self.cena.poligonos_ppc
+        
+        # Resultados mundo → PPC já calculados, por matriz composta
+        self.cache_transformacao = CacheTransformacao()
+        
+        # Algoritmos de clipping
+        self.algoritmo_reta_cs = ClippingCohenSutherland()
+        self.algoritmo_reta_lb = ClippingLiangBarsky()
+        self.algoritmo_poligono = ClippingSutherlandHodgman()
+        self.algoritmo_reta = "Cohen-Sutherland"
+        self.executor_paralelo: Optional[ExecutorParalelo] = None
+        
+        # Tempos por estágio e contadores (desativada por padrão)
+        self.instrumentacao = Instrumentacao()
+    
+    def carregar_cena(self, config: dict, cena: SceneBuffers):
+        """Substitui a cena e aplica as configurações de viewport/window lidas do arquivo"""
+        if 'viewport' in config:
+            vp = config['viewport']
+            self.vp_x_min = vp['x_min']
+            self.vp_y_min = vp['y_min']
+            self.vp_x_max = vp['x_max']
+            self.vp_y_max = vp['y_max']
+        
+        if 'window' in config:
+            w = config['window']
+            self.definir_window(w['x_min'], w['y_min'], w['x_max'], w['y_max'])
+        
+        self.cena = cena
+        self.cache_transformacao.limpar()
+        self.selecionar_nivel_lod()
+    
+    def estado(self) -> dict:
+        """Retorna uma cópia do estado da viewport/window e das opções do pipeline"""
+        return {nome: getattr(self, nome) for nome in self.ATRIBUTOS_ESTADO}
+    
+    def restaurar_estado(self, estado: dict):
+        """Aplica um estado obtido com estado() (por exemplo, de outro motor)"""
+        for nome, valor in estado.items():
+            setattr(self, nome, valor)
+    
+    def configurar_paralelismo(self, trabalhadores: int, limite_serial: Optional[int] = None):
+        """
+        Distribui o clipping de retas e polígonos entre processos
+        
+        Args:
+            trabalhadores: quantidade de processos (1 ou menos volta ao modo serial)
+            limite_serial: tamanho de lote abaixo do qual o clipping continua no
+                próprio processo (None para o padrão de cada algoritmo)
+        """
+        self.encerrar_paralelismo()
+        if trabalhadores <= 1:
+            return
+        
+        self.executor_paralelo = ExecutorParalelo(trabalhadores)
+        opcoes = {} if limite_serial is None else {'limite_serial': limite_serial}
+        self.algoritmo_reta_cs = ClippingRetaParalelo(self.algoritmo_reta_cs,
+                                                      self.executor_paralelo, **opcoes)
+        self.algoritmo_reta_lb = ClippingRetaParalelo(self.algoritmo_reta_lb,
+                                                      self.executor_paralelo, **opcoes)
+        self.algoritmo_poligono = ClippingPoligonoParalelo(self.algoritmo_poligono,
+                                                           self.executor_paralelo, **opcoes)
+    
+    def encerrar_paralelismo(self):
+        """Encerra os processos trabalhadores e restaura os algoritmos seriais"""
+        if self.executor_paralelo is None:
+            return
+        
+        for nome in ('algoritmo_reta_cs', 'algoritmo_reta_lb', 'algoritmo_poligono'):
+            algoritmo = getattr(self, nome)
+            algoritmo.liberar()
+            setattr(self, nome, algoritmo.algoritmo)
+        self.executor_paralelo.fechar()
+        self.executor_paralelo = None
+    
+    def definir_window(self, x_min: float, y_min: float, x_max: float, y_max: float,
+                       angulo: float = 0.0):
+        """Define a window diretamente (limites e rotação)"""
+        self.w_x_min = x_min
+        self.w_y_min = y_min
+        self.w_x_max = x_max
+        self.w_y_max = y_max
+        self.w_centro_x = (self.w_x_min + self.w_x_max) / 2
+        self.w_centro_y = (self.w_y_min + self.w_y_max) / 2
+        self.w_angulo = angulo
+    
+    def mover_window(self, dx: int, dy: int, passo: float = 1.0):
+        """Move a window na direção especificada"""
+        # Considerar a rotação da window
+        ang = np.radians(self.w_angulo)
+        dx_rot = dx * np.cos(ang) - dy * np.sin(ang)
+        dy_rot = dx * np.sin(ang) + dy * np.cos(ang)
+        
+        deslocamento = passo * np.array([dx_rot, dy_rot])
+        
+        self.w_x_min += deslocamento[0]
+        self.w_x_max += deslocamento[0]
+        self.w_y_min += deslocamento[1]
+        self.w_y_max += deslocamento[1]
+        self.w_centro_x += deslocamento[0]
+        self.w_centro_y += deslocamento[1]
+    
+    def rotacionar_window(self, angulo: float):
+        """Rotaciona a window em torno do seu centro"""
+        self.w_angulo = (self.w_angulo + angulo) % 360
+    
+    def escalar_window(self, fator: float):
+        """Escala a window em relação ao seu centro"""
+        largura = self.w_x_max - self.w_x_min
+        altura = self.w_y_max - self.w_y_min
+        
+        nova_largura = largura * fator
+        nova_altura = altura * fator
+        
+        self.w_x_min = self.w_centro_x - nova_largura / 2
+        self.w_x_max = self.w_centro_x + nova_largura / 2
+        self.w_y_min = self.w_centro_y - nova_altura / 2
+        self.w_y_max = self.w_centro_y + nova_altura / 2
+    
+    def matriz_mundo_para_ppc(self) -> np.ndarray:
+        """Retorna a matriz composta que leva coordenadas do mundo ao PPC"""
+        t1 = Transformacao.translacao(-self.w_centro_x, -self.w_centro_y)
+        r = Transformacao.rotacao(-self.w_angulo)
+        t2 = Transformacao.translacao(self.w_centro_x, self.w_centro_y)
+        
+        # Compor transformações
+        return Transformacao.compor_transformacoes(t2, r, t1)
+    
+    def poligono_window_mundo(self) -> np.ndarray:
+        """Retorna os quatro cantos, no mundo, da window rotacionada"""
+        matriz = np.linalg.inv(self.matriz_mundo_para_ppc())
+        
+        cantos = np.array([
+            [self.w_x_min, self.w_y_min],
+            [self.w_x_max, self.w_y_min],
+            [self.w_x_max, self.w_y_max],
+            [self.w_x_min, self.w_y_max]
+        ])
+        return Transformacao.aplicar_em_lote(cantos, matriz)
+    
+    def extensao_window_mundo(self) -> Tuple[float, float, float, float]:
+        """Retorna a caixa envolvente, no mundo, da window rotacionada"""
+        cantos_mundo = self.poligono_window_mundo()
+        x_min, y_min = cantos_mundo.min(axis=0).tolist()
+        x_max, y_max = cantos_mundo.max(axis=0).tolist()
+        return x_min, y_min, x_max, y_max
+    
+    def consultar_indice_espacial(self):
+        """Seleciona, pelo índice espacial, os objetos que podem estar na window"""
+        cena = self.cena
+        if not (self.usar_indice_espacial and cena.possui_indice):
+            self.candidatos_pontos = None
+            self.candidatos_retas = None
+            self.candidatos_poligonos = None
+            return
+        
+        extensao = self.extensao_window_mundo()
+        self.candidatos_pontos = cena.indice_pontos.consultar(*extensao)
+        self.candidatos_retas = cena.indice_retas.consultar(*extensao)
+        self.candidatos_poligonos = cena.indice_poligonos.consultar(*extensao)
+    
+    def selecionar_por_window(self):
+        """
+        Descarta os candidatos cujas caixas no mundo não tocam a window rotacionada
+        
+        A consulta ao índice usa a caixa envolvente da window rotacionada,
+        que a 45° tem o dobro da área da própria window. Aqui cada caixa do
+        mundo é comparada ao retângulo da window pelo teste dos eixos
+        separadores: dois retângulos são disjuntos se e somente se as suas
+        projeções se separam em um dos eixos de um deles. Nos eixos do mundo
+        a caixa é comparada à extensão da window; nos eixos da window, a
+        projeção da caixa (centro transformado, meias-dimensões pelo valor
+        absoluto da rotação) é comparada aos limites da window. Só os
+        sobreviventes seguem para a transformação e o clipping.
+        
+        Pontos não passam por aqui: para eles o teste seria o próprio
+        clipping. Sem rotação (ângulo múltiplo de 90°), os eixos coincidem e
+        o índice espacial já fez o teste.
+        """
+        if not self.usar_selecao_window:
+            return
+        cena = self.cena
+        indice = self.usar_indice_espacial and cena.possui_indice
+        if indice and self.w_angulo % 90 == 0:
+            return
+        
+        extensao = self.extensao_window_mundo()
+        matriz = self.matriz_mundo_para_ppc().tolist()
+        limites = ((self.w_x_min, self.w_x_max), (self.w_y_min, self.w_y_max))
+        contar = self.instrumentacao.contar
+        for tipo in ('retas', 'poligonos'):
+            candidatos = getattr(self, f"candidatos_{tipo}")
+            caixas = cena.caixas_envolventes(tipo)
+            if candidatos is None:
+                # Eixos do mundo (com o índice, a consulta já os testou)
+                x_min, y_min, x_max, y_max = extensao
+                total = len(caixas)
+                tocam = np.flatnonzero((caixas[:, 0] <= x_max) & (x_min <= caixas[:, 2]) &
+                                       (caixas[:, 1] <= y_max) & (y_min <= caixas[:, 3]))
+                caixas = caixas[tocam]
+            else:
+                total = len(candidatos)
+                tocam = np.arange(total)
+                caixas = caixas[candidatos]
+            
+            # Eixos da window
+            x0, y0, x1, y1 = caixas.T
+            cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+            mx, my = (x1 - x0) / 2, (y1 - y0) / 2
+            for eixo, (w_min, w_max) in enumerate(limites):
+                a, b, c = matriz[eixo]
+                centro = a * cx + b * cy + c
+                meia = abs(a) * mx + abs(b) * my
+                toca = (centro - meia <= w_max) & (w_min <= centro + meia)
+                tocam, cx, cy, mx, my = tocam[toca], cx[toca], cy[toca], mx[toca], my[toca]
+            
+            contar(f"{tipo}_fora_window", total - len(tocam))
+            if candidatos is None and len(tocam) == total:
+                continue
+            setattr(self, f"candidatos_{tipo}", tocam if candidatos is None else candidatos[tocam])
+    
+    def tamanho_pixel(self) -> float:
+        """Retorna o lado de um pixel da viewport em unidades do mundo"""
+        return min((self.w_x_max - self.w_x_min) / (self.vp_x_max - self.vp_x_min),
+                   (self.w_y_max - self.w_y_min) / (self.vp_y_max - self.vp_y_min))
+    
+    def selecionar_nivel_lod(self):
+        """
+        Escolhe o nível de detalhe dos polígonos para a escala atual
+        
+        É usado o nível mais simplificado cuja tolerância não passa de
+        FATOR_PIXEL_LOD pixels: com a window afastada, polígonos inteiros
+        ocupam poucos pixels e são processados com poucos vértices.
+        """
+        cena = self.cena
+        nivel = 0
+        if self.usar_lod and cena.lod is not None:
+            nivel = cena.lod.nivel_para(self.FATOR_PIXEL_LOD * self.tamanho_pixel())
+        
+        self.nivel_lod = nivel
+        if nivel:
+            self.lod_mundo, self.lod_offsets = cena.lod.nivel(nivel)
+        else:
+            self.lod_mundo, self.lod_offsets = cena.poligonos_mundo, cena.poligonos_offsets
+    
+    @staticmethod
+    def _pendentes(transformados: np.ndarray, candidatos: Optional[np.ndarray]) -> np.ndarray:
+        """Índices dos objetos candidatos (None para todos) ainda não transformados"""
+        if candidatos is None:
+            return np.flatnonzero(~transformados)
+        return candidatos[~transformados[candidatos]]
+    
+    @staticmethod
+    def _transformar_pendentes(mundo: np.ndarray, ppc: np.ndarray, transformados: np.ndarray,
+                               candidatos: Optional[np.ndarray], matriz: np.ndarray,
+                               vertices=None):
+        """
+        Transforma os objetos candidatos que ainda não estão no PPC
+        
+        Args:
+            mundo, ppc: blocos (V, 2) de coordenadas do mundo e do PPC
+            transformados: máscara por objeto dos que já foram transformados
+            candidatos: índices dos objetos necessários (None para todos)
+            matriz: matriz mundo → PPC
+            vertices: função que leva índices de objetos a índices de linhas
+                de mundo/ppc (None quando há uma linha por objeto)
+        """
+        pendentes = MotorGrafico._pendentes(transformados, candidatos)
+        if len(pendentes) == len(transformados):
+            Transformacao.aplicar_em_lote(mundo, matriz, out=ppc)
+        elif len(pendentes):
+            linhas = pendentes if vertices is None else vertices(pendentes)
+            ppc[linhas] = Transformacao.aplicar_em_lote(mundo[linhas], matriz)
+        transformados[pendentes] = True
+    
+    @staticmethod
+    def _caixas_para_ppc(caixas: np.ndarray, matriz: np.ndarray) -> np.ndarray:
+        """
+        Leva caixas envolventes do mundo (N, 4) para o PPC
+        
+        A caixa no PPC é a caixa envolvente da caixa do mundo transformada:
+        o centro é transformado e as meias-dimensões são multiplicadas pelo
+        valor absoluto da parte linear da matriz.
+        """
+        centros = Transformacao.aplicar_em_lote((caixas[:, :2] + caixas[:, 2:]) / 2, matriz)
+        meias = (caixas[:, 2:] - caixas[:, :2]) / 2 @ np.abs(matriz[:2, :2]).T
+        return np.hstack([centros - meias, centros + meias])
+    
+    @staticmethod
+    def _transformar_caixas_pendentes(caixas_mundo: np.ndarray, caixas_ppc: np.ndarray,
+                                      transformadas: np.ndarray, candidatos: Optional[np.ndarray],
+                                      matriz: np.ndarray):
+        """
+        Leva ao PPC as caixas envolventes dos candidatos que ainda não estão lá
+        
+        A caixa no PPC (ver _caixas_para_ppc) contém o objeto, então uma
+        caixa inteiramente dentro (ou fora) da window garante o mesmo para
+        o objeto.
+        """
+        pendentes = MotorGrafico._pendentes(transformadas, candidatos)
+        if not len(pendentes):
+            return
+        caixas_ppc[pendentes] = MotorGrafico._caixas_para_ppc(caixas_mundo[pendentes], matriz)
+        transformadas[pendentes] = True
+    
+    def transformar_mundo_para_ppc(self):
+        """Transforma objetos do mundo para o PPC usando numpy"""
+        matriz = self.matriz_mundo_para_ppc()
+        cena = self.cena
+        
+        # Reaproveitar o resultado de uma matriz já usada (zoom, troca de algoritmo)
+        chave = CacheTransformacao.chave(matriz)
+        entrada = self.cache_transformacao.obter(chave)
+        if entrada is None:
+            entrada = {
+                'pontos': (np.empty_like(cena.pontos_mundo), np.zeros(cena.n_pontos, dtype=bool)),
+                'retas': (np.empty_like(cena.retas_mundo), np.zeros(cena.n_retas, dtype=bool))
+            }
+            self.cache_transformacao.inserir(chave, entrada)
+        
+        # Cada nível de detalhe tem seu próprio buffer PPC na entrada da matriz
+        chave_poligonos = ('poligonos', self.nivel_lod)
+        if chave_poligonos not in entrada:
+            entrada[chave_poligonos] = (np.empty_like(self.lod_mundo),
+                                        np.zeros(cena.n_poligonos, dtype=bool))
+        
+        cena.pontos_ppc, pontos_feitos = entrada['pontos']
+        cena.retas_ppc, retas_feitas = entrada['retas']
+        self.lod_ppc, poligonos_feitos = entrada[chave_poligonos]
+        if self.nivel_lod == 0:
+            cena.poligonos_ppc = self.lod_ppc
+        
+        # Aplicar a cada bloco de coordenadas de uma só vez, direto nos buffers PPC
+        self._transformar_pendentes(cena.pontos_mundo, cena.pontos_ppc, pontos_feitos,
+                                    self.candidatos_pontos, matriz)
+        self._transformar_pendentes(cena.retas_mundo.reshape(-1, 2), cena.retas_ppc.reshape(-1, 2),
+                                    retas_feitas, self.candidatos_retas, matriz,
+                                    lambda r: np.stack([2 * r, 2 * r + 1], axis=1).ravel())
+        self._transformar_pendentes(self.lod_mundo, self.lod_ppc, poligonos_feitos,
+                                    self.candidatos_poligonos, matriz,
+                                    lambda p: cena.indices_vertices(p, self.lod_offsets))
+        
+        # Caixas envolventes (valem para todos os níveis de detalhe)
+        if self.usar_caixas_envolventes:
+            if 'caixas_retas' not in entrada:
+                entrada['caixas_retas'] = (np.empty((cena.n_retas, 4)),
+                                           np.zeros(cena.n_retas, dtype=bool))
+                entrada['caixas_poligonos'] = (np.empty((cena.n_poligonos, 4)),
+                                               np.zeros(cena.n_poligonos, dtype=bool))
+            self.caixas_retas_ppc, retas_feitas = entrada['caixas_retas']
+            self.caixas_poligonos_ppc, poligonos_feitos = entrada['caixas_poligonos']
+            self._transformar_caixas_pendentes(cena.caixas_envolventes('retas'), self.caixas_retas_ppc,
+                                               retas_feitas, self.candidatos_retas, matriz)
+            self._transformar_caixas_pendentes(cena.caixas_envolventes('poligonos'),
+                                               self.caixas_poligonos_ppc, poligonos_feitos,
+                                               self.candidatos_poligonos, matriz)
+    
+    def classificar_caixas(self, caixas: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compara caixas envolventes no PPC com a window
+        
+        Returns:
+            Tupla de máscaras (inteiramente dentro, inteiramente fora); as
+            bordas da window contam como dentro, como nos algoritmos de clipping
+        """
+        x_min, y_min, x_max, y_max = caixas.T
+        dentro = ((self.w_x_min <= x_min) & (x_max <= self.w_x_max) &
+                  (self.w_y_min <= y_min) & (y_max <= self.w_y_max))
+        fora = ((x_max < self.w_x_min) | (self.w_x_max < x_min) |
+                (y_max < self.w_y_min) | (self.w_y_max < y_min))
+        return dentro, fora
+    
+    def aplicar_clipping(self):
+        """Aplica clipping nos objetos"""
+        cena = self.cena
+        contar = self.instrumentacao.contar
+        
+        # Clipping de pontos
+        if self.candidatos_pontos is None:
+            x, y = cena.pontos_ppc.T
+            cena.pontos_visivel[:] = ((self.w_x_min <= x) & (x <= self.w_x_max) &
+                                      (self.w_y_min <= y) & (y <= self.w_y_max))
+        else:
+            x, y = cena.pontos_ppc[self.candidatos_pontos].T
+            cena.pontos_visivel[:] = False
+            cena.pontos_visivel[self.candidatos_pontos] = (
+                (self.w_x_min <= x) & (x <= self.w_x_max) &
+                (self.w_y_min <= y) & (y <= self.w_y_max)
+            )
+        
+        # Selecionar algoritmo de clipping de retas
+        if self.algoritmo_reta == "Cohen-Sutherland":
+            algoritmo = self.algoritmo_reta_cs
+        else:
+            algoritmo = self.algoritmo_reta_lb
+        
+        # Clipping de retas (em lote); com as caixas envolventes, só as retas
+        # que podem cruzar a borda da window chegam ao algoritmo
+        if self.usar_caixas_envolventes:
+            candidatos = self.candidatos_retas
+            if candidatos is None:
+                candidatos = np.arange(cena.n_retas)
+            dentro, fora = self.classificar_caixas(self.caixas_retas_ppc[candidatos])
+            cruzando = candidatos[~(dentro | fora)]
+            dentro = candidatos[dentro]
+            
+            recortes, visiveis = algoritmo.clip_batch(
+                cena.retas_ppc[cruzando], self.w_x_min, self.w_y_min, self.w_x_max, self.w_y_max
+            )
+            cena.retas_visivel[:] = False
+            cena.retas_visivel[dentro] = True
+            cena.retas_visivel[cruzando] = visiveis
+            cena.retas_recortadas = np.empty_like(cena.retas_mundo)
+            cena.retas_recortadas[dentro] = cena.retas_ppc[dentro]
+            cena.retas_recortadas[cruzando] = recortes
+            
+            contar('retas_aceitas_caixa', len(dentro))
+            contar('retas_rejeitadas_caixa', len(candidatos) - len(dentro) - len(cruzando))
+            contar('retas_clipping', len(cruzando))
+        elif self.candidatos_retas is None:
+            cena.retas_recortadas, cena.retas_visivel = algoritmo.clip_batch(
+                cena.retas_ppc, self.w_x_min, self.w_y_min, self.w_x_max, self.w_y_max
+            )
+        else:
+            recortes, visiveis = algoritmo.clip_batch(
+                cena.retas_ppc[self.candidatos_retas],
+                self.w_x_min, self.w_y_min, self.w_x_max, self.w_y_max
+            )
+            cena.retas_visivel[:] = False
+            cena.retas_visivel[self.candidatos_retas] = visiveis
+            cena.retas_recortadas = np.empty_like(cena.retas_mundo)
+            cena.retas_recortadas[self.candidatos_retas] = recortes
+        
+        # Clipping de polígonos (em lote, sobre o buffer plano de vértices do nível atual)
+        candidatos = self.candidatos_poligonos
+        if candidatos is None:
+            candidatos = np.arange(cena.n_poligonos)
+        dentro = candidatos[:0]
+        cruzando = candidatos
+        if self.usar_caixas_envolventes:
+            dentro, fora = self.classificar_caixas(self.caixas_poligonos_ppc[candidatos])
+            cruzando = candidatos[~(dentro | fora)]
+            dentro = candidatos[dentro]
+            contar('poligonos_aceitos_caixa', len(dentro))
+            contar('poligonos_rejeitados_caixa', len(candidatos) - len(dentro) - len(cruzando))
+            contar('poligonos_clipping', len(cruzando))
+        
+        if len(cruzando) == cena.n_poligonos:
+            vertices = self.lod_ppc
+            offsets = self.lod_offsets
+        else:
+            vertices = self.lod_ppc[cena.indices_vertices(cruzando, self.lod_offsets)]
+            tamanhos = self.lod_offsets[cruzando + 1] - self.lod_offsets[cruzando]
+            offsets = np.concatenate(([0], np.cumsum(tamanhos)))
+        
+        recortados, offsets_recortados = self.algoritmo_poligono.clip_batch(
+            vertices, offsets, self.w_x_min, self.w_y_min, self.w_x_max, self.w_y_max
+        )
+        
+        tamanhos = np.zeros(cena.n_poligonos, dtype=np.int64)
+        tamanhos[cruzando] = np.diff(offsets_recortados)
+        tamanhos[dentro] = self.lod_offsets[dentro + 1] - self.lod_offsets[dentro]
+        cena.poligonos_visivel[:] = tamanhos > 0
+        cena.poligonos_recortados_offsets = np.concatenate(([0], np.cumsum(tamanhos)))
+        
+        # Polígonos aceitos pela caixa entram sem alteração, ao lado dos recortados
+        if len(dentro):
+            offsets_saida = cena.poligonos_recortados_offsets
+            saida = np.empty((offsets_saida[-1], 2), dtype=self.lod_ppc.dtype)
+            saida[cena.indices_vertices(cruzando, offsets_saida)] = recortados
+            saida[cena.indices_vertices(dentro, offsets_saida)] = (
+                self.lod_ppc[cena.indices_vertices(dentro, self.lod_offsets)]
+            )
+            recortados = saida
+        cena.poligonos_recortados = recortados
+    
+    def transformar_ppc_para_viewport(self, x: float, y: float) -> Tuple[int, int]:
+        """Transforma coordenadas do PPC para a viewport"""
+        # Normalização
+        x_norm = (x - self.w_x_min) / (self.w_x_max - self.w_x_min)
+        y_norm = (y - self.w_y_min) / (self.w_y_max - self.w_y_min)
+        
+        # Mapeamento para viewport (inverter Y)
+        x_vp = self.vp_x_min + x_norm * (self.vp_x_max - self.vp_x_min)
+        y_vp = self.vp_y_max - y_norm * (self.vp_y_max - self.vp_y_min)
+        
+        return int(x_vp), int(y_vp)
+    
+    def estagios(self) -> Tuple[Tuple[str, Callable[[], None]], ...]:
+        """Retorna os estágios de processar(), em ordem, como pares (nome, função)"""
+        return (('consultar_indice', self.consultar_indice_espacial),
+                ('selecionar_por_window', self.selecionar_por_window),
+                ('transformar_mundo_para_ppc', self.transformar_mundo_para_ppc),
+                ('aplicar_clipping', self.aplicar_clipping))
+    
+    def processar(self, cancelado: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Executa os estágios de seleção, transformação e clipping
+        
+        Args:
+            cancelado: função consultada entre os estágios; se retornar True,
+                o processamento é abandonado
+        
+        Returns:
+            False se o processamento foi abandonado
+        """
+        instrumentacao = self.instrumentacao
+        algoritmos = (self.algoritmo_reta_cs, self.algoritmo_reta_lb, self.algoritmo_poligono)
+        for algoritmo in algoritmos:
+            algoritmo.contar_intersecoes = instrumentacao.ativa
+            algoritmo.intersecoes = 0
+        
+        self.selecionar_nivel_lod()
+        for estagio, funcao in self.estagios():
+            if cancelado is not None and cancelado():
+                return False
+            with instrumentacao.medir(estagio):
+                funcao()
+        
+        if instrumentacao.ativa:
+            self.contar_objetos()
+            instrumentacao.contar('intersecoes', sum(a.intersecoes for a in algoritmos))
+        return True
+    
+    def contar_objetos(self):
+        """
+        Registra na instrumentação quantos objetos de cada tipo foram
+        processados pelo clipping, aceitos sem alteração, rejeitados e recortados
+        """
+        cena = self.cena
+        contar = self.instrumentacao.contar
+        
+        def processados(candidatos, total):
+            return total if candidatos is None else len(candidatos)
+        
+        # Pontos não são recortados: ou são aceitos ou rejeitados
+        n = processados(self.candidatos_pontos, cena.n_pontos)
+        visiveis = int(np.count_nonzero(cena.pontos_visivel))
+        contar('pontos_processados', n)
+        contar('pontos_aceitos', visiveis)
+        contar('pontos_rejeitados', n - visiveis)
+        
+        n = processados(self.candidatos_retas, cena.n_retas)
+        visiveis = np.flatnonzero(cena.retas_visivel)
+        inalteradas = (cena.retas_recortadas[visiveis] == cena.retas_ppc[visiveis]).all(axis=1)
+        aceitas = int(np.count_nonzero(inalteradas))
+        contar('retas_processadas', n)
+        contar('retas_aceitas', aceitas)
+        contar('retas_recortadas', len(visiveis) - aceitas)
+        contar('retas_rejeitadas', n - len(visiveis))
+        
+        # Um polígono visível é aceito quando todos os seus vértices estão na window
+        n = processados(self.candidatos_poligonos, cena.n_poligonos)
+        visiveis = np.flatnonzero(cena.poligonos_visivel)
+        aceitos = 0
+        if len(visiveis):
+            x, y = self.lod_ppc[cena.indices_vertices(visiveis, self.lod_offsets)].T
+            dentro = ((self.w_x_min <= x) & (x <= self.w_x_max) &
+                      (self.w_y_min <= y) & (y <= self.w_y_max))
+            tamanhos = self.lod_offsets[visiveis + 1] - self.lod_offsets[visiveis]
+            aceitos = int(np.count_nonzero(
+                np.logical_and.reduceat(dentro, np.cumsum(tamanhos) - tamanhos)
+            ))
+        contar('poligonos_processados', n)
+        contar('poligonos_aceitos', aceitos)
+        contar('poligonos_recortados', len(visiveis) - aceitos)
+        contar('poligonos_rejeitados', n - len(visiveis))
+        
+        # Vértices de polígonos que chegaram ao clipping, no nível de detalhe em uso
+        if self.candidatos_poligonos is None:
+            vertices = len(self.lod_mundo)
+        else:
+            candidatos = self.candidatos_poligonos
+            vertices = int((self.lod_offsets[candidatos + 1] - self.lod_offsets[candidatos]).sum())
+        contar('nivel_lod', self.nivel_lod)
+        contar('poligonos_vertices', vertices)
+    
+    def transformar_ppc_para_viewport_lote(self, coords: np.ndarray) -> np.ndarray:
+        """
+        Versão vetorizada de transformar_ppc_para_viewport
+        
+        Args:
+            coords: array (N, 2) de coordenadas no PPC
+        
+        Returns:
+            Array (N, 2) de pixels inteiros da viewport (mesmo arredondamento
+            da versão escalar)
+        """
+        x_norm = (coords[:, 0] - self.w_x_min) / (self.w_x_max - self.w_x_min)
+        y_norm = (coords[:, 1] - self.w_y_min) / (self.w_y_max - self.w_y_min)
+        
+        pixels = np.empty(coords.shape, dtype=np.int64)
+        pixels[:, 0] = self.vp_x_min + x_norm * (self.vp_x_max - self.vp_x_min)
+        pixels[:, 1] = self.vp_y_max - y_norm * (self.vp_y_max - self.vp_y_min)
+        return pixels
+    
+    def geometria_viewport(self) -> Dict[str, Tuple[List[int], List[Sequence[int]]]]:
+        """
+        Retorna a geometria visível já mapeada para a viewport
+        
+        Com ``usar_decimacao``, a geometria é reduzida no espaço da tela antes
+        de ir para o canvas, sem mudar o que aparece: pontos de mesma cor no
+        mesmo pixel viram um só, vértices consecutivos no mesmo pixel são
+        unidos e retas e polígonos contidos em um único pixel são descartados.
+        
+        Returns:
+            Dicionário com as chaves 'pontos', 'retas' e 'poligonos'; cada valor
+            é a tupla (índices dos objetos visíveis, coordenadas de viewport).
+            Pontos vêm como a caixa do círculo (x-3, y-3, x+3, y+3), retas como
+            (x1, y1, x2, y2) e polígonos como a lista plana x1, y1, x2, y2, ...
+        """
+        return {
+            'pontos': self._pontos_viewport(),
+            'retas': self._retas_viewport(),
+            'poligonos': self._poligonos_viewport()
+        }
+    
+    def _pontos_viewport(self) -> Tuple[List[int], List[Sequence[int]]]:
+        """Pontos visíveis na viewport (um por pixel e cor, com decimação)"""
+        cena = self.cena
+        indices = np.flatnonzero(cena.pontos_visivel)
+        pixels = self.transformar_ppc_para_viewport_lote(cena.pontos_ppc[indices])
+        
+        if self.usar_decimacao and len(indices):
+            # Fica o último ponto de cada pixel e cor, o que é desenhado por cima
+            chaves = np.column_stack([pixels, cena.pontos_cor[indices]])
+            _, ultimos = np.unique(chaves[::-1], axis=0, return_index=True)
+            ultimos = np.sort(len(chaves) - 1 - ultimos)
+            self.instrumentacao.contar('pontos_decimados', len(indices) - len(ultimos))
+            indices, pixels = indices[ultimos], pixels[ultimos]
+        
+        return indices.tolist(), np.hstack([pixels - 3, pixels + 3]).tolist()
+    
+    def _retas_viewport(self) -> Tuple[List[int], List[Sequence[int]]]:
+        """Retas visíveis na viewport (sem as de um único pixel, com decimação)"""
+        cena = self.cena
+        indices = np.flatnonzero(cena.retas_visivel)
+        pixels = self.transformar_ppc_para_viewport_lote(
+            cena.retas_recortadas[indices].reshape(-1, 2)
+        ).reshape(-1, 4)
+        
+        if self.usar_decimacao:
+            extensas = (pixels[:, :2] != pixels[:, 2:]).any(axis=1)
+            self.instrumentacao.contar('retas_subpixel', len(indices) - int(np.count_nonzero(extensas)))
+            indices, pixels = indices[extensas], pixels[extensas]
+        
+        return indices.tolist(), pixels.tolist()
+    
+    def _poligonos_viewport(self) -> Tuple[List[int], List[Sequence[int]]]:
+        """
+        Polígonos visíveis na viewport
+        
+        Com decimação, vértices iguais ao anterior do anel (o primeiro é
+        comparado com o último) são removidos; um polígono que fica sem
+        vértices estava em um único pixel e é descartado, e um que fica com
+        dois repete o último para continuar sendo um polígono válido no canvas.
+        """
+        cena = self.cena
+        offsets = cena.poligonos_recortados_offsets
+        tamanhos = np.diff(offsets)
+        indices = np.flatnonzero(cena.poligonos_visivel & (tamanhos >= 3))
+        tamanhos = tamanhos[indices]
+        pixels = self.transformar_ppc_para_viewport_lote(
+            cena.poligonos_recortados[cena.indices_vertices(indices, offsets)]
+        )
+        inicios = np.cumsum(tamanhos) - tamanhos
+        
+        if self.usar_decimacao and len(indices):
+            anterior = np.arange(-1, len(pixels) - 1)
+            anterior[inicios] = inicios + tamanhos - 1
+            manter = (pixels != pixels[anterior]).any(axis=1)
+            
+            anel = np.repeat(np.arange(len(indices)), tamanhos)
+            novos_tamanhos = np.bincount(anel[manter], minlength=len(indices))
+            self.instrumentacao.contar('vertices_decimados', len(pixels) - int(np.count_nonzero(manter)))
+            self.instrumentacao.contar('poligonos_subpixel', int(np.count_nonzero(novos_tamanhos == 0)))
+            
+            pixels = pixels[manter]
+            inicios = np.cumsum(novos_tamanhos) - novos_tamanhos
+            extensos = novos_tamanhos > 0
+            indices, tamanhos, inicios = indices[extensos], novos_tamanhos[extensos], inicios[extensos]
+        
+        planos = pixels.ravel().tolist()
+        coords = []
+        for inicio, tamanho in zip((2 * inicios).tolist(), (2 * tamanhos).tolist()):
+            coords_poli = planos[inicio:inicio + tamanho]
+            if tamanho == 4:
+                coords_poli.extend(coords_poli[2:])
+            coords.append(coords_poli)
+        return indices.tolist(), coords
+    
+    def gerar_quadro(self) -> dict:
+        """
+        Reúne o que a interface precisa para desenhar o resultado de processar()
+        
+        Returns:
+            Dicionário com 'geometria' (ver geometria_viewport), 'bordas' (ver
+            bordas_window_viewport), 'visiveis' (quantidade de objetos
+            visíveis por tipo) e 'nivel_lod'. Não referencia os buffers da
+            cena, então continua válido enquanto outro quadro é processado.
+        """
+        cena = self.cena
+        with self.instrumentacao.medir('geometria_viewport'):
+            geometria = self.geometria_viewport()
+        return {
+            'geometria': geometria,
+            'bordas': self.bordas_window_viewport(),
+            'visiveis': {
+                'pontos': int(np.count_nonzero(cena.pontos_visivel)),
+                'retas': int(np.count_nonzero(cena.retas_visivel)),
+                'poligonos': int(np.count_nonzero(cena.poligonos_visivel))
+            },
+            'nivel_lod': self.nivel_lod
+        }
+    
+    def bordas_window_viewport(self) -> List[int]:
+        """Retorna os cantos da window mapeados para a viewport (lista plana)"""
+        cantos = [
+            (self.w_x_min, self.w_y_min),
+            (self.w_x_max, self.w_y_min),
+            (self.w_x_max, self.w_y_max),
+            (self.w_x_min, self.w_y_max)
+        ]
+        
+        coords = []
+        for x, y in cantos:
+            x_vp, y_vp = self.transformar_ppc_para_viewport(x, y)
+            coords.extend([x_vp, y_vp])
+        return coords
@@ -0,0 +1,134 @@
+"""
+Módulo contendo a execução do pipeline em uma thread de segundo plano
+"""
+import threading
+from typing import Optional
+
+from pipeline import MotorGrafico
+from instrumentation import Instrumentacao
+from scene_buffers import SceneBuffers
+
+
+class TrabalhadorPipeline:
+    """
+    Executa o pipeline (seleção, transformação, clipping e mapeamento para a
+    viewport) em uma thread separada da interface
+    
+    A thread tem o seu próprio MotorGrafico; a interface só envia cópias do
+    estado da window com solicitar(). Cada pedido recebe um número de
+    geração crescente e apenas o pedido mais recente é guardado: um pedido
+    ainda não iniciado é substituído e um em execução é abandonado entre
+    dois estágios assim que chega outro mais novo. A interface consulta
+    obter_resultado() (por ``root.after``) e só recebe quadros da geração
+    mais recente, então o custo percebido é o do último quadro.
+    """
+    
+    def __init__(self, instrumentacao: Optional[Instrumentacao] = None):
+        """
+        Inicia a thread
+        
+        Args:
+            instrumentacao: instrumentação da interface, que mede o desenho e
+                encerra o quadro. A thread não a altera: usa uma instância
+                própria, ativa quando ela estiver, e devolve o registro do
+                quadro em ``quadro['instrumentacao']``
+        """
+        self.motor = MotorGrafico()
+        self.instrumentacao_interface = instrumentacao
+        
+        self.geracao = 0
+        self._pedido = None
+        self._resultado: Optional[dict] = None
+        self._encerrar = False
+        self._condicao = threading.Condition()
+        self._thread = threading.Thread(target=self._executar, name="TrabalhadorPipeline",
+                                        daemon=True)
+        self._thread.start()
+    
+    def solicitar(self, estado: dict, cena: SceneBuffers) -> int:
+        """
+        Pede um novo quadro
+        
+        Args:
+            estado: estado da window/viewport (MotorGrafico.estado())
+            cena: buffers da cena; uma cena diferente da anterior é carregada
+                no motor da thread antes do processamento
+        
+        Returns:
+            Número de geração do pedido
+        """
+        with self._condicao:
+            self.geracao += 1
+            self._pedido = (self.geracao, estado, cena)
+            self._condicao.notify()
+            return self.geracao
+    
+    def obsoleto(self, geracao: int) -> bool:
+        """Indica se já existe um pedido mais novo que o da geração informada"""
+        return geracao != self.geracao
+    
+    def obter_resultado(self) -> Optional[dict]:
+        """
+        Retorna (e consome) o último quadro pronto, se ainda for atual
+        
+        Returns:
+            O dicionário de MotorGrafico.gerar_quadro() acrescido de
+            'geracao' e 'instrumentacao' (Instrumentacao.registro_quadro()), ou {'geracao': ..., 'erro': exceção} se o
+            processamento falhou; None se não há quadro atual pronto
+        """
+        with self._condicao:
+            resultado, self._resultado = self._resultado, None
+        if resultado is None or self.obsoleto(resultado['geracao']):
+            return None
+        return resultado
+    
+    def encerrar(self):
+        """Encerra a thread (o pedido em execução é abandonado)"""
+        with self._condicao:
+            self._encerrar = True
+            self.geracao += 1
+            self._condicao.notify()
+        self._thread.join()
+    
+    def _executar(self):
+        """Laço da thread: processa sempre o pedido mais recente"""
+        while True:
+            with self._condicao:
+                while self._pedido is None and not self._encerrar:
+                    self._condicao.wait()
+                if self._encerrar:
+                    return
+                geracao, estado, cena = self._pedido
+                self._pedido = None
+            
+            try:
+                resultado = self._processar(geracao, estado, cena)
+            except Exception as e:
+                resultado = {'geracao': geracao, 'erro': e}
+            
+            if resultado is not None:
+                with self._condicao:
+                    self._resultado = resultado
+    
+    def _processar(self, geracao: int, estado: dict, cena: SceneBuffers) -> Optional[dict]:
+        """Executa um pedido; retorna None se ele ficou obsoleto no caminho"""
+        motor = self.motor
+        if motor.cena is not cena:
+            motor.carregar_cena({}, cena)
+        motor.restaurar_estado(estado)
+        
+        def cancelado():
+            return self.obsoleto(geracao)
+        
+        if self.instrumentacao_interface is not None:
+            motor.instrumentacao.ativa = self.instrumentacao_interface.ativa
+        motor.instrumentacao.iniciar_quadro()
+        if not motor.processar(cancelado):
+            return None
+        quadro = motor.gerar_quadro()
+        if cancelado():
+            return None
+        
+        quadro['geracao'] = geracao
+        quadro['instrumentacao'] = motor.instrumentacao.registro_quadro()
+        return quadro
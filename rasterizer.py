@@ -0,0 +1,142 @@
+"""
+Módulo contendo a rasterização em lote (NumPy) de geometria já na viewport
+"""
+from typing import List, Sequence
+import numpy as np
+
+
+class Rasterizador:
+    """
+    Desenha pontos, segmentos e contornos em uma imagem RGB (altura, largura, 3)
+    
+    Cada primitiva é amostrada com um pixel por passo no eixo dominante e
+    todos os pixels de um lote são escritos de uma só vez; primitivas
+    posteriores ficam por cima das anteriores. Usado pelo batch_render para
+    gravar imagens e pela interface para desenhar retas e pontos em um
+    único item do canvas.
+    """
+    
+    # Subconjunto das cores X11 usadas nas cenas (RGB)
+    CORES_X11 = {
+        'black': (0, 0, 0), 'white': (255, 255, 255), 'gray': (190, 190, 190),
+        'grey': (190, 190, 190), 'red': (255, 0, 0), 'green': (0, 255, 0),
+        'blue': (0, 0, 255), 'yellow': (255, 255, 0), 'cyan': (0, 255, 255),
+        'magenta': (255, 0, 255), 'orange': (255, 165, 0), 'purple': (160, 32, 240),
+        'brown': (165, 42, 42), 'pink': (255, 192, 203), 'gold': (255, 215, 0),
+        'darkred': (139, 0, 0), 'darkgreen': (0, 100, 0), 'darkblue': (0, 0, 139),
+        'darkgray': (169, 169, 169), 'darkgrey': (169, 169, 169),
+        'lightgray': (211, 211, 211), 'lightgrey': (211, 211, 211),
+        'lightblue': (173, 216, 230), 'lightgreen': (144, 238, 144),
+        'navy': (0, 0, 128), 'maroon': (176, 48, 96), 'violet': (238, 130, 238)
+    }
+    
+    # Quantidade máxima de pixels amostrados por vez (limita a memória temporária)
+    PIXELS_POR_LOTE = 1 << 20
+    
+    @staticmethod
+    def cor_rgb(nome: str) -> tuple:
+        """Converte um nome de cor X11 ou '#rrggbb' em RGB (preto se desconhecida)"""
+        nome = nome.strip().lower()
+        if nome.startswith('#') and len(nome) == 7:
+            return tuple(int(nome[i:i + 2], 16) for i in (1, 3, 5))
+        return Rasterizador.CORES_X11.get(nome.replace(' ', ''), (0, 0, 0))
+    
+    @staticmethod
+    def nova_imagem(largura: int, altura: int, fundo=(255, 255, 255)) -> np.ndarray:
+        """Cria uma imagem preenchida com a cor de fundo"""
+        imagem = np.empty((altura, largura, 3), dtype=np.uint8)
+        imagem[:] = fundo
+        return imagem
+    
+    @staticmethod
+    def ppm(imagem: np.ndarray) -> bytes:
+        """Codifica a imagem como PPM binário (P6)"""
+        altura, largura = imagem.shape[:2]
+        return f"P6\n{largura} {altura}\n255\n".encode('ascii') + imagem.tobytes()
+    
+    @staticmethod
+    def _pintar(imagem: np.ndarray, xs: np.ndarray, ys: np.ndarray, cores: np.ndarray):
+        """Escreve os pixels que caem dentro da imagem (cores: (3,) ou uma por pixel)"""
+        altura, largura = imagem.shape[:2]
+        dentro = (xs >= 0) & (xs < largura) & (ys >= 0) & (ys < altura)
+        
+        # Cada pixel RGB vira um único elemento de 3 bytes: uma escrita por pixel
+        # em vez de uma por canal
+        pixels = imagem.view('V3').reshape(-1)
+        cores = np.ascontiguousarray(cores).view('V3').reshape(-1)
+        pixels[ys[dentro] * largura + xs[dentro]] = cores[dentro] if len(cores) > 1 else cores[0]
+    
+    @staticmethod
+    def pontos(imagem: np.ndarray, centros: np.ndarray, cores, raio: int = 3):
+        """
+        Desenha discos preenchidos
+        
+        Args:
+            centros: array (N, 2) de pixels
+            cores: cor RGB única ou array (N, 3), uma por ponto
+            raio: raio dos discos em pixels (como create_oval de x-raio a x+raio)
+        """
+        centros = np.asarray(centros, dtype=np.int64).reshape(-1, 2)
+        cores = np.asarray(cores, dtype=np.uint8)
+        dx, dy = np.mgrid[-raio:raio + 1, -raio:raio + 1]
+        disco = dx * dx + dy * dy <= (raio + 0.5) ** 2
+        dx, dy = dx[disco], dy[disco]
+        
+        xs = (centros[:, :1] + dx).ravel()
+        ys = (centros[:, 1:] + dy).ravel()
+        if cores.ndim > 1:
+            cores = np.repeat(cores, len(dx), axis=0)
+        Rasterizador._pintar(imagem, xs, ys, cores)
+    
+    @staticmethod
+    def segmentos(imagem: np.ndarray, segmentos: np.ndarray, cores, largura: int = 1):
+        """
+        Desenha segmentos (N, 4) com x1, y1, x2, y2 em pixels
+        
+        Args:
+            cores: cor RGB única ou array (N, 3), uma por segmento
+            largura: espessura em pixels, acrescentada no eixo secundário de
+                cada segmento (como o ``width`` de create_line)
+        """
+        segmentos = np.asarray(segmentos, dtype=np.float64).reshape(-1, 4)
+        cores = np.asarray(cores, dtype=np.uint8)
+        por_segmento = cores.ndim > 1
+        if not len(segmentos):
+            return
+        
+        x1, y1, x2, y2 = segmentos.T
+        passos = np.maximum(np.abs(x2 - x1), np.abs(y2 - y1)).astype(np.int64) + 1
+        horizontal = np.abs(x2 - x1) >= np.abs(y2 - y1)
+        
+        # Lotes de segmentos com até PIXELS_POR_LOTE amostras (ao menos um segmento)
+        acumulado = np.cumsum(passos)
+        inicio = 0
+        while inicio < len(segmentos):
+            base = acumulado[inicio] - passos[inicio]
+            fim = max(int(np.searchsorted(acumulado, base + Rasterizador.PIXELS_POR_LOTE,
+                                          side='right')), inicio + 1)
+            lote = slice(inicio, fim)
+            n = passos[lote]
+            
+            t = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+            t = t / np.repeat(np.maximum(n - 1, 1), n)
+            xs = np.rint(np.repeat(x1[lote], n) + t * np.repeat((x2 - x1)[lote], n)).astype(np.int64)
+            ys = np.rint(np.repeat(y1[lote], n) + t * np.repeat((y2 - y1)[lote], n)).astype(np.int64)
+            cor = np.repeat(cores[lote], n, axis=0) if por_segmento else cores
+            
+            deslocar_y = np.repeat(horizontal[lote], n)
+            for k in range(largura):
+                Rasterizador._pintar(imagem, xs + k * ~deslocar_y, ys + k * deslocar_y, cor)
+            inicio = fim
+    
+    @staticmethod
+    def anel(imagem: np.ndarray, coords: Sequence[int], cor, largura: int = 1):
+        """Desenha o contorno fechado de uma lista plana x1, y1, x2, y2, ..."""
+        vertices = np.asarray(coords, dtype=np.int64).reshape(-1, 2)
+        segmentos = np.hstack([vertices, np.roll(vertices, -1, axis=0)])
+        Rasterizador.segmentos(imagem, segmentos, cor, largura)
+    
+    @staticmethod
+    def paleta(cores: List[str]) -> np.ndarray:
+        """Converte a tabela de cores da cena em um array (C, 3) de RGB"""
+        return np.array([Rasterizador.cor_rgb(c) for c in cores] or [(0, 0, 0)], dtype=np.uint8)
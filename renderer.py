@@ -0,0 +1,197 @@
+"""
+Módulo contendo o renderizador em modo retido sobre o canvas do Tkinter
+"""
+from typing import Dict, Iterator, List, Sequence
+import tkinter as tk
+import numpy as np
+
+from rasterizer import Rasterizador
+from scene_buffers import SceneBuffers
+
+
+class RenderizadorCanvas:
+    """
+    Mantém um item do canvas por objeto da cena e o atualiza no lugar
+    
+    Em vez de apagar e recriar todos os itens a cada quadro, cada objeto
+    recebe um item na primeira vez que fica visível. Nos quadros seguintes
+    apenas as coordenadas são atualizadas com ``canvas.coords`` e objetos
+    que saem da window são ocultados com ``state='hidden'``.
+    
+    Com ``em_lote``, pontos e retas não têm itens próprios: são rasterizados
+    juntos (Rasterizador) em uma imagem que ocupa um único item do canvas,
+    abaixo dos polígonos. O custo deixa de crescer com o número de itens do
+    Tk e passa a ser o de pintar os pixels com NumPy.
+    """
+    
+    TIPOS = ('pontos', 'retas', 'poligonos')
+    
+    # Tipos desenhados na imagem do modo em lote
+    TIPOS_LOTE = ('pontos', 'retas')
+    
+    def __init__(self, canvas, em_lote: bool = False):
+        self.canvas = canvas
+        self.em_lote = em_lote
+        self.cena = None
+        self.paleta = None
+        self.item_window = None
+        self.item_imagem = None
+        self.imagem = None
+        self.itens = {}
+        self.exibidos = {}
+        self.itens_criados = 0
+    
+    def preparar(self, cena: SceneBuffers):
+        """Associa o renderizador à cena, descartando itens de uma cena anterior"""
+        if cena is self.cena:
+            return
+        
+        self.canvas.delete("cena")
+        self.cena = cena
+        self.paleta = None
+        self.item_imagem = None
+        self.imagem = None
+        quantidades = {'pontos': cena.n_pontos, 'retas': cena.n_retas,
+                       'poligonos': cena.n_poligonos}
+        for tipo in self.TIPOS:
+            self.itens[tipo] = np.zeros(quantidades[tipo], dtype=np.int64)
+            self.exibidos[tipo] = np.zeros(quantidades[tipo], dtype=bool)
+    
+    def _criar_item(self, tipo: str, i: int, coords: Sequence[float]) -> int:
+        """Cria o item do canvas do objeto i"""
+        cena = self.cena
+        self.itens_criados += 1
+        if tipo == 'pontos':
+            cor = cena.cores[cena.pontos_cor[i]]
+            return self.canvas.create_oval(*coords, fill=cor, outline=cor,
+                                           tags=("cena", "pontos"))
+        if tipo == 'retas':
+            return self.canvas.create_line(*coords, fill=cena.cores[cena.retas_cor[i]],
+                                           width=2, tags=("cena", "retas"))
+        return self.canvas.create_polygon(*coords, outline=cena.cores[cena.poligonos_cor[i]],
+                                          fill="", width=2, tags=("cena", "poligonos"))
+    
+    def atualizar(self, tipo: str, indices: List[int], coords: List[Sequence[float]]):
+        """
+        Atualiza os itens de um tipo de objeto
+        
+        Args:
+            tipo: 'pontos', 'retas' ou 'poligonos'
+            indices: índices dos objetos visíveis neste quadro
+            coords: coordenadas de viewport de cada objeto visível
+        """
+        for _ in self.atualizar_em_etapas(tipo, indices, coords, max(len(indices), 1)):
+            pass
+    
+    def atualizar_em_etapas(self, tipo: str, indices: List[int], coords: List[Sequence[float]],
+                            tamanho_etapa: int) -> Iterator[None]:
+        """
+        Atualiza os itens de um tipo de objeto aos poucos
+        
+        Gerador que oculta primeiro os objetos que saíram da window e depois
+        atualiza (ou cria) ``tamanho_etapa`` itens a cada passo. O estado de
+        exibição é mantido a cada etapa, então o gerador pode ser abandonado
+        no meio (por um quadro mais novo) sem deixar o renderizador
+        inconsistente.
+        """
+        itens = self.itens[tipo]
+        exibidos = self.exibidos[tipo]
+        visiveis = np.zeros_like(exibidos)
+        visiveis[indices] = True
+        
+        # Ocultar objetos que saíram da window
+        for item in itens[exibidos & ~visiveis].tolist():
+            self.canvas.itemconfigure(item, state='hidden')
+        exibidos &= visiveis
+        
+        novos = False
+        for inicio in range(0, len(indices), tamanho_etapa):
+            if inicio:
+                yield
+            etapa = indices[inicio:inicio + tamanho_etapa]
+            for i, c, item, exibido in zip(etapa, coords[inicio:inicio + tamanho_etapa],
+                                           itens[etapa].tolist(), exibidos[etapa].tolist()):
+                if not item:
+                    itens[i] = self._criar_item(tipo, i, c)
+                    novos = True
+                else:
+                    self.canvas.coords(item, *c)
+                    if not exibido:
+                        self.canvas.itemconfigure(item, state='normal')
+            exibidos[etapa] = True
+        
+        # A ordem das camadas é refeita uma vez por tipo, não a cada etapa
+        if novos:
+            self._ordenar_camadas()
+    
+    def etapas(self, geometria: Dict[str, tuple], tamanho_etapa: int) -> Iterator[None]:
+        """Atualiza todos os tipos de objeto em etapas (ver atualizar_em_etapas)"""
+        tipos = self.TIPOS
+        if self.em_lote:
+            self.desenhar_lote(geometria)
+            yield
+            tipos = [tipo for tipo in tipos if tipo not in self.TIPOS_LOTE]
+        elif self.item_imagem is not None:
+            self.canvas.itemconfigure(self.item_imagem, state='hidden')
+        
+        for tipo in tipos:
+            indices, coords = geometria[tipo]
+            yield from self.atualizar_em_etapas(tipo, indices, coords, tamanho_etapa)
+            yield
+    
+    def _paleta(self) -> np.ndarray:
+        """Cores da cena em RGB, como o próprio Tk as resolve (calculada uma vez por cena)"""
+        if self.paleta is None:
+            cores = [[canal >> 8 for canal in self.canvas.winfo_rgb(cor)]
+                     for cor in self.cena.cores]
+            self.paleta = np.array(cores or [(0, 0, 0)], dtype=np.uint8)
+        return self.paleta
+    
+    def desenhar_lote(self, geometria: Dict[str, tuple]):
+        """
+        Desenha pontos e retas visíveis como uma única imagem no canvas
+        
+        Os itens individuais desses tipos que estiverem na tela são ocultados,
+        para que o modo possa ser alternado a qualquer momento.
+        """
+        cena = self.cena
+        for tipo in self.TIPOS_LOTE:
+            if self.exibidos[tipo].any():
+                self.canvas.itemconfigure(tipo, state='hidden')
+                self.exibidos[tipo][:] = False
+        
+        paleta = self._paleta()
+        imagem = Rasterizador.nova_imagem(int(self.canvas['width']) + 1,
+                                          int(self.canvas['height']) + 1)
+        
+        indices, caixas = geometria['pontos']
+        if indices:
+            centros = np.asarray(caixas, dtype=np.int64)[:, :2] + 3
+            Rasterizador.pontos(imagem, centros, paleta[cena.pontos_cor[indices]])
+        indices, coords = geometria['retas']
+        if indices:
+            Rasterizador.segmentos(imagem, coords, paleta[cena.retas_cor[indices]], largura=2)
+        
+        # A PhotoImage precisa de uma referência viva enquanto estiver no canvas
+        self.imagem = tk.PhotoImage(master=self.canvas, data=Rasterizador.ppm(imagem),
+                                    format='PPM')
+        if self.item_imagem is None:
+            self.item_imagem = self.canvas.create_image(0, 0, anchor='nw', image=self.imagem,
+                                                        tags=("cena", "imagem"))
+            self.canvas.tag_lower("imagem")
+        else:
+            self.canvas.itemconfigure(self.item_imagem, image=self.imagem, state='normal')
+    
+    def atualizar_bordas_window(self, coords: Sequence[float]):
+        """Atualiza (ou cria) o item com as bordas da window"""
+        if self.item_window is None:
+            self.item_window = self.canvas.create_polygon(
+                *coords, outline="red", fill="", width=2, dash=(5, 3), tags=("window",)
+            )
+        else:
+            self.canvas.coords(self.item_window, *coords)
+    
+    def _ordenar_camadas(self):
+        """Mantém a ordem de desenho: pontos, retas, polígonos e bordas da window"""
+        for tag in ('retas', 'poligonos', 'window'):
+            self.canvas.tag_raise(tag)
@@ -0,0 +1,365 @@
+"""
+Módulo contendo o armazenamento colunar (struct-of-arrays) da cena
+"""
+from typing import List, Optional, Tuple
+import numpy as np
+
+from geometric_objects import Ponto, Reta, Poligono
+from spatial_index import GradeUniforme
+from lod import PiramideLOD
+
+
+class ArrayCrescente:
+    """
+    Array NumPy pré-alocado que cresce por duplicação da capacidade
+    
+    Usado para acumular coordenadas enquanto a cena é lida, sem manter
+    listas Python do tamanho da cena inteira.
+    """
+    
+    def __init__(self, colunas: Optional[int] = None, dtype=np.float64, capacidade: int = 1024):
+        forma = (capacidade,) if colunas is None else (capacidade, colunas)
+        self._dados = np.empty(forma, dtype=dtype)
+        self._tamanho = 0
+    
+    def __len__(self):
+        return self._tamanho
+    
+    def anexar(self, valores: np.ndarray):
+        """Anexa um bloco de linhas ao final do array"""
+        valores = np.asarray(valores, dtype=self._dados.dtype).reshape((-1,) + self._dados.shape[1:])
+        fim = self._tamanho + len(valores)
+        if fim > len(self._dados):
+            capacidade = max(fim, 2 * len(self._dados))
+            novo = np.empty((capacidade,) + self._dados.shape[1:], dtype=self._dados.dtype)
+            novo[:self._tamanho] = self._dados[:self._tamanho]
+            self._dados = novo
+        self._dados[self._tamanho:fim] = valores
+        self._tamanho = fim
+    
+    def dados(self) -> np.ndarray:
+        """Retorna uma visão das linhas já anexadas"""
+        return self._dados[:self._tamanho]
+    
+    def finalizar(self) -> np.ndarray:
+        """Libera a capacidade excedente e retorna o array final"""
+        self._dados.resize((self._tamanho,) + self._dados.shape[1:], refcheck=False)
+        return self._dados
+
+
+class SceneBuffers:
+    """
+    Armazena todos os objetos da cena em arrays NumPy contíguos
+    
+    Em vez de um objeto Python por ponto/reta/polígono, cada tipo de objeto
+    ocupa um bloco de coordenadas do mundo, um bloco paralelo com as
+    coordenadas no PPC e arrays compactos de índice de cor e visibilidade:
+    
+    - pontos_mundo, pontos_ppc: (P, 2)
+    - retas_mundo, retas_ppc, retas_recortadas: (L, 4) com x1, y1, x2, y2
+    - poligonos_mundo, poligonos_ppc: (V, 2) com os vértices de todos os
+      polígonos em sequência; o polígono i ocupa as linhas
+      poligonos_offsets[i]:poligonos_offsets[i + 1]
+    - poligonos_recortados / poligonos_recortados_offsets: resultado do
+      clipping no mesmo formato plano + offsets
+    - *_cor: índices na tabela de cores ``cores``
+    - *_visivel: máscara booleana preenchida pelo clipping
+    
+    As coordenadas são float64 ou, com ``precisao='float32'``, float32: a
+    transformação e o clipping em lote preservam o tipo, então a cena
+    inteira ocupa metade da memória. O erro de arredondamento resultante,
+    em pixels, é dado por erro_maximo_pixels().
+    
+    Até a primeira passagem pelo pipeline, os arrays de PPC e de recorte são
+    os próprios arrays do mundo (como em Ponto, cujo PPC começa igual ao
+    mundo); o pipeline sempre os substitui por arrays novos em vez de
+    escrever neles, o que permite usar arrays do mundo somente leitura
+    (por exemplo, mapeados de um arquivo) sem copiá-los.
+    """
+    
+    PRECISOES = ('float64', 'float32')
+    
+    # Múltiplo do épsilon da máquina que limita o erro relativo acumulado
+    # entre o armazenamento, a transformação para o PPC e o clipping
+    FATOR_ERRO = 8
+    
+    def __init__(self,
+                 pontos_mundo: Optional[np.ndarray] = None,
+                 pontos_cor: Optional[np.ndarray] = None,
+                 retas_mundo: Optional[np.ndarray] = None,
+                 retas_cor: Optional[np.ndarray] = None,
+                 poligonos_mundo: Optional[np.ndarray] = None,
+                 poligonos_offsets: Optional[np.ndarray] = None,
+                 poligonos_cor: Optional[np.ndarray] = None,
+                 cores: Optional[List[str]] = None,
+                 precisao: Optional[str] = None):
+        """
+        Args:
+            precisao: 'float64' ou 'float32'; None mantém float32 se todas
+                as coordenadas informadas já forem float32 (por exemplo,
+                mapeadas de uma cena binária) e usa float64 caso contrário
+        """
+        self.cores = list(cores) if cores else ["black"]
+        tipo_cor = np.min_scalar_type(len(self.cores) - 1)
+        
+        if precisao is None:
+            informadas = [c for c in (pontos_mundo, retas_mundo, poligonos_mundo) if c is not None]
+            simples = informadas and all(np.asarray(c).dtype == np.float32 for c in informadas)
+            precisao = 'float32' if simples else 'float64'
+        self.dtype = self.tipo_precisao(precisao)
+        
+        self.pontos_mundo = self._coords(pontos_mundo, 2)
+        self.pontos_ppc = self.pontos_mundo
+        self.pontos_cor = self._indices_cor(pontos_cor, len(self.pontos_mundo), tipo_cor)
+        self.pontos_visivel = np.ones(len(self.pontos_mundo), dtype=bool)
+        
+        self.retas_mundo = self._coords(retas_mundo, 4)
+        self.retas_ppc = self.retas_mundo
+        self.retas_recortadas = self.retas_mundo
+        self.retas_cor = self._indices_cor(retas_cor, len(self.retas_mundo), tipo_cor)
+        self.retas_visivel = np.ones(len(self.retas_mundo), dtype=bool)
+        
+        self.poligonos_mundo = self._coords(poligonos_mundo, 2)
+        if poligonos_offsets is None:
+            poligonos_offsets = np.zeros(1, dtype=np.int64)
+        self.poligonos_offsets = np.asarray(poligonos_offsets, dtype=np.int64)
+        self.poligonos_ppc = self.poligonos_mundo
+        self.poligonos_recortados = self.poligonos_mundo
+        self.poligonos_recortados_offsets = self.poligonos_offsets
+        self.poligonos_cor = self._indices_cor(poligonos_cor, self.n_poligonos, tipo_cor)
+        self.poligonos_visivel = np.ones(self.n_poligonos, dtype=bool)
+        
+        # Índices espaciais (opcionais), construídos por construir_indice()
+        self.indice_pontos: Optional[GradeUniforme] = None
+        self.indice_retas: Optional[GradeUniforme] = None
+        self.indice_poligonos: Optional[GradeUniforme] = None
+        
+        # Níveis de detalhe dos polígonos (opcionais), construídos por construir_lod()
+        self.lod: Optional[PiramideLOD] = None
+        
+        # Caixas envolventes no mundo, por tipo, guardadas por caixas_envolventes()
+        self._caixas = {}
+        
+        # Maior valor absoluto das coordenadas do mundo, guardado por magnitude()
+        # (ou lido do cabeçalho de uma cena binária)
+        self.magnitude_mundo: Optional[float] = None
+    
+    def __repr__(self):
+        return (f"SceneBuffers({self.n_pontos} pontos, {self.n_retas} retas, "
+                f"{self.n_poligonos} polígonos)")
+    
+    @staticmethod
+    def tipo_precisao(precisao: Optional[str]) -> np.dtype:
+        """Retorna o dtype das coordenadas para uma precisão ('float64' ou 'float32')"""
+        if precisao is None:
+            precisao = 'float64'
+        if precisao not in SceneBuffers.PRECISOES:
+            raise ValueError(f"Precisão desconhecida: {precisao}")
+        return np.dtype(precisao)
+    
+    @property
+    def precisao(self) -> str:
+        return self.dtype.name
+    
+    def _coords(self, coords: Optional[np.ndarray], colunas: int) -> np.ndarray:
+        """Normaliza um bloco de coordenadas para um array contíguo (N, colunas) da precisão da cena"""
+        if coords is None:
+            return np.empty((0, colunas), dtype=self.dtype)
+        return np.ascontiguousarray(coords, dtype=self.dtype).reshape(-1, colunas)
+    
+    @staticmethod
+    def _indices_cor(indices: Optional[np.ndarray], n: int, tipo) -> np.ndarray:
+        """Normaliza um array de índices de cor (padrão: cor 0)"""
+        if indices is None:
+            return np.zeros(n, dtype=tipo)
+        return np.asarray(indices).astype(tipo, copy=False)
+    
+    @property
+    def n_pontos(self) -> int:
+        return len(self.pontos_mundo)
+    
+    @property
+    def n_retas(self) -> int:
+        return len(self.retas_mundo)
+    
+    @property
+    def n_poligonos(self) -> int:
+        return len(self.poligonos_offsets) - 1
+    
+    def anel_ppc(self, i: int) -> np.ndarray:
+        """Retorna os vértices do polígono i no PPC (antes do clipping)"""
+        return self.poligonos_ppc[self.poligonos_offsets[i]:self.poligonos_offsets[i + 1]]
+    
+    def anel_recortado(self, i: int) -> np.ndarray:
+        """Retorna os vértices do polígono i após o clipping"""
+        inicio, fim = self.poligonos_recortados_offsets[i:i + 2]
+        return self.poligonos_recortados[inicio:fim]
+    
+    def indices_vertices(self, poligonos: np.ndarray,
+                         offsets: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Retorna os índices (em poligonos_mundo) dos vértices dos polígonos informados
+        
+        Com ``offsets``, os índices se referem a outro buffer de vértices com
+        os mesmos polígonos (por exemplo, um nível de detalhe).
+        """
+        if offsets is None:
+            offsets = self.poligonos_offsets
+        inicio = offsets[poligonos]
+        tamanhos = offsets[poligonos + 1] - inicio
+        deslocamento = np.repeat(inicio - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+        return np.arange(int(tamanhos.sum())) + deslocamento
+    
+    def caixas_pontos(self) -> np.ndarray:
+        """Retorna as caixas envolventes (x_min, y_min, x_max, y_max) dos pontos no mundo"""
+        return np.hstack([self.pontos_mundo, self.pontos_mundo])
+    
+    def caixas_retas(self) -> np.ndarray:
+        """Retorna as caixas envolventes das retas no mundo"""
+        x1, y1, x2, y2 = self.retas_mundo.T
+        return np.column_stack([np.minimum(x1, x2), np.minimum(y1, y2),
+                                np.maximum(x1, x2), np.maximum(y1, y2)])
+    
+    def caixas_poligonos(self) -> np.ndarray:
+        """Retorna as caixas envolventes dos polígonos no mundo"""
+        if not self.n_poligonos:
+            return np.empty((0, 4))
+        inicio = self.poligonos_offsets[:-1]
+        minimos = np.minimum.reduceat(self.poligonos_mundo, inicio, axis=0)
+        maximos = np.maximum.reduceat(self.poligonos_mundo, inicio, axis=0)
+        return np.hstack([minimos, maximos])
+    
+    def caixas_envolventes(self, tipo: str) -> np.ndarray:
+        """
+        Retorna as caixas envolventes no mundo dos objetos de um tipo
+        
+        As caixas são calculadas uma única vez e guardadas; se o índice
+        espacial do tipo já existir, as caixas da grade são reaproveitadas.
+        
+        Args:
+            tipo: 'pontos', 'retas' ou 'poligonos'
+        """
+        if tipo not in self._caixas:
+            indice = getattr(self, f"indice_{tipo}")
+            if indice is not None:
+                self._caixas[tipo] = indice.caixas
+            else:
+                self._caixas[tipo] = getattr(self, f"caixas_{tipo}")()
+        return self._caixas[tipo]
+    
+    def magnitude(self) -> float:
+        """
+        Retorna o maior valor absoluto entre as coordenadas do mundo
+        
+        O valor só depende da cena: é calculado uma única vez (normalmente
+        por construir_indice(), fora da thread da interface) e guardado.
+        """
+        if self.magnitude_mundo is None:
+            caixas = [self.caixas_envolventes(tipo) for tipo in ('pontos', 'retas', 'poligonos')]
+            self.magnitude_mundo = max((float(np.abs(c).max()) for c in caixas if len(c)),
+                                       default=0.0)
+        return self.magnitude_mundo
+    
+    def erro_maximo_pixels(self, largura_window: float, largura_viewport: float) -> float:
+        """
+        Limite do erro de arredondamento das coordenadas, em pixels da viewport
+        
+        Cada etapa em ponto flutuante erra no máximo alguns épsilons relativos
+        à maior coordenada envolvida, então o erro no PPC fica abaixo de
+        FATOR_ERRO * eps * magnitude() (supondo a window dentro da extensão
+        da cena) e é ampliado pela escala largura_viewport / largura_window.
+        Em float32 (eps ~ 1,2e-7), com a cena inteira na window de uma
+        viewport de 800 pixels, o limite é ~0,0008 pixel; ele passa de meio
+        pixel só com zoom acima de ~650x sobre a extensão da cena.
+        
+        Args:
+            largura_window: largura da window no mundo
+            largura_viewport: largura da viewport em pixels
+        """
+        if largura_window <= 0:
+            return 0.0
+        eps = float(np.finfo(self.dtype).eps)
+        return self.FATOR_ERRO * eps * self.magnitude() * largura_viewport / largura_window
+    
+    def construir_indice(self):
+        """Constrói as grades uniformes sobre as caixas envolventes dos objetos"""
+        self.indice_pontos = GradeUniforme(self.caixas_envolventes('pontos'))
+        self.indice_retas = GradeUniforme(self.caixas_envolventes('retas'))
+        self.indice_poligonos = GradeUniforme(self.caixas_envolventes('poligonos'))
+        self.magnitude()
+    
+    @property
+    def possui_indice(self) -> bool:
+        return self.indice_pontos is not None
+    
+    def construir_lod(self, importancias: Optional[np.ndarray] = None):
+        """
+        Constrói a pirâmide de níveis de detalhe dos polígonos
+        
+        Args:
+            importancias: importâncias Douglas-Peucker já calculadas
+                (None para calculá-las a partir de poligonos_mundo)
+        """
+        self.lod = PiramideLOD(self.poligonos_mundo, self.poligonos_offsets, importancias)
+    
+    @classmethod
+    def de_objetos(cls, pontos: List[Ponto], retas: List[Reta],
+                   poligonos: List[Poligono]) -> "SceneBuffers":
+        """Constrói os buffers a partir de listas de objetos geométricos"""
+        cores: List[str] = []
+        indice_por_cor = {}
+        
+        def indice(cor: str) -> int:
+            if cor not in indice_por_cor:
+                indice_por_cor[cor] = len(cores)
+                cores.append(cor)
+            return indice_por_cor[cor]
+        
+        tamanhos = [len(p.coords_mundo) for p in poligonos]
+        return cls(
+            pontos_mundo=[(p.x_mundo, p.y_mundo) for p in pontos],
+            pontos_cor=[indice(p.cor) for p in pontos],
+            retas_mundo=[r.coords_mundo for r in retas],
+            retas_cor=[indice(r.cor) for r in retas],
+            poligonos_mundo=(np.concatenate([p.coords_mundo for p in poligonos])
+                             if poligonos else None),
+            poligonos_offsets=np.concatenate(([0], np.cumsum(tamanhos, dtype=np.int64))),
+            poligonos_cor=[indice(p.cor) for p in poligonos],
+            cores=cores
+        )
+    
+    def para_objetos(self) -> Tuple[List[Ponto], List[Reta], List[Poligono]]:
+        """
+        Cria objetos Ponto/Reta/Poligono equivalentes ao estado atual
+        
+        Mantido para compatibilidade com código que trabalha com objetos;
+        o pipeline gráfico usa apenas os arrays.
+        """
+        pontos = []
+        for (x, y), (x_ppc, y_ppc), cor, visivel in zip(
+                self.pontos_mundo.tolist(), self.pontos_ppc.tolist(),
+                self.pontos_cor.tolist(), self.pontos_visivel.tolist()):
+            ponto = Ponto(x, y, self.cores[cor])
+            ponto.set_coords_ppc((x_ppc, y_ppc))
+            ponto.visivel = visivel
+            pontos.append(ponto)
+        
+        retas = []
+        for (x1, y1, x2, y2), ppc, cor, visivel in zip(
+                self.retas_mundo.tolist(), self.retas_recortadas.tolist(),
+                self.retas_cor.tolist(), self.retas_visivel.tolist()):
+            reta = Reta(Ponto(x1, y1), Ponto(x2, y2), self.cores[cor])
+            reta.set_pontos_ppc(ppc[:2], ppc[2:])
+            reta.visivel = visivel
+            retas.append(reta)
+        
+        poligonos = []
+        for i, (cor, visivel) in enumerate(zip(self.poligonos_cor.tolist(),
+                                               self.poligonos_visivel.tolist())):
+            inicio, fim = self.poligonos_offsets[i:i + 2]
+            poligono = Poligono.de_coords(self.poligonos_mundo[inicio:fim], self.cores[cor])
+            poligono.aneis_ppc = [self.anel_recortado(i).copy()]
+            poligono.visivel = visivel
+            poligonos.append(poligono)
+        
+        return pontos, retas, poligonos
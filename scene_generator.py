@@ -0,0 +1,251 @@
+"""
+Módulo para gerar cenas sintéticas reprodutíveis (usadas nos benchmarks)
+"""
+import argparse
+from typing import Sequence, Tuple, Union
+from xml.sax.saxutils import quoteattr
+import numpy as np
+
+from scene_buffers import SceneBuffers
+from binary_scene import CenaBinaria
+
+
+class GeradorCena:
+    """
+    Gera objetos aleatórios com proporções controladas em relação à window
+    
+    Cada objeto pertence a uma de três categorias:
+    - dentro: totalmente contido na window (aceito trivialmente)
+    - fora: totalmente fora e de um só lado da window (rejeitado trivialmente)
+    - cruzando: atravessa a borda da window (precisa ser recortado)
+    
+    A mesma semente produz sempre a mesma cena.
+    """
+    
+    DENTRO, FORA, CRUZANDO = 0, 1, 2
+    CORES = ["black", "red", "green", "blue", "orange", "purple", "brown", "darkgreen"]
+    
+    def __init__(self, semente: int = 0,
+                 window: Tuple[float, float, float, float] = (0.0, 0.0, 10.0, 7.5),
+                 viewport: Tuple[float, float, float, float] = (0, 0, 800, 600)):
+        self.semente = semente
+        self.rng = np.random.default_rng(semente)
+        self.window = tuple(float(v) for v in window)
+        self.viewport = viewport
+    
+    @property
+    def config(self) -> dict:
+        """Configurações de viewport/window no formato do XMLLoader"""
+        chaves = ('x_min', 'y_min', 'x_max', 'y_max')
+        return {'viewport': dict(zip(chaves, self.viewport)),
+                'window': dict(zip(chaves, self.window))}
+    
+    def categorias(self, n: int, proporcoes: Sequence[float]) -> np.ndarray:
+        """
+        Sorteia a categoria de n objetos
+        
+        Args:
+            n: quantidade de objetos
+            proporcoes: pesos (dentro, fora, cruzando), normalizados aqui
+        
+        Returns:
+            Array (n,) com DENTRO, FORA ou CRUZANDO, em ordem aleatória
+        """
+        pesos = np.asarray(proporcoes, dtype=np.float64)
+        pesos = pesos / pesos.sum()
+        quantidades = np.floor(pesos * n).astype(np.int64)
+        quantidades[np.argmax(pesos)] += n - quantidades.sum()
+        return self.rng.permutation(np.repeat(np.arange(3), quantidades))
+    
+    def _pontos_dentro(self, n: int, margem=0.0) -> np.ndarray:
+        """Pontos uniformes na window, afastados `margem` das bordas"""
+        x_min, y_min, x_max, y_max = self.window
+        margem = np.asarray(margem, dtype=np.float64)
+        x = self.rng.uniform(0, 1, n) * (x_max - x_min - 2 * margem) + x_min + margem
+        y = self.rng.uniform(0, 1, n) * (y_max - y_min - 2 * margem) + y_min + margem
+        return np.column_stack([x, y])
+    
+    def _pontos_fora(self, lados: np.ndarray, margem=0.0) -> np.ndarray:
+        """
+        Pontos fora da window, a mais de `margem` da borda indicada em lados
+        (0: esquerda, 1: direita, 2: abaixo, 3: acima)
+        """
+        x_min, y_min, x_max, y_max = self.window
+        largura, altura = x_max - x_min, y_max - y_min
+        n = len(lados)
+        distancia = np.asarray(margem, dtype=np.float64) + self.rng.uniform(0.01, 1, n) * max(largura, altura)
+        x = self.rng.uniform(x_min - largura, x_max + largura, n)
+        y = self.rng.uniform(y_min - altura, y_max + altura, n)
+        
+        x = np.where(lados == 0, x_min - distancia, x)
+        x = np.where(lados == 1, x_max + distancia, x)
+        y = np.where(lados == 2, y_min - distancia, y)
+        y = np.where(lados == 3, y_max + distancia, y)
+        return np.column_stack([x, y])
+    
+    def pontos(self, n: int, proporcoes: Sequence[float] = (1, 1, 0)) -> np.ndarray:
+        """Gera n pontos (N, 2); pontos não cruzam a borda e contam como 'fora'"""
+        categorias = np.minimum(self.categorias(n, proporcoes), self.FORA)
+        resultado = np.empty((n, 2))
+        dentro = categorias == self.DENTRO
+        resultado[dentro] = self._pontos_dentro(int(dentro.sum()))
+        resultado[~dentro] = self._pontos_fora(self.rng.integers(0, 4, int((~dentro).sum())))
+        return resultado
+    
+    def segmentos(self, n: int, proporcoes: Sequence[float] = (1, 1, 1)) -> np.ndarray:
+        """
+        Gera n segmentos (N, 4)
+        
+        Segmentos 'fora' têm as duas extremidades do mesmo lado da window e
+        segmentos 'cruzando' têm uma extremidade dentro e outra fora.
+        """
+        categorias = self.categorias(n, proporcoes)
+        resultado = np.empty((n, 4))
+        
+        dentro = categorias == self.DENTRO
+        k = int(dentro.sum())
+        resultado[dentro] = np.hstack([self._pontos_dentro(k), self._pontos_dentro(k)])
+        
+        fora = categorias == self.FORA
+        lados = self.rng.integers(0, 4, int(fora.sum()))
+        resultado[fora] = np.hstack([self._pontos_fora(lados), self._pontos_fora(lados)])
+        
+        cruzando = categorias == self.CRUZANDO
+        k = int(cruzando.sum())
+        extremidades = [self._pontos_dentro(k), self._pontos_fora(self.rng.integers(0, 4, k))]
+        trocar = self.rng.random(k) < 0.5
+        p1 = np.where(trocar[:, None], extremidades[1], extremidades[0])
+        p2 = np.where(trocar[:, None], extremidades[0], extremidades[1])
+        resultado[cruzando] = np.hstack([p1, p2])
+        return resultado
+    
+    def poligonos(self, n: int, vertices: Union[int, Tuple[int, int]] = (3, 12),
+                  proporcoes: Sequence[float] = (1, 1, 1)) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Gera n polígonos simples (estrelados em relação ao centro)
+        
+        Args:
+            n: quantidade de polígonos
+            vertices: vértices por polígono, fixo ou intervalo (mínimo, máximo)
+            proporcoes: pesos (dentro, fora, cruzando)
+        
+        Returns:
+            Tupla (vértices (V, 2), offsets (n + 1,))
+        """
+        if isinstance(vertices, int):
+            tamanhos = np.full(n, vertices, dtype=np.int64)
+        else:
+            tamanhos = self.rng.integers(vertices[0], vertices[1] + 1, n)
+        tamanhos = np.maximum(tamanhos, 3)
+        offsets = np.concatenate(([0], np.cumsum(tamanhos))).astype(np.int64)
+        
+        x_min, y_min, x_max, y_max = self.window
+        raios = self.rng.uniform(0.02, 0.2, n) * min(x_max - x_min, y_max - y_min)
+        categorias = self.categorias(n, proporcoes)
+        
+        centros = np.empty((n, 2))
+        dentro = categorias == self.DENTRO
+        centros[dentro] = self._pontos_dentro(int(dentro.sum()), raios[dentro])
+        fora = categorias == self.FORA
+        centros[fora] = self._pontos_fora(self.rng.integers(0, 4, int(fora.sum())), raios[fora])
+        
+        # Centro sobre uma borda da window: o polígono sempre a atravessa
+        cruzando = categorias == self.CRUZANDO
+        k = int(cruzando.sum())
+        centros[cruzando] = self._pontos_dentro(k)
+        lados = self.rng.integers(0, 4, k)
+        centros[cruzando, 0] = np.where(lados == 0, x_min, np.where(lados == 1, x_max,
+                                                                    centros[cruzando, 0]))
+        centros[cruzando, 1] = np.where(lados == 2, y_min, np.where(lados == 3, y_max,
+                                                                    centros[cruzando, 1]))
+        
+        # Ângulos ordenados dentro de cada polígono e raio variável por vértice
+        poligono = np.repeat(np.arange(n), tamanhos)
+        angulos = self.rng.uniform(0, 2 * np.pi, int(offsets[-1])) + 2 * np.pi * poligono
+        angulos = np.sort(angulos) - 2 * np.pi * poligono
+        raio_vertice = raios[poligono] * self.rng.uniform(0.5, 1.0, len(angulos))
+        coords = centros[poligono] + raio_vertice[:, None] * np.column_stack([np.cos(angulos),
+                                                                              np.sin(angulos)])
+        return coords, offsets
+    
+    def cena(self, n_pontos: int = 0, n_retas: int = 0, n_poligonos: int = 0,
+             vertices: Union[int, Tuple[int, int]] = (3, 12),
+             proporcoes: Sequence[float] = (1, 1, 1),
+             precisao: str = 'float64') -> Tuple[dict, SceneBuffers]:
+        """Gera uma cena completa, no mesmo formato de XMLLoader.carregar_buffers"""
+        pontos = self.pontos(n_pontos, proporcoes)
+        retas = self.segmentos(n_retas, proporcoes)
+        poligonos, offsets = self.poligonos(n_poligonos, vertices, proporcoes)
+        
+        n_cores = len(self.CORES)
+        cena = SceneBuffers(pontos_mundo=pontos, pontos_cor=self.rng.integers(0, n_cores, n_pontos),
+                            retas_mundo=retas, retas_cor=self.rng.integers(0, n_cores, n_retas),
+                            poligonos_mundo=poligonos, poligonos_offsets=offsets,
+                            poligonos_cor=self.rng.integers(0, n_cores, n_poligonos),
+                            cores=self.CORES, precisao=precisao)
+        return self.config, cena
+    
+    @staticmethod
+    def salvar_xml(filename: str, config: dict, cena: SceneBuffers):
+        """Grava a cena no formato XML lido pelo XMLLoader"""
+        cores = [quoteattr(c) for c in cena.cores]
+        
+        with open(filename, 'w', encoding='utf-8') as f:
+            raiz = '<dados>' if cena.precisao == 'float64' else f'<dados precisao="{cena.precisao}">'
+            f.write(f'<?xml version="1.0"?>\n{raiz}\n')
+            if 'viewport' in config:
+                vp = config['viewport']
+                f.write(f'    <viewport>\n        <vpmin x="{vp["x_min"]}" y="{vp["y_min"]}"/>\n'
+                        f'        <vpmax x="{vp["x_max"]}" y="{vp["y_max"]}"/>\n    </viewport>\n')
+            if 'window' in config:
+                w = config['window']
+                f.write(f'    <window>\n        <wmin x="{w["x_min"]}" y="{w["y_min"]}"/>\n'
+                        f'        <wmax x="{w["x_max"]}" y="{w["y_max"]}"/>\n    </window>\n')
+            
+            for (x, y), cor in zip(cena.pontos_mundo.tolist(), cena.pontos_cor.tolist()):
+                f.write(f'    <ponto cor={cores[cor]} x="{x!r}" y="{y!r}"/>\n')
+            
+            for (x1, y1, x2, y2), cor in zip(cena.retas_mundo.tolist(), cena.retas_cor.tolist()):
+                f.write(f'    <reta cor={cores[cor]}><ponto x="{x1!r}" y="{y1!r}"/>'
+                        f'<ponto x="{x2!r}" y="{y2!r}"/></reta>\n')
+            
+            offsets = cena.poligonos_offsets.tolist()
+            for i, cor in enumerate(cena.poligonos_cor.tolist()):
+                vertices = cena.poligonos_mundo[offsets[i]:offsets[i + 1]].tolist()
+                f.write(f'    <poligono cor={cores[cor]}>')
+                f.write(''.join(f'<ponto x="{x!r}" y="{y!r}"/>' for x, y in vertices))
+                f.write('</poligono>\n')
+            
+            f.write('</dados>\n')
+
+
+def main():
+    """Gera uma cena sintética em XML (ou .cena)"""
+    parser = argparse.ArgumentParser(description="Gera uma cena sintética reprodutível")
+    parser.add_argument("saida", help="arquivo de saída (.xml ou .cena)")
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--pontos", type=int, default=0)
+    parser.add_argument("--retas", type=int, default=1000)
+    parser.add_argument("--poligonos", type=int, default=0)
+    parser.add_argument("--vertices", type=int, nargs=2, default=(3, 12), metavar=("MIN", "MAX"),
+                        help="intervalo de vértices por polígono")
+    parser.add_argument("--proporcoes", type=float, nargs=3, default=(1, 1, 1),
+                        metavar=("DENTRO", "FORA", "CRUZANDO"),
+                        help="pesos das categorias de objetos em relação à window")
+    parser.add_argument("--precisao", choices=SceneBuffers.PRECISOES, default="float64",
+                        help="precisão das coordenadas")
+    args = parser.parse_args()
+    
+    gerador = GeradorCena(args.semente)
+    config, cena = gerador.cena(args.pontos, args.retas, args.poligonos,
+                                tuple(args.vertices), args.proporcoes, args.precisao)
+    
+    if args.saida.lower().endswith(CenaBinaria.EXTENSAO):
+        cena.construir_indice()
+        CenaBinaria.salvar(args.saida, config, cena)
+    else:
+        GeradorCena.salvar_xml(args.saida, config, cena)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Módulo contendo o índice espacial usado para descartar objetos fora da window
+"""
+import math
+import numpy as np
+
+
+class GradeUniforme:
+    """
+    Índice espacial em grade uniforme sobre caixas envolventes (AABB)
+    
+    A extensão da cena é dividida em nx x ny células de mesmo tamanho e cada
+    objeto é registrado em todas as células que sua caixa toca. As listas de
+    objetos por célula ficam em formato CSR (ids + offsets), de modo que uma
+    linha de células contíguas corresponde a uma única fatia de ``ids``.
+    Objetos que ocupam muitas células são mantidos à parte e sempre
+    retornados como candidatos, evitando que inflem a grade.
+    """
+    
+    OBJETOS_POR_CELULA = 4
+    MAX_CELULAS_POR_EIXO = 1024
+    MAX_CELULAS_POR_OBJETO = 64
+    
+    def __init__(self, caixas: np.ndarray):
+        """
+        Constrói a grade
+        
+        Args:
+            caixas: array (N, 4) com x_min, y_min, x_max, y_max de cada objeto
+        """
+        self.caixas = np.asarray(caixas, dtype=np.float64).reshape(-1, 4)
+        n = len(self.caixas)
+        
+        if n:
+            self.x0 = float(self.caixas[:, 0].min())
+            self.y0 = float(self.caixas[:, 1].min())
+            x1 = float(self.caixas[:, 2].max())
+            y1 = float(self.caixas[:, 3].max())
+        else:
+            self.x0 = self.y0 = x1 = y1 = 0.0
+        
+        lado = int(math.ceil(math.sqrt(n / self.OBJETOS_POR_CELULA))) if n else 1
+        self.nx = self.ny = max(1, min(lado, self.MAX_CELULAS_POR_EIXO))
+        self.largura_celula = (x1 - self.x0) / self.nx or 1.0
+        self.altura_celula = (y1 - self.y0) / self.ny or 1.0
+        
+        ix0, iy0, ix1, iy1 = self._intervalo_celulas(*self.caixas.T)
+        largura = ix1 - ix0 + 1
+        celulas_por_objeto = largura * (iy1 - iy0 + 1)
+        
+        grandes = celulas_por_objeto > self.MAX_CELULAS_POR_OBJETO
+        self.grandes = np.flatnonzero(grandes)
+        
+        # Expandir cada objeto em uma entrada por célula ocupada
+        objetos = np.flatnonzero(~grandes)
+        repeticoes = celulas_por_objeto[objetos]
+        total = int(repeticoes.sum())
+        inicio = np.cumsum(repeticoes) - repeticoes
+        local = np.arange(total) - np.repeat(inicio, repeticoes)
+        largura_rep = np.repeat(largura[objetos], repeticoes)
+        cx = np.repeat(ix0[objetos], repeticoes) + local % largura_rep
+        cy = np.repeat(iy0[objetos], repeticoes) + local // largura_rep
+        celulas = cy * self.nx + cx
+        
+        ordem = np.argsort(celulas, kind="stable")
+        self.ids = np.repeat(objetos, repeticoes)[ordem]
+        contagem = np.bincount(celulas, minlength=self.nx * self.ny)
+        self.offsets = np.concatenate(([0], np.cumsum(contagem)))
+    
+    @classmethod
+    def de_estado(cls, estado: dict) -> "GradeUniforme":
+        """Reconstrói uma grade a partir do dicionário produzido por estado()"""
+        grade = cls.__new__(cls)
+        grade.caixas = estado['caixas']
+        grade.ids = estado['ids']
+        grade.offsets = estado['offsets']
+        grade.grandes = estado['grandes']
+        grade.x0, grade.y0, grade.largura_celula, grade.altura_celula = estado['parametros'].tolist()
+        grade.nx, grade.ny = estado['celulas'].tolist()
+        return grade
+    
+    def estado(self) -> dict:
+        """Retorna os arrays que descrevem a grade, para serem salvos em arquivo"""
+        return {
+            'caixas': self.caixas,
+            'ids': self.ids,
+            'offsets': self.offsets,
+            'grandes': self.grandes,
+            'parametros': np.array([self.x0, self.y0, self.largura_celula, self.altura_celula]),
+            'celulas': np.array([self.nx, self.ny], dtype=np.int64)
+        }
+    
+    def __len__(self):
+        return len(self.caixas)
+    
+    def _intervalo_celulas(self, x_min, y_min, x_max, y_max):
+        """Converte caixas em intervalos de células, limitados à grade"""
+        ix0 = np.clip(np.floor((np.asarray(x_min) - self.x0) / self.largura_celula), 0, self.nx - 1)
+        iy0 = np.clip(np.floor((np.asarray(y_min) - self.y0) / self.altura_celula), 0, self.ny - 1)
+        ix1 = np.clip(np.floor((np.asarray(x_max) - self.x0) / self.largura_celula), 0, self.nx - 1)
+        iy1 = np.clip(np.floor((np.asarray(y_max) - self.y0) / self.altura_celula), 0, self.ny - 1)
+        return (ix0.astype(np.int64), iy0.astype(np.int64),
+                ix1.astype(np.int64), iy1.astype(np.int64))
+    
+    def consultar(self, x_min: float, y_min: float, x_max: float, y_max: float) -> np.ndarray:
+        """
+        Retorna os índices dos objetos cuja caixa intersecta a região
+        
+        Args:
+            x_min, y_min, x_max, y_max: região de consulta (coordenadas do mundo)
+        
+        Returns:
+            Array ordenado com os índices dos objetos candidatos
+        """
+        partes = [self.grandes]
+        
+        if len(self.ids):
+            ix0, iy0, ix1, iy1 = (int(v) for v in self._intervalo_celulas(x_min, y_min, x_max, y_max))
+            # Cada linha de células contíguas é uma única fatia de ids
+            for iy in range(iy0, iy1 + 1):
+                base = iy * self.nx
+                partes.append(self.ids[self.offsets[base + ix0]:self.offsets[base + ix1 + 1]])
+        
+        candidatos = np.unique(np.concatenate(partes))
+        caixas = self.caixas[candidatos]
+        intersecta = ((caixas[:, 0] <= x_max) & (caixas[:, 2] >= x_min) &
+                      (caixas[:, 1] <= y_max) & (caixas[:, 3] >= y_min))
+        return candidatos[intersecta]
@@ -0,0 +1,300 @@
+"""
+Clipping em fluxo de conjuntos de retas maiores que a memória
+
+Lê os segmentos (x1, y1, x2, y2) de um array mapeado em memória (.npy ou as
+retas de uma .cena) em blocos de tamanho fixo, aplica a transformação mundo
+→ PPC e o algoritmo de clipping de retas escolhido e acrescenta as retas
+visíveis, já recortadas, a um .npy de saída. Cada bloco é mapeado e
+desmapeado por vez, então a memória usada depende só do tamanho do bloco,
+não do tamanho da entrada.
+"""
+import argparse
+import struct
+import time
+from typing import Callable, Optional
+import numpy as np
+
+from pipeline import MotorGrafico
+from transformations import Transformacao
+from binary_scene import CenaBinaria
+
+
+class GravadorNpy:
+    """
+    Grava um array .npy cujas linhas são acrescentadas aos poucos
+    
+    O cabeçalho tem tamanho fixo (``TAMANHO_CABECALHO``) e é escrito de novo
+    em fechar(), já com a quantidade final de linhas; até lá o arquivo
+    declara zero linhas.
+    """
+    
+    # Múltiplo de 64 com espaço para uma quantidade de linhas de até 20 dígitos
+    TAMANHO_CABECALHO = 128
+    
+    def __init__(self, filename: str, dtype, colunas: Optional[int] = None):
+        """
+        Cria o arquivo e grava o cabeçalho provisório
+        
+        Args:
+            filename: caminho do arquivo de saída
+            dtype: tipo dos elementos
+            colunas: número de colunas (None para um array unidimensional)
+        """
+        self.dtype = np.dtype(dtype)
+        self.colunas = colunas
+        self.linhas = 0
+        self.arquivo = open(filename, 'wb')
+        self.arquivo.write(self._cabecalho())
+    
+    def _cabecalho(self) -> bytes:
+        """Cabeçalho .npy (versão 1.0) com a quantidade atual de linhas"""
+        formato = (self.linhas,) if self.colunas is None else (self.linhas, self.colunas)
+        descricao = repr({'descr': np.lib.format.dtype_to_descr(self.dtype),
+                          'fortran_order': False, 'shape': formato})
+        magico = np.lib.format.magic(1, 0)
+        descricao = descricao.ljust(self.TAMANHO_CABECALHO - len(magico) - 3) + '\n'
+        return magico + struct.pack('<H', len(descricao)) + descricao.encode('latin1')
+    
+    def adicionar(self, linhas: np.ndarray):
+        """Acrescenta linhas ao final do arquivo"""
+        linhas = np.ascontiguousarray(linhas, dtype=self.dtype)
+        if not len(linhas):
+            return
+        self.arquivo.write(memoryview(linhas).cast('B'))
+        self.linhas += len(linhas)
+    
+    def fechar(self):
+        """Reescreve o cabeçalho com a quantidade final de linhas e fecha o arquivo"""
+        if self.arquivo.closed:
+            return
+        self.arquivo.seek(0)
+        self.arquivo.write(self._cabecalho())
+        self.arquivo.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *excecao):
+        self.fechar()
+
+
+class ArquivoRetas:
+    """
+    Array (N, 4) de retas guardado em um arquivo, lido em blocos
+    
+    Cada leitura mapeia apenas o trecho pedido (np.memmap), copia-o para o
+    buffer do chamador e desfaz o mapeamento; as páginas lidas não se
+    acumulam no processo ao longo de um arquivo maior que a memória.
+    """
+    
+    def __init__(self, filename: str, dtype, deslocamento: int, total: int,
+                 config: Optional[dict] = None):
+        """
+        Descreve onde estão as retas no arquivo
+        
+        Args:
+            filename: caminho do arquivo
+            dtype: tipo das coordenadas
+            deslocamento: posição no arquivo da primeira coordenada
+            total: quantidade de retas
+            config: configurações de viewport/window da cena, se houver
+        """
+        self.filename = filename
+        self.dtype = np.dtype(dtype)
+        self.deslocamento = deslocamento
+        self.total = total
+        self.config = config or {}
+    
+    def __len__(self) -> int:
+        return self.total
+    
+    @staticmethod
+    def abrir(filename: str) -> 'ArquivoRetas':
+        """
+        Localiza as retas de um arquivo sem lê-las
+        
+        Args:
+            filename: .npy com um array (N, 4) em ordem C, ou cena binária
+                .cena (são usadas as retas do mundo e a window da cena)
+        """
+        if filename.lower().endswith(CenaBinaria.EXTENSAO):
+            cabecalho, inicio_dados = CenaBinaria.ler_cabecalho(filename)
+            descritor = cabecalho['arrays']['retas_mundo']
+            return ArquivoRetas(filename, descritor['dtype'], inicio_dados + descritor['offset'],
+                                descritor['shape'][0], cabecalho['config'])
+        
+        with open(filename, 'rb') as f:
+            versao = np.lib.format.read_magic(f)
+            if versao == (1, 0):
+                forma, ordem_fortran, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                forma, ordem_fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            deslocamento = f.tell()
+        if len(forma) != 2 or forma[1] != 4 or (ordem_fortran and forma[0] > 1):
+            raise ValueError(f"Esperado um array (N, 4) de retas em ordem C, encontrado {forma}")
+        return ArquivoRetas(filename, dtype, deslocamento, forma[0])
+    
+    def ler(self, inicio: int, saida: np.ndarray):
+        """Copia as retas a partir de ``inicio`` para o buffer (n, 4) ``saida``"""
+        trecho = np.memmap(self.filename, dtype=self.dtype, mode='r', shape=(len(saida), 4),
+                           offset=self.deslocamento + inicio * 4 * self.dtype.itemsize)
+        np.copyto(saida, trecho)
+        del trecho
+
+
+class ClippingFluxo:
+    """
+    Recorta retas lidas em blocos contra a window de um MotorGrafico
+    
+    Por bloco, como no pipeline: retas cuja caixa não toca a extensão da
+    window no mundo são descartadas antes da transformação; depois da
+    transformação as caixas no PPC separam as retas inteiramente dentro
+    (gravadas como estão) e fora da window, e só as que cruzam a borda
+    passam pelo clip_batch do algoritmo do motor.
+    """
+    
+    # Retas por bloco (32 MB de coordenadas em float64)
+    TAMANHO_BLOCO = 1 << 20
+    
+    def __init__(self, motor: MotorGrafico, tamanho_bloco: int = TAMANHO_BLOCO):
+        if tamanho_bloco < 1:
+            raise ValueError("O tamanho do bloco deve ser positivo")
+        self.motor = motor
+        self.tamanho_bloco = tamanho_bloco
+    
+    def processar(self, entrada: ArquivoRetas, saida: GravadorNpy,
+                  indices: Optional[GravadorNpy] = None,
+                  progresso: Optional[Callable[[int, int], None]] = None) -> dict:
+        """
+        Recorta todas as retas, bloco a bloco
+        
+        Args:
+            entrada: retas no mundo (ver ArquivoRetas.abrir)
+            saida: recebe as retas visíveis recortadas, em coordenadas PPC
+            indices: se informado, recebe o índice de entrada de cada reta gravada
+            progresso: chamado com (retas lidas, total) após cada bloco
+        
+        Returns:
+            Dicionário com as contagens ('retas', 'rejeitadas_extensao',
+            'aceitas_caixa', 'clipping', 'visiveis'), os bytes lidos e o
+            tempo total em segundos
+        """
+        motor = self.motor
+        if motor.algoritmo_reta == "Cohen-Sutherland":
+            algoritmo = motor.algoritmo_reta_cs
+        else:
+            algoritmo = motor.algoritmo_reta_lb
+        matriz = motor.matriz_mundo_para_ppc()
+        ext_x_min, ext_y_min, ext_x_max, ext_y_max = motor.extensao_window_mundo()
+        
+        # Buffers do tamanho de um bloco, reutilizados a cada iteração
+        tipo = np.float32 if entrada.dtype == np.float32 else np.float64
+        total = len(entrada)
+        tamanho = min(self.tamanho_bloco, max(total, 1))
+        mundo = np.empty((tamanho, 4), dtype=tipo)
+        ppc = np.empty((tamanho, 4), dtype=tipo)
+        
+        contagens = dict.fromkeys(('rejeitadas_extensao', 'aceitas_caixa', 'clipping',
+                                   'visiveis'), 0)
+        inicio_tempo = time.perf_counter()
+        for inicio in range(0, total, tamanho):
+            n = min(tamanho, total - inicio)
+            bloco = mundo[:n]
+            entrada.ler(inicio, bloco)
+            
+            # Retas inteiramente fora da extensão da window não são transformadas
+            x1, y1, x2, y2 = bloco.T
+            selecionadas = np.flatnonzero(
+                (np.maximum(x1, x2) >= ext_x_min) & (np.minimum(x1, x2) <= ext_x_max) &
+                (np.maximum(y1, y2) >= ext_y_min) & (np.minimum(y1, y2) <= ext_y_max)
+            )
+            if len(selecionadas) < n:
+                bloco = bloco[selecionadas]
+            
+            transformadas = ppc[:len(bloco)]
+            Transformacao.aplicar_em_lote(bloco.reshape(-1, 2), matriz,
+                                          out=transformadas.reshape(-1, 2))
+            
+            x1, y1, x2, y2 = transformadas.T
+            caixas = np.column_stack([np.minimum(x1, x2), np.minimum(y1, y2),
+                                      np.maximum(x1, x2), np.maximum(y1, y2)])
+            dentro, fora = motor.classificar_caixas(caixas)
+            cruzando = np.flatnonzero(~(dentro | fora))
+            recortes, visiveis = algoritmo.clip_batch(
+                transformadas[cruzando], motor.w_x_min, motor.w_y_min, motor.w_x_max, motor.w_y_max
+            )
+            
+            # As retas visíveis são gravadas na ordem da entrada
+            gravar = dentro.copy()
+            gravar[cruzando[visiveis]] = True
+            transformadas[cruzando] = recortes
+            saida.adicionar(transformadas[gravar])
+            if indices is not None:
+                indices.adicionar(inicio + selecionadas[gravar])
+            
+            contagens['rejeitadas_extensao'] += n - len(selecionadas)
+            contagens['aceitas_caixa'] += int(np.count_nonzero(dentro))
+            contagens['clipping'] += len(cruzando)
+            contagens['visiveis'] += int(np.count_nonzero(gravar))
+            if progresso is not None:
+                progresso(inicio + n, total)
+        
+        return {
+            'retas': total,
+            **contagens,
+            'bytes_lidos': total * 4 * entrada.dtype.itemsize,
+            'segundos': time.perf_counter() - inicio_tempo
+        }
+
+
+def main():
+    """Recorta um arquivo de retas em fluxo, sem carregá-lo inteiro na memória"""
+    parser = argparse.ArgumentParser(
+        description="Recorta em blocos retas de um array mapeado em memória (.npy ou .cena)"
+    )
+    parser.add_argument("entrada", help="array (N, 4) de retas em .npy, ou cena binária .cena")
+    parser.add_argument("saida", help=".npy com as retas visíveis recortadas (coordenadas PPC)")
+    parser.add_argument("--window", type=float, nargs=4,
+                        metavar=("X_MIN", "Y_MIN", "X_MAX", "Y_MAX"),
+                        help="window de clipping (padrão: a da cena .cena ou a padrão)")
+    parser.add_argument("--angulo", type=float, default=0.0, help="rotação da window em graus")
+    parser.add_argument("--algoritmo", choices=MotorGrafico.ALGORITMOS_RETA,
+                        default="Cohen-Sutherland", help="algoritmo de clipping de retas")
+    parser.add_argument("--bloco", type=int, default=ClippingFluxo.TAMANHO_BLOCO,
+                        help="retas lidas por bloco (limita a memória usada)")
+    parser.add_argument("--indices", help=".npy onde gravar o índice de entrada de cada reta")
+    args = parser.parse_args()
+    
+    entrada = ArquivoRetas.abrir(args.entrada)
+    motor = MotorGrafico()
+    if 'window' in entrada.config:
+        w = entrada.config['window']
+        motor.definir_window(w['x_min'], w['y_min'], w['x_max'], w['y_max'])
+    if args.window:
+        motor.definir_window(*args.window)
+    motor.w_angulo = args.angulo
+    motor.algoritmo_reta = args.algoritmo
+    
+    tipo = np.float32 if entrada.dtype == np.float32 else np.float64
+    fluxo = ClippingFluxo(motor, args.bloco)
+    
+    def progresso(lidas: int, total: int):
+        print(f"\r{lidas}/{total} retas ({100 * lidas / total:.0f}%)", end="", flush=True)
+    
+    with GravadorNpy(args.saida, tipo, 4) as saida:
+        if args.indices:
+            with GravadorNpy(args.indices, np.int64) as indices:
+                resumo = fluxo.processar(entrada, saida, indices, progresso)
+        else:
+            resumo = fluxo.processar(entrada, saida, progresso=progresso)
+    
+    segundos = resumo['segundos']
+    vazao = resumo['bytes_lidos'] / segundos / 2 ** 20 if segundos else 0.0
+    print(f"\n{resumo['retas']} retas em {segundos:.3f}s ({vazao:.0f} MB/s): "
+          f"{resumo['rejeitadas_extensao']} rejeitadas pela extensão da window, "
+          f"{resumo['aceitas_caixa']} aceitas pela caixa, {resumo['clipping']} recortadas, "
+          f"{resumo['visiveis']} visíveis gravadas em {args.saida}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,7 @@
+"""
+Configuração dos testes: os módulos do projeto ficam na raiz do repositório
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
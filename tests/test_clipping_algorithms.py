@@ -0,0 +1,173 @@
+"""
+Testes dos algoritmos de clipping em lote
+"""
+import numpy as np
+import pytest
+
+from clipping_algorithms import ClippingCohenSutherland, ClippingLiangBarsky, ClippingSutherlandHodgman
+from pipeline import MotorGrafico
+from scene_generator import GeradorCena
+
+WINDOW = (-3.0, -2.0, 4.0, 5.0)
+
+
+def segmentos_de_teste(rng) -> np.ndarray:
+    """Retas aleatórias mais casos degenerados (pontos, sobre as bordas, paralelas)"""
+    segmentos = rng.uniform(-10, 10, (2000, 4))
+    especiais = np.array([
+        [1.0, 1.0, 1.0, 1.0],      # ponto dentro
+        [9.0, 9.0, 9.0, 9.0],      # ponto fora
+        [-3.0, -5.0, -3.0, 8.0],   # sobre a borda esquerda
+        [-8.0, 5.0, 8.0, 5.0],     # sobre a borda superior
+        [-8.0, 6.0, 8.0, 6.0],     # paralela, fora
+        [-3.0, -2.0, 4.0, 5.0],    # diagonal da window
+    ])
+    return np.vstack([segmentos, especiais])
+
+
+@pytest.mark.parametrize('classe', [ClippingCohenSutherland, ClippingLiangBarsky])
+def test_clip_batch_de_retas_igual_ao_clip(classe):
+    """clip_batch devolve a mesma visibilidade e os mesmos recortes de clip() reta a reta"""
+    segmentos = segmentos_de_teste(np.random.default_rng(1))
+    algoritmo = classe()
+    recortes, visiveis = algoritmo.clip_batch(segmentos, *WINDOW)
+    
+    for segmento, recorte, visivel in zip(segmentos.tolist(), recortes, visiveis):
+        esperado = algoritmo.clip(*segmento, *WINDOW)
+        assert visivel == (esperado is not None)
+        if esperado is not None:
+            np.testing.assert_allclose(recorte, esperado, atol=1e-9)
+
+
+@pytest.mark.parametrize('classe', [ClippingCohenSutherland, ClippingLiangBarsky])
+def test_clip_batch_de_retas_float32(classe):
+    """Em float32 o lote preserva o dtype e coincide com clip() dentro da precisão"""
+    segmentos = segmentos_de_teste(np.random.default_rng(2)).astype(np.float32)
+    algoritmo = classe()
+    recortes, visiveis = algoritmo.clip_batch(segmentos, *map(np.float64, WINDOW))
+    
+    assert recortes.dtype == np.float32
+    divergentes = 0
+    for segmento, recorte, visivel in zip(segmentos.tolist(), recortes, visiveis):
+        esperado = algoritmo.clip(*segmento, *WINDOW)
+        if visivel != (esperado is not None):
+            divergentes += 1
+        elif esperado is not None:
+            np.testing.assert_allclose(recorte, esperado, atol=1e-4)
+    assert divergentes <= 2
+
+
+def test_liang_barsky_parametros_reproduzem_o_clip():
+    """u1/u2 do lote, aplicados à reta original, dão os extremos de clip()"""
+    segmentos = segmentos_de_teste(np.random.default_rng(5))
+    algoritmo = ClippingLiangBarsky()
+    _, visiveis, u1, u2 = algoritmo.clip_batch_parametrico(segmentos, *WINDOW)
+    
+    inicio, delta = segmentos[:, :2], segmentos[:, 2:] - segmentos[:, :2]
+    extremos = np.hstack([inicio + u1[:, None] * delta, inicio + u2[:, None] * delta])
+    for segmento, extremo, visivel in zip(segmentos.tolist(), extremos, visiveis):
+        esperado = algoritmo.clip(*segmento, *WINDOW)
+        assert visivel == (esperado is not None)
+        if esperado is not None:
+            np.testing.assert_allclose(extremo, esperado, atol=1e-9)
+
+
+def aneis_de_teste(rng):
+    """Anéis aleatórios mais anéis vazios, de 1 e 2 vértices e colineares"""
+    aneis = [rng.uniform(-10, 10, (n, 2)) for n in rng.integers(3, 12, 300)]
+    aneis += [
+        np.empty((0, 2)),
+        np.array([[1.0, 1.0]]),
+        np.array([[20.0, 20.0]]),
+        np.array([[-8.0, 0.0], [8.0, 1.0]]),
+        np.array([[-8.0, 0.0], [0.0, 0.0], [8.0, 0.0]]),
+        np.array([[0.0, -9.0], [0.0, 0.0], [0.0, 9.0]]),
+        np.empty((0, 2)),
+    ]
+    aneis.insert(10, np.empty((0, 2)))
+    return aneis
+
+
+def test_clip_batch_de_poligonos_igual_ao_clip():
+    """clip_batch devolve, anel a anel, os mesmos vértices e interseções de clip()"""
+    aneis = aneis_de_teste(np.random.default_rng(3))
+    offsets = np.concatenate(([0], np.cumsum([len(anel) for anel in aneis])))
+    lote = ClippingSutherlandHodgman()
+    escalar = ClippingSutherlandHodgman()
+    lote.contar_intersecoes = escalar.contar_intersecoes = True
+    
+    recortados, novos_offsets = lote.clip_batch(np.vstack(aneis), offsets, *WINDOW)
+    
+    assert len(novos_offsets) == len(offsets)
+    for i, anel in enumerate(aneis):
+        esperado = escalar.clip([tuple(v) for v in anel.tolist()], *WINDOW)
+        obtido = recortados[novos_offsets[i]:novos_offsets[i + 1]]
+        if not esperado:
+            assert len(obtido) == 0
+        else:
+            np.testing.assert_allclose(obtido, esperado[0], atol=1e-9)
+    assert lote.intersecoes == escalar.intersecoes
+
+
+def test_clip_batch_de_poligonos_float32():
+    """Em float32 os anéis recortados têm o mesmo número de vértices de clip()"""
+    aneis = aneis_de_teste(np.random.default_rng(4))
+    offsets = np.concatenate(([0], np.cumsum([len(anel) for anel in aneis])))
+    algoritmo = ClippingSutherlandHodgman()
+    
+    recortados, novos_offsets = algoritmo.clip_batch(
+        np.vstack(aneis).astype(np.float32), offsets, *map(np.float64, WINDOW)
+    )
+    
+    assert recortados.dtype == np.float32
+    for i, anel in enumerate(aneis):
+        esperado = algoritmo.clip([tuple(v) for v in anel.astype(np.float32).tolist()], *WINDOW)
+        obtido = recortados[novos_offsets[i]:novos_offsets[i + 1]]
+        if esperado:
+            np.testing.assert_allclose(obtido, esperado[0], atol=1e-4)
+        else:
+            assert len(obtido) == 0
+
+
+def test_cohen_sutherland_float32_com_limites_float64():
+    """Ponto colocado sobre a borda em float32 não pode continuar fora (laço infinito)"""
+    segmentos = np.array([[0.01, 0.01, 0.02, 0.9]], dtype=np.float32)
+    recortes, visiveis = ClippingCohenSutherland().clip_batch(
+        segmentos, np.float64(0), np.float64(0), np.float64(100), np.float64(0.3)
+    )
+    
+    assert recortes.dtype == np.float32
+    assert visiveis.tolist() == [True]
+    assert recortes[0, 3] == np.float32(0.3)
+
+
+def test_cohen_sutherland_float32_dentro_da_window():
+    """Em float32, as retas recortadas ficam dentro da window e coincidem com float64"""
+    rng = np.random.default_rng(0)
+    segmentos = rng.uniform(-20, 20, (5000, 4))
+    limites = (np.float64(-3.1), np.float64(-2.7), np.float64(4.3), np.float64(5.9))
+    algoritmo = ClippingCohenSutherland()
+    
+    recortes, visiveis = algoritmo.clip_batch(segmentos.astype(np.float32), *limites)
+    recortes64, visiveis64 = algoritmo.clip_batch(segmentos, *limites)
+    
+    x_min, y_min, x_max, y_max = np.float32(limites)
+    visiveis_recortes = recortes[visiveis]
+    assert (visiveis_recortes[:, 0::2] >= x_min).all() and (visiveis_recortes[:, 0::2] <= x_max).all()
+    assert (visiveis_recortes[:, 1::2] >= y_min).all() and (visiveis_recortes[:, 1::2] <= y_max).all()
+    assert np.count_nonzero(visiveis != visiveis64) <= 5
+    comuns = visiveis & visiveis64
+    np.testing.assert_allclose(recortes[comuns], recortes64[comuns], atol=1e-4)
+
+
+def test_pipeline_float32_apos_movimentar_e_escalar():
+    """Cena float32 com a window em limites float64 (mover/escalar) é processada"""
+    config, cena = GeradorCena(1).cena(n_retas=2000, precisao='float32')
+    motor = MotorGrafico()
+    motor.carregar_cena(config, cena)
+    motor.mover_window(1, 0)
+    motor.escalar_window(0.9)
+    motor.escalar_window(0.9)
+    
+    assert motor.processar()
+    assert cena.retas_recortadas.dtype == np.float32
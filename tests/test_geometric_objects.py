@@ -0,0 +1,22 @@
+"""
+Testes dos vértices vinculados de Reta e Poligono
+"""
+from geometric_objects import Ponto, Poligono, Reta
+
+
+def test_reta_vertices_gravam_nas_coordenadas():
+    """Alterar p1_ppc/p2_mundo altera as listas da reta"""
+    reta = Reta(Ponto(0, 0), Ponto(1, 2))
+    reta.p1_ppc.x_ppc = 5
+    reta.p2_mundo.y_mundo = 9
+    assert reta.coords_ppc == [5, 0, 1, 2]
+    assert reta.coords_mundo == [0, 0, 1, 9]
+
+
+def test_poligono_anel_ppc_nao_altera_o_mundo():
+    """Gravar num anel inicial copia o array antes de alterá-lo"""
+    poligono = Poligono([Ponto(0, 0), Ponto(1, 0), Ponto(1, 1)])
+    poligono.poligonos_ppc[0][1].x_ppc = 3
+    poligono.pontos_mundo[0].y_mundo = -1
+    assert poligono.aneis_ppc[0].tolist() == [[0, 0], [3, 0], [1, 1]]
+    assert poligono.coords_mundo.tolist() == [[0, -1], [1, 0], [1, 1]]
@@ -0,0 +1,75 @@
+"""
+Testes do clipping paralelo: os resultados devem ser os mesmos do serial
+"""
+import numpy as np
+import pytest
+
+from clipping_algorithms import (ClippingCohenSutherland, ClippingLiangBarsky,
+                                 ClippingSutherlandHodgman)
+from parallel_clipping import ClippingPoligonoParalelo, ClippingRetaParalelo, ExecutorParalelo
+
+WINDOW = (-3.0, -2.0, 4.0, 5.0)
+
+
+@pytest.fixture(scope="module")
+def executor():
+    executor = ExecutorParalelo(trabalhadores=3)
+    yield executor
+    executor.fechar()
+
+
+def poligonos_aleatorios(rng, quantidade, tipo=np.float64):
+    """Polígonos aleatórios em torno da window, com anéis vazios no meio e no fim"""
+    tamanhos = rng.integers(3, 12, quantidade)
+    tamanhos[::7] = 0
+    tamanhos[-3:] = 0
+    offsets = np.concatenate(([0], np.cumsum(tamanhos))).astype(np.int64)
+    centros = np.repeat(rng.uniform(-8, 8, (quantidade, 2)), tamanhos, axis=0)
+    vertices = (centros + rng.uniform(-3, 3, (offsets[-1], 2))).astype(tipo)
+    return vertices, offsets
+
+
+@pytest.mark.parametrize("tipo", [np.float64, np.float32])
+@pytest.mark.parametrize("classe", [ClippingCohenSutherland, ClippingLiangBarsky])
+def test_retas_paralelo_igual_ao_serial(executor, classe, tipo):
+    segmentos = np.random.default_rng(1).uniform(-10, 10, (10001, 4)).astype(tipo)
+    paralelo = ClippingRetaParalelo(classe(), executor, limite_serial=0)
+    try:
+        recortes, visiveis = paralelo.clip_batch(segmentos, *WINDOW)
+    finally:
+        paralelo.liberar()
+    recortes_serial, visiveis_serial = classe().clip_batch(segmentos, *WINDOW)
+    
+    assert recortes.dtype == recortes_serial.dtype
+    np.testing.assert_array_equal(visiveis, visiveis_serial)
+    np.testing.assert_array_equal(recortes, recortes_serial)
+
+
+@pytest.mark.parametrize("tipo", [np.float64, np.float32])
+def test_poligonos_paralelo_igual_ao_serial(executor, tipo):
+    vertices, offsets = poligonos_aleatorios(np.random.default_rng(2), 2000, tipo)
+    paralelo = ClippingPoligonoParalelo(ClippingSutherlandHodgman(), executor, limite_serial=0)
+    try:
+        recortados, novos_offsets = paralelo.clip_batch(vertices, offsets, *WINDOW)
+    finally:
+        paralelo.liberar()
+    recortados_serial, offsets_serial = ClippingSutherlandHodgman().clip_batch(
+        vertices, offsets, *WINDOW
+    )
+    
+    assert len(novos_offsets) == len(offsets)
+    np.testing.assert_array_equal(novos_offsets, offsets_serial)
+    np.testing.assert_array_equal(recortados, recortados_serial)
+
+
+def test_poligonos_paralelo_aneis_vazios_no_fim(executor):
+    """Anéis vazios no fim do lote não podem ficar fora de todas as faixas"""
+    vertices = np.array([[0, 0], [1, 0], [1, 1], [0, 1], [2, 2], [3, 2], [3, 3]], dtype=float)
+    offsets = np.array([0, 4, 7, 7, 7])
+    paralelo = ClippingPoligonoParalelo(ClippingSutherlandHodgman(), executor, limite_serial=0)
+    try:
+        _, novos_offsets = paralelo.clip_batch(vertices, offsets, *WINDOW)
+    finally:
+        paralelo.liberar()
+    
+    assert novos_offsets.tolist() == [0, 4, 7, 7, 7]
@@ -0,0 +1,21 @@
+"""
+Testes do pipeline de visualização (MotorGrafico)
+"""
+import numpy as np
+
+from pipeline import MotorGrafico
+from scene_buffers import SceneBuffers
+
+
+def test_decimacao_de_pontos_mantem_o_ultimo_desenhado():
+    """Vermelho, azul e vermelho no mesmo pixel: o vermelho continua por cima"""
+    cena = SceneBuffers(pontos_mundo=np.array([[5.0, 5.0], [5.0, 5.0], [5.0, 5.0]]),
+                        pontos_cor=np.array([0, 1, 0]), cores=['red', 'blue'])
+    motor = MotorGrafico()
+    motor.carregar_cena({}, cena)
+    motor.processar()
+    
+    indices, _ = motor.geometria_viewport()['pontos']
+    cores = [cena.cores[cena.pontos_cor[i]] for i in indices]
+    assert indices == [1, 2]
+    assert cores == ['blue', 'red']
@@ -0,0 +1,32 @@
+"""
+Testes dos buffers da cena e da cena binária
+"""
+import numpy as np
+
+from binary_scene import CenaBinaria
+from scene_buffers import SceneBuffers
+
+
+def test_magnitude_calculada_uma_vez_no_indice():
+    """construir_indice() guarda a magnitude; erro_maximo_pixels só a lê"""
+    cena = SceneBuffers(pontos_mundo=np.array([[1.0, -7.0]]),
+                        retas_mundo=np.array([[0.0, 0.0, 3.0, 2.0]]))
+    cena.construir_indice()
+    
+    assert cena.magnitude_mundo == 7.0
+    cena.pontos_mundo = np.array([[100.0, 0.0]])
+    assert cena.magnitude() == 7.0
+    assert cena.erro_maximo_pixels(10.0, 10.0) == SceneBuffers.FATOR_ERRO * np.finfo(float).eps * 7.0
+
+
+def test_magnitude_salva_no_cabecalho_da_cena_binaria(tmp_path):
+    """A cena binária traz a magnitude no cabeçalho, sem recalculá-la ao abrir"""
+    arquivo = str(tmp_path / "cena.cena")
+    cena = SceneBuffers(retas_mundo=np.array([[0.0, 0.0, -12.5, 2.0]]))
+    CenaBinaria.salvar(arquivo, {}, cena)
+    
+    cabecalho, _ = CenaBinaria.ler_cabecalho(arquivo)
+    _, carregada = CenaBinaria.carregar(arquivo, construir_indice=False, construir_lod=False)
+    
+    assert cabecalho['magnitude'] == 12.5
+    assert carregada.magnitude_mundo == 12.5
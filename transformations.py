@@ -1,6 +1,8 @@
 """
 Módulo contendo operações de transformação geométrica
 """
+from collections import OrderedDict
+from typing import Any, Optional
 import numpy as np
 import math
 
@@ -78,6 +80,36 @@ class Transformacao:
         """
         return matriz @ coords
     
+    @staticmethod
+    def aplicar_em_lote(coords: np.ndarray, matriz: np.ndarray,
+                        out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Aplica uma transformação a um bloco inteiro de coordenadas
+        
+        Args:
+            coords: array (N, 2) de coordenadas cartesianas ou (N, 3) de
+                coordenadas homogêneas, em float32 ou float64
+            matriz: matriz de transformação 3x3
+            out: array de saída com o mesmo formato de coords; se informado,
+                o resultado é escrito nele em vez de alocar um novo
+            
+        Returns:
+            Array transformado (o próprio out, quando fornecido)
+        """
+        coords = np.asarray(coords)
+        tipo = coords.dtype if coords.dtype in (np.float32, np.float64) else np.float64
+        if out is None:
+            out = np.empty(coords.shape, dtype=tipo)
+        
+        if coords.shape[1] == 3:
+            # Coordenadas homogêneas: uma única multiplicação matricial
+            return np.matmul(coords, matriz.T.astype(tipo), out=out)
+        
+        # Coordenadas cartesianas: parte linear 2x2 seguida da translação
+        np.matmul(coords, matriz[:2, :2].T.astype(tipo), out=out)
+        out += matriz[:2, 2].astype(tipo)
+        return out
+    
     @staticmethod
     def compor_transformacoes(*matrizes: np.ndarray) -> np.ndarray:
         """
@@ -93,3 +125,44 @@ class Transformacao:
         for matriz in matrizes:
             resultado = matriz @ resultado
         return resultado
+
+
+class CacheTransformacao:
+    """
+    Cache LRU de resultados de transformação, indexado pela matriz composta
+    
+    A mesma matriz sempre produz as mesmas coordenadas transformadas, então
+    o resultado pode ser reaproveitado enquanto a cena não mudar. O cache é
+    pequeno (poucas matrizes) para que alternar entre estados recentes da
+    window, como duas rotações, não exija transformar a cena novamente.
+    """
+    
+    def __init__(self, capacidade: int = 2):
+        self.capacidade = capacidade
+        self._entradas: "OrderedDict[bytes, Any]" = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entradas)
+    
+    @staticmethod
+    def chave(matriz: np.ndarray) -> bytes:
+        """Retorna a chave de cache de uma matriz de transformação"""
+        return np.ascontiguousarray(matriz, dtype=np.float64).tobytes()
+    
+    def obter(self, chave: bytes) -> Optional[Any]:
+        """Retorna a entrada associada à chave (ou None), marcando-a como recente"""
+        entrada = self._entradas.get(chave)
+        if entrada is not None:
+            self._entradas.move_to_end(chave)
+        return entrada
+    
+    def inserir(self, chave: bytes, entrada: Any):
+        """Insere uma entrada, descartando a menos recente se o cache estiver cheio"""
+        self._entradas[chave] = entrada
+        self._entradas.move_to_end(chave)
+        while len(self._entradas) > self.capacidade:
+            self._entradas.popitem(last=False)
+    
+    def limpar(self):
+        """Descarta todas as entradas (por exemplo, ao carregar outra cena)"""
+        self._entradas.clear()
@@ -2,13 +2,38 @@
 Módulo para carregar objetos de arquivos XML
 """
 import xml.etree.ElementTree as ET
-from typing import List, Tuple
+from typing import BinaryIO, Callable, Iterator, List, Optional, Tuple, Union
+import numpy as np
 from geometric_objects import Ponto, Reta, Poligono
+from scene_buffers import ArrayCrescente, SceneBuffers
+
+
+class LoteCena:
+    """Objetos lidos de um trecho de um arquivo XML, já em arrays"""
+    
+    def __init__(self, config: dict, cores: List[str],
+                 pontos, pontos_cor, retas, retas_cor,
+                 poligonos, poligonos_offsets, poligonos_cor, bytes_lidos: int):
+        self.config = config
+        self.cores = cores
+        self.pontos = np.array(pontos, dtype=np.float64).reshape(-1, 2)
+        self.pontos_cor = np.array(pontos_cor, dtype=np.int64)
+        self.retas = np.array(retas, dtype=np.float64).reshape(-1, 4)
+        self.retas_cor = np.array(retas_cor, dtype=np.int64)
+        self.poligonos = np.array(poligonos, dtype=np.float64).reshape(-1, 2)
+        self.poligonos_offsets = np.array(poligonos_offsets, dtype=np.int64)
+        self.poligonos_cor = np.array(poligonos_cor, dtype=np.int64)
+        self.bytes_lidos = bytes_lidos
+    
+    def __len__(self):
+        return len(self.pontos) + len(self.retas) + len(self.poligonos_cor)
 
 
 class XMLLoader:
     """Classe para carregar objetos geométricos de arquivos XML"""
     
+    TAMANHO_LOTE = 10000
+    
     @staticmethod
     def carregar_arquivo(filename: str) -> Tuple[dict, List[Ponto], List[Reta], List[Poligono]]:
         """
@@ -16,69 +41,189 @@ class XMLLoader:
         
         Args:
             filename: caminho do arquivo XML
-            
+        
         Returns:
             Tupla contendo (configurações, pontos, retas, polígonos)
         """
-        tree = ET.parse(filename)
-        root = tree.getroot()
+        config, cena = XMLLoader.carregar_buffers(filename, construir_indice=False,
+                                                  construir_lod=False)
+        pontos, retas, poligonos = cena.para_objetos()
+        return config, pontos, retas, poligonos
+    
+    @staticmethod
+    def carregar_buffers(filename: str, construir_indice: bool = True,
+                         tamanho_lote: int = TAMANHO_LOTE,
+                         construir_lod: bool = True,
+                         progresso: Optional[Callable[[int], None]] = None,
+                         precisao: Optional[str] = None) -> Tuple[dict, SceneBuffers]:
+        """
+        Carrega a cena de um arquivo XML diretamente em arrays colunares
+        
+        A leitura é feita em fluxo por iterar_lotes(), acumulando cada lote
+        em arrays que crescem por duplicação; o pico de memória acompanha o
+        tamanho da geometria e não o da árvore XML.
+        
+        Args:
+            filename: caminho do arquivo XML
+            construir_indice: se True, constrói o índice espacial da cena
+            tamanho_lote: quantidade de objetos por lote de leitura
+            construir_lod: se True, constrói os níveis de detalhe dos polígonos
+            progresso: função chamada após cada lote com a quantidade de
+                bytes do arquivo já lidos; pode interromper a leitura lançando
+                uma exceção
+            precisao: 'float64' ou 'float32'; None usa o atributo
+                ``precisao`` da raiz do XML (float64 se ausente)
+        
+        Returns:
+            Tupla contendo (configurações, buffers da cena)
+        """
+        pontos = retas = poligonos = None
+        pontos_cor = ArrayCrescente(dtype=np.int64)
+        retas_cor = ArrayCrescente(dtype=np.int64)
+        poligonos_offsets = ArrayCrescente(dtype=np.int64)
+        poligonos_offsets.anexar([0])
+        poligonos_cor = ArrayCrescente(dtype=np.int64)
+        
+        config, cores = {}, []
+        for lote in XMLLoader.iterar_lotes(filename, tamanho_lote):
+            config, cores = lote.config, lote.cores
+            if pontos is None:
+                # A raiz (e o seu atributo de precisão) já foi lida no primeiro lote
+                precisao = precisao or config.get('precisao')
+                tipo = SceneBuffers.tipo_precisao(precisao)
+                pontos = ArrayCrescente(2, tipo)
+                retas = ArrayCrescente(4, tipo)
+                poligonos = ArrayCrescente(2, tipo)
+            pontos.anexar(lote.pontos)
+            pontos_cor.anexar(lote.pontos_cor)
+            retas.anexar(lote.retas)
+            retas_cor.anexar(lote.retas_cor)
+            poligonos_offsets.anexar(lote.poligonos_offsets[1:] + len(poligonos))
+            poligonos.anexar(lote.poligonos)
+            poligonos_cor.anexar(lote.poligonos_cor)
+            if progresso is not None:
+                progresso(lote.bytes_lidos)
+        
+        cena = SceneBuffers(
+            pontos_mundo=pontos.finalizar(), pontos_cor=pontos_cor.finalizar(),
+            retas_mundo=retas.finalizar(), retas_cor=retas_cor.finalizar(),
+            poligonos_mundo=poligonos.finalizar(), poligonos_offsets=poligonos_offsets.finalizar(),
+            poligonos_cor=poligonos_cor.finalizar(), cores=cores,
+            precisao=tipo.name
+        )
+        if construir_indice:
+            cena.construir_indice()
+        if construir_lod:
+            cena.construir_lod()
+        return config, cena
+    
+    @staticmethod
+    def iterar_lotes(arquivo: Union[str, BinaryIO],
+                     tamanho_lote: int = TAMANHO_LOTE) -> Iterator[LoteCena]:
+        """
+        Lê um arquivo XML em fluxo, produzindo os objetos em lotes
+        
+        Usa ET.iterparse e descarta cada elemento de primeiro nível assim que
+        ele é processado, então a árvore XML nunca fica inteira em memória e
+        o chamador pode começar a trabalhar antes do fim do arquivo.
+        
+        Args:
+            arquivo: caminho ou arquivo binário aberto com o XML
+            tamanho_lote: quantidade de objetos por lote
+        
+        Yields:
+            Lotes com os objetos lidos desde o lote anterior (ao menos um lote
+            é sempre produzido, mesmo para cenas vazias)
+        """
+        if isinstance(arquivo, str):
+            with open(arquivo, 'rb') as f:
+                yield from XMLLoader.iterar_lotes(f, tamanho_lote)
+            return
         
         config = {}
-        pontos = []
-        retas = []
-        poligonos = []
-        
-        # Carregar viewport
-        viewport = root.find('viewport')
-        if viewport is not None:
-            vpmin = viewport.find('vpmin')
-            vpmax = viewport.find('vpmax')
-            if vpmin is not None and vpmax is not None:
-                config['viewport'] = {
-                    'x_min': float(vpmin.get('x', 0)),
-                    'y_min': float(vpmin.get('y', 0)),
-                    'x_max': float(vpmax.get('x', 800)),
-                    'y_max': float(vpmax.get('y', 600))
-                }
-        
-        # Carregar window
-        window = root.find('window')
-        if window is not None:
-            wmin = window.find('wmin')
-            wmax = window.find('wmax')
-            if wmin is not None and wmax is not None:
-                config['window'] = {
-                    'x_min': float(wmin.get('x', 0)),
-                    'y_min': float(wmin.get('y', 0)),
-                    'x_max': float(wmax.get('x', 10)),
-                    'y_max': float(wmax.get('y', 7.5))
-                }
-        
-        # Carregar pontos
-        for ponto_elem in root.findall('ponto'):
-            x = float(ponto_elem.get('x'))
-            y = float(ponto_elem.get('y'))
-            cor = ponto_elem.get('cor', 'black')
-            pontos.append(Ponto(x, y, cor))
-        
-        # Carregar retas
-        for reta_elem in root.findall('reta'):
-            cor = reta_elem.get('cor', 'black')
-            pontos_reta = reta_elem.findall('ponto')
-            if len(pontos_reta) >= 2:
-                p1 = Ponto(float(pontos_reta[0].get('x')), float(pontos_reta[0].get('y')))
-                p2 = Ponto(float(pontos_reta[1].get('x')), float(pontos_reta[1].get('y')))
-                retas.append(Reta(p1, p2, cor))
-        
-        # Carregar polígonos
-        for poligono_elem in root.findall('poligono'):
-            cor = poligono_elem.get('cor', 'black')
-            pontos_poli = []
-            for ponto_elem in poligono_elem.findall('ponto'):
-                x = float(ponto_elem.get('x'))
-                y = float(ponto_elem.get('y'))
-                pontos_poli.append(Ponto(x, y))
-            if len(pontos_poli) >= 3:
-                poligonos.append(Poligono(pontos_poli, cor))
+        cores = []
+        indice_por_cor = {}
         
-        return config, pontos, retas, poligonos
+        def indice_cor(cor: str) -> int:
+            if cor not in indice_por_cor:
+                indice_por_cor[cor] = len(cores)
+                cores.append(cor)
+            return indice_por_cor[cor]
+        
+        def novo_lote():
+            return [], [], [], [], [], [0], []
+        
+        pontos_xy, pontos_cor, retas_xy, retas_cor, poligonos_xy, poligonos_offsets, poligonos_cor = novo_lote()
+        objetos = 0
+        profundidade = 0
+        raiz = None
+        
+        for evento, elem in ET.iterparse(arquivo, events=('start', 'end')):
+            if evento == 'start':
+                profundidade += 1
+                if raiz is None:
+                    raiz = elem
+                    if 'precisao' in raiz.attrib:
+                        config['precisao'] = raiz.get('precisao')
+                continue
+            
+            profundidade -= 1
+            if profundidade != 1:
+                # Apenas filhos diretos da raiz são objetos/configurações
+                continue
+            
+            if elem.tag == 'viewport' and 'viewport' not in config:
+                # Carregar viewport
+                vpmin = elem.find('vpmin')
+                vpmax = elem.find('vpmax')
+                if vpmin is not None and vpmax is not None:
+                    config['viewport'] = {
+                        'x_min': float(vpmin.get('x', 0)),
+                        'y_min': float(vpmin.get('y', 0)),
+                        'x_max': float(vpmax.get('x', 800)),
+                        'y_max': float(vpmax.get('y', 600))
+                    }
+            elif elem.tag == 'window' and 'window' not in config:
+                # Carregar window
+                wmin = elem.find('wmin')
+                wmax = elem.find('wmax')
+                if wmin is not None and wmax is not None:
+                    config['window'] = {
+                        'x_min': float(wmin.get('x', 0)),
+                        'y_min': float(wmin.get('y', 0)),
+                        'x_max': float(wmax.get('x', 10)),
+                        'y_max': float(wmax.get('y', 7.5))
+                    }
+            elif elem.tag == 'ponto':
+                # Carregar ponto
+                pontos_xy.append((float(elem.get('x')), float(elem.get('y'))))
+                pontos_cor.append(indice_cor(elem.get('cor', 'black')))
+                objetos += 1
+            elif elem.tag == 'reta':
+                # Carregar reta
+                pontos_reta = elem.findall('ponto')
+                if len(pontos_reta) >= 2:
+                    retas_xy.append((float(pontos_reta[0].get('x')), float(pontos_reta[0].get('y')),
+                                     float(pontos_reta[1].get('x')), float(pontos_reta[1].get('y'))))
+                    retas_cor.append(indice_cor(elem.get('cor', 'black')))
+                    objetos += 1
+            elif elem.tag == 'poligono':
+                # Carregar polígono
+                pontos_poli = [(float(p.get('x')), float(p.get('y'))) for p in elem.findall('ponto')]
+                if len(pontos_poli) >= 3:
+                    poligonos_xy.extend(pontos_poli)
+                    poligonos_offsets.append(len(poligonos_xy))
+                    poligonos_cor.append(indice_cor(elem.get('cor', 'black')))
+                    objetos += 1
+            
+            # Descartar os elementos já processados
+            raiz.clear()
+            
+            if objetos >= tamanho_lote:
+                yield LoteCena(config, cores, pontos_xy, pontos_cor, retas_xy, retas_cor,
+                               poligonos_xy, poligonos_offsets, poligonos_cor, arquivo.tell())
+                pontos_xy, pontos_cor, retas_xy, retas_cor, poligonos_xy, poligonos_offsets, poligonos_cor = novo_lote()
+                objetos = 0
+        
+        yield LoteCena(config, cores, pontos_xy, pontos_cor, retas_xy, retas_cor,
+                       poligonos_xy, poligonos_offsets, poligonos_cor, arquivo.tell())